@@ -0,0 +1,25 @@
+"""project schedule version
+
+Revision ID: 20261017_0002
+Revises: 20260212_0001
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261017_0002"
+down_revision: Union[str, Sequence[str], None] = "20260212_0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("projects", sa.Column("schedule_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("projects", "schedule_version")
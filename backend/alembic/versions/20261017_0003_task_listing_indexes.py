@@ -0,0 +1,28 @@
+"""task listing keyset indexes
+
+Revision ID: 20261017_0003
+Revises: 20261017_0002
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261017_0003"
+down_revision: Union[str, Sequence[str], None] = "20261017_0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("idx_tasks_created_id", "tasks", ["created_at", "id"])
+    op.create_index("idx_tasks_project_created_id", "tasks", ["project_id", "created_at", "id"])
+    op.create_index("idx_td_successor", "task_dependencies", ["successor_task_id", "predecessor_task_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_td_successor", table_name="task_dependencies")
+    op.drop_index("idx_tasks_project_created_id", table_name="tasks")
+    op.drop_index("idx_tasks_created_id", table_name="tasks")
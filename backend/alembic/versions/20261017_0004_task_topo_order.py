@@ -0,0 +1,28 @@
+"""task topological order
+
+Revision ID: 20261017_0004
+Revises: 20261017_0003
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261017_0004"
+down_revision: Union[str, Sequence[str], None] = "20261017_0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing projects are backfilled lazily on their first dependency write.
+    op.add_column("tasks", sa.Column("topo_order", sa.Integer()))
+    op.create_index("idx_tasks_project_topo", "tasks", ["project_id", "topo_order"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_tasks_project_topo", table_name="tasks")
+    op.drop_column("tasks", "topo_order")
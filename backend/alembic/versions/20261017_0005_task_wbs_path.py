@@ -0,0 +1,28 @@
+"""task wbs materialized path
+
+Revision ID: 20261017_0005
+Revises: 20261017_0004
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261017_0005"
+down_revision: Union[str, Sequence[str], None] = "20261017_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing projects are backfilled by 20261017_0017.
+    op.add_column("tasks", sa.Column("wbs_path", sa.String(length=720)))
+    op.create_index("idx_tasks_project_wbs_path", "tasks", ["project_id", "wbs_path"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_tasks_project_wbs_path", table_name="tasks")
+    op.drop_column("tasks", "wbs_path")
@@ -0,0 +1,39 @@
+"""project schedule summaries
+
+Revision ID: 20261017_0006
+Revises: 20261017_0005
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261017_0006"
+down_revision: Union[str, Sequence[str], None] = "20261017_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_schedule_summaries",
+        sa.Column("project_id", sa.String(length=36), nullable=False),
+        sa.Column("schedule_version", sa.Integer(), nullable=False),
+        sa.Column("task_count", sa.Integer(), nullable=False),
+        sa.Column("cycle", sa.Boolean(), nullable=False),
+        sa.Column("planned_length", sa.Integer(), nullable=False),
+        sa.Column("actual_length", sa.Integer(), nullable=False),
+        sa.Column("slippage_days", sa.Integer(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id"),
+    )
+    op.create_index("idx_pss_slippage", "project_schedule_summaries", ["slippage_days", "project_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_pss_slippage", table_name="project_schedule_summaries")
+    op.drop_table("project_schedule_summaries")
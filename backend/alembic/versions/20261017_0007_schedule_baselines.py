@@ -0,0 +1,42 @@
+"""schedule baselines
+
+Revision ID: 20261017_0007
+Revises: 20261017_0006
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+revision: str = "20261017_0007"
+down_revision: Union[str, Sequence[str], None] = "20261017_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "schedule_baselines",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("project_id", sa.String(length=36), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("schedule_version", sa.Integer(), nullable=False),
+        sa.Column("task_count", sa.Integer(), nullable=False),
+        sa.Column("dependency_count", sa.Integer(), nullable=False),
+        sa.Column("planned_length", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.LargeBinary().with_variant(mysql.LONGBLOB(), "mysql"), nullable=False),
+        sa.Column("created_by", sa.String(length=36)),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+    )
+    op.create_index("idx_baselines_project_created", "schedule_baselines", ["project_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_baselines_project_created", table_name="schedule_baselines")
+    op.drop_table("schedule_baselines")
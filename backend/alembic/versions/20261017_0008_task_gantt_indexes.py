@@ -0,0 +1,28 @@
+"""task gantt window indexes
+
+Revision ID: 20261017_0008
+Revises: 20261017_0007
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261017_0008"
+down_revision: Union[str, Sequence[str], None] = "20261017_0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("idx_tasks_project_planned_window", "tasks", ["project_id", "planned_start", "planned_end"])
+    op.create_index("idx_tasks_project_actual_window", "tasks", ["project_id", "actual_start", "actual_end"])
+    op.create_index("idx_td_predecessor", "task_dependencies", ["predecessor_task_id", "successor_task_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_td_predecessor", table_name="task_dependencies")
+    op.drop_index("idx_tasks_project_actual_window", table_name="tasks")
+    op.drop_index("idx_tasks_project_planned_window", table_name="tasks")
@@ -0,0 +1,40 @@
+"""quality issue listing keyset indexes
+
+Revision ID: 20261017_0009
+Revises: 20261017_0008
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261017_0009"
+down_revision: Union[str, Sequence[str], None] = "20261017_0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Equality filters lead and (created_at, id) follows, so each listing is a
+# bounded range scan in cursor order. Due-date filters are ranges and use the
+# due_at indexes to narrow the candidate set before ordering.
+INDEXES = {
+    "idx_qi_created_id": ["created_at", "id"],
+    "idx_qi_status_created_id": ["status", "created_at", "id"],
+    "idx_qi_project_created_id": ["project_id", "created_at", "id"],
+    "idx_qi_project_status_created_id": ["project_id", "status", "created_at", "id"],
+    "idx_qi_project_level_created_id": ["project_id", "level", "created_at", "id"],
+    "idx_qi_project_owner_created_id": ["project_id", "owner_name", "created_at", "id"],
+    "idx_qi_project_due": ["project_id", "due_at"],
+    "idx_qi_status_due": ["status", "due_at"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, "quality_issues", columns)
+
+
+def downgrade() -> None:
+    for name in reversed(INDEXES):
+        op.drop_index(name, table_name="quality_issues")
@@ -0,0 +1,42 @@
+"""quality kpi aggregates
+
+Revision ID: 20261017_0010
+Revises: 20261017_0009
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261017_0010"
+down_revision: Union[str, Sequence[str], None] = "20261017_0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backfill with `python -m app.jobs.rebuild_quality_kpis`.
+    op.create_table(
+        "quality_kpis",
+        sa.Column("project_id", sa.String(length=36), nullable=False),
+        sa.Column("section_key", sa.String(length=36), nullable=False),
+        sa.Column(
+            "level", sa.Enum("low", "medium", "high", "critical", name="qualitylevel", native_enum=False), nullable=False
+        ),
+        sa.Column("total_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("reported_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rectifying_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("pending_review_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("closed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rejected_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("close_seconds_total", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id", "section_key", "level"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("quality_kpis")
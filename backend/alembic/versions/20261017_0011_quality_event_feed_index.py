@@ -0,0 +1,25 @@
+"""quality event feed index
+
+Revision ID: 20261017_0011
+Revises: 20261017_0010
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261017_0011"
+down_revision: Union[str, Sequence[str], None] = "20261017_0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Feed resume replays events after an (action_at, id) cursor.
+    op.create_index("idx_quality_events_action_id", "quality_issue_events", ["action_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_quality_events_action_id", table_name="quality_issue_events")
@@ -0,0 +1,30 @@
+"""quality issue overdue flag
+
+Revision ID: 20261017_0012
+Revises: 20261017_0011
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261017_0012"
+down_revision: Union[str, Sequence[str], None] = "20261017_0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("quality_issues", sa.Column("overdue_at", sa.DateTime()))
+    op.add_column("quality_kpis", sa.Column("overdue_count", sa.Integer(), nullable=False, server_default="0"))
+    # Scheduler reloads: open, unflagged issues due before the look-ahead horizon.
+    op.create_index("idx_qi_status_overdue_due", "quality_issues", ["status", "overdue_at", "due_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_qi_status_overdue_due", table_name="quality_issues")
+    op.drop_column("quality_kpis", "overdue_count")
+    op.drop_column("quality_issues", "overdue_at")
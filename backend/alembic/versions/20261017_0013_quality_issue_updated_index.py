@@ -0,0 +1,25 @@
+"""quality issue updated_at index
+
+Revision ID: 20261017_0013
+Revises: 20261017_0012
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "20261017_0013"
+down_revision: Union[str, Sequence[str], None] = "20261017_0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Search index catch-up reads issues changed since its watermark.
+    op.create_index("idx_qi_updated_id", "quality_issues", ["updated_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_qi_updated_id", table_name="quality_issues")
@@ -0,0 +1,50 @@
+"""archived quality issues
+
+Revision ID: 20261017_0014
+Revises: 20261017_0013
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261017_0014"
+down_revision: Union[str, Sequence[str], None] = "20261017_0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "archived_quality_issues",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("project_id", sa.String(length=36), nullable=False),
+        sa.Column("section_id", sa.String(length=36)),
+        sa.Column("issue_code", sa.String(length=100), nullable=False),
+        sa.Column(
+            "level", sa.Enum("low", "medium", "high", "critical", name="qualitylevel", native_enum=False), nullable=False
+        ),
+        sa.Column("reported_at", sa.DateTime(), nullable=False),
+        sa.Column("closed_at", sa.DateTime(), nullable=False),
+        sa.Column("overdue_at", sa.DateTime()),
+        sa.Column("archive_file", sa.String(length=255), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("idx_aqi_project_closed", "archived_quality_issues", ["project_id", "closed_at"])
+    # Archival job: closed issues past the retention window, one project at a time.
+    op.create_index("idx_qi_status_project_closed", "quality_issues", ["status", "project_id", "closed_at"])
+    op.create_index("idx_quality_rectifications_issue", "quality_rectifications", ["issue_id"])
+    op.create_index("idx_quality_acceptances_issue", "quality_acceptances", ["issue_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_quality_acceptances_issue", table_name="quality_acceptances")
+    op.drop_index("idx_quality_rectifications_issue", table_name="quality_rectifications")
+    op.drop_index("idx_qi_status_project_closed", table_name="quality_issues")
+    op.drop_index("idx_aqi_project_closed", table_name="archived_quality_issues")
+    op.drop_table("archived_quality_issues")
@@ -0,0 +1,27 @@
+"""row versions for quality issues and tasks
+
+Revision ID: 20261017_0015
+Revises: 20261017_0014
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261017_0015"
+down_revision: Union[str, Sequence[str], None] = "20261017_0014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("quality_issues", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+    op.add_column("tasks", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    op.drop_column("tasks", "version")
+    op.drop_column("quality_issues", "version")
@@ -0,0 +1,41 @@
+"""microsecond action_at for quality issue events
+
+Revision ID: 20261017_0016
+Revises: 20261017_0015
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+revision: str = "20261017_0016"
+down_revision: Union[str, Sequence[str], None] = "20261017_0015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # MySQL DATETIME drops fractional seconds; the other backends already keep microseconds.
+    if op.get_bind().dialect.name == "mysql":
+        op.alter_column(
+            "quality_issue_events",
+            "action_at",
+            type_=mysql.DATETIME(fsp=6),
+            existing_type=sa.DateTime(),
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "mysql":
+        op.alter_column(
+            "quality_issue_events",
+            "action_at",
+            type_=sa.DateTime(),
+            existing_type=mysql.DATETIME(fsp=6),
+            existing_nullable=False,
+        )
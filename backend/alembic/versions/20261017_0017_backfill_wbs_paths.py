@@ -0,0 +1,61 @@
+"""backfill task wbs paths
+
+Revision ID: 20261017_0017
+Revises: 20261017_0016
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261017_0017"
+down_revision: Union[str, Sequence[str], None] = "20261017_0016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+tasks = sa.table(
+    "tasks",
+    sa.column("id", sa.String),
+    sa.column("project_id", sa.String),
+    sa.column("parent_task_id", sa.String),
+    sa.column("wbs_path", sa.String),
+    sa.column("updated_at", sa.DateTime),
+)
+
+
+def _paths(parents: dict) -> dict:
+    paths: dict = {}
+    for task_id in parents:
+        chain = []
+        cur = task_id
+        while cur is not None and cur in parents and cur not in paths and cur not in chain:
+            chain.append(cur)
+            cur = parents[cur]
+        prefix = paths.get(cur, "") if cur is not None else ""
+        for node in reversed(chain):
+            prefix = f"{prefix}{node}/"
+            paths[node] = prefix
+    return paths
+
+
+def upgrade() -> None:
+    # Replaces the lazy backfill 0005 left to tree reads; one project at a time keeps memory bounded.
+    bind = op.get_bind()
+    project_ids = bind.scalars(sa.select(tasks.c.project_id).where(tasks.c.wbs_path.is_(None)).distinct()).all()
+    for project_id in project_ids:
+        rows = bind.execute(sa.select(tasks.c.id, tasks.c.parent_task_id).where(tasks.c.project_id == project_id))
+        parents = dict(rows.all())
+        bind.execute(
+            tasks.update()
+            .where(tasks.c.id == sa.bindparam("task_id"))
+            .values(wbs_path=sa.bindparam("path"), updated_at=tasks.c.updated_at),
+            [{"task_id": task_id, "path": path} for task_id, path in _paths(parents).items()],
+        )
+
+
+def downgrade() -> None:
+    # Paths stay valid for the 0005 schema.
+    pass
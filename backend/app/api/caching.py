@@ -0,0 +1,32 @@
+"""Serve JSON reads through ``response_cache``.
+
+On a hit the response is the stored bytes and no session is opened; on a
+miss ``build`` runs on a fresh session and its payload is encoded once,
+stored and returned.
+"""
+
+from collections.abc import Callable, Sequence
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.fast_json import dump_json
+from app.db.session import SessionLocal
+from app.services.response_cache import response_cache
+
+
+def cached_json(request: Request, namespace: str, tags: Sequence[str], build: Callable[[Session], object]) -> Response:
+    if not response_cache.enabled:
+        with SessionLocal() as db:
+            return Response(dump_json(build(db)), media_type="application/json")
+    # Sorted so the same parameters in a different order share an entry.
+    query = urlencode(sorted(request.query_params.multi_items()))
+    key = response_cache.key(namespace, f"{request.url.path}?{query}", tags)
+    body = response_cache.get(namespace, key)
+    if body is not None:
+        return Response(body, media_type="application/json", headers={"X-Cache": "hit"})
+    with SessionLocal() as db:
+        body = dump_json(build(db))
+    response_cache.set(key, body)
+    return Response(body, media_type="application/json", headers={"X-Cache": "miss"})
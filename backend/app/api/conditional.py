@@ -0,0 +1,29 @@
+"""Entity tags and ``If-None-Match`` / ``If-Match`` checks for conditional requests."""
+
+import hashlib
+
+from fastapi import HTTPException
+
+
+def make_etag(*parts: object) -> str:
+    """Strong entity tag over the string form of ``parts``."""
+    digest = hashlib.sha1("|".join("" if part is None else str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """Whether an ``If-None-Match`` / ``If-Match`` header lists ``etag`` (or ``*``)."""
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def row_etag(row_id: str, version: int) -> str:
+    return make_etag(row_id, version)
+
+
+def require_match(if_match: str | None, etag: str) -> None:
+    """412 when an ``If-Match`` header was sent and names another version."""
+    if if_match is not None and not etag_matches(if_match, etag):
+        raise HTTPException(status_code=412, detail="resource was modified; reload and retry")
@@ -0,0 +1,40 @@
+"""JSON responses encoded straight from Core rows with orjson.
+
+List endpoints select only the columns their output model declares and
+hand plain dicts to ``json_response``: no ORM objects enter the identity
+map and no per-row model is validated. Keys and value formats (ISO
+datetimes, enum values, floats for numerics) match the Pydantic models, so
+the payload is unchanged; the models stay as ``response_model`` for the
+OpenAPI schema.
+"""
+
+from decimal import Decimal
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy.engine import Result
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"cannot serialize {type(value).__name__}")
+
+
+def dump_json(payload) -> bytes:
+    return orjson.dumps(payload, default=_default)
+
+
+def json_response(payload) -> Response:
+    return Response(dump_json(payload), media_type="application/json")
+
+
+def model_columns(entity, out_model: type[BaseModel], exclude: tuple[str, ...] = ()) -> list:
+    """Columns of ``entity`` named like the fields of ``out_model``, in field order."""
+    return [getattr(entity, name) for name in out_model.model_fields if name not in exclude]
+
+
+def row_dicts(result: Result) -> list[dict]:
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
@@ -0,0 +1,33 @@
+"""Opaque keyset cursors over ``(created_at, id)`` ordered listings."""
+
+import base64
+import binascii
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), row_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="invalid cursor") from exc
+
+
+def after_cursor(
+    created_col: InstrumentedAttribute, id_col: InstrumentedAttribute, cursor: str, descending: bool = True
+):
+    """Predicate selecting rows strictly after ``cursor`` in ``created_at desc, id desc`` order (or asc)."""
+    created_at, row_id = decode_cursor(cursor)
+    if not descending:
+        return or_(created_col > created_at, and_(created_col == created_at, id_col > row_id))
+    return or_(created_col < created_at, and_(created_col == created_at, id_col < row_id))
@@ -0,0 +1,64 @@
+"""Async versions of the read-heavy list routes.
+
+Mounted ahead of the sync routers when ``ASYNC_READS`` is set, so these
+paths are served on the event loop from the async engine instead of
+holding a thread-pool worker per request. Statements and serialization
+are shared with the sync routes; only the session differs. Hidden from
+the schema, which the sync routes already describe.
+
+``/projects`` stays on its sync route: it is served from the response
+cache, and a hit opens no session at all.
+"""
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.fast_json import row_dicts
+from app.api.routes.quality_issues import issue_list_statement, issue_page, kpi_statement, kpi_summary
+from app.api.routes.tasks import group_predecessors, predecessor_statement, task_list_statement, task_page
+from app.db.session import get_async_db
+from app.models.enums import QualityIssueStatus, QualityLevel
+
+router = APIRouter(include_in_schema=False)
+
+
+@router.get("/quality-issues")
+async def list_quality_issues_async(
+    project_id: str | None = Query(default=None),
+    status: QualityIssueStatus | None = Query(default=None),
+    level: QualityLevel | None = Query(default=None),
+    owner_name: str | None = Query(default=None),
+    overdue: bool = Query(default=False),
+    due_from: datetime | None = Query(default=None),
+    due_to: datetime | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    stmt = issue_list_statement(project_id, status, level, owner_name, overdue, due_from, due_to, cursor, limit)
+    return issue_page(row_dicts(await db.execute(stmt)), limit)
+
+
+@router.get("/quality-issues/kpis")
+async def quality_kpis_async(
+    project_id: str = Query(...),
+    section_id: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows = (await db.scalars(kpi_statement(project_id, section_id))).all()
+    return kpi_summary(project_id, section_id, rows)
+
+
+@router.get("/tasks")
+async def list_tasks_async(
+    project_id: str | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows = row_dicts(await db.execute(task_list_statement(project_id, cursor, limit)))
+    task_ids = [row["id"] for row in rows[:limit]]
+    dep_map = group_predecessors((await db.execute(predecessor_statement(task_ids))).all()) if task_ids else {}
+    return task_page(rows, dep_map, limit)
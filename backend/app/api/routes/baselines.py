@@ -0,0 +1,162 @@
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.models.entities import Project, ScheduleBaseline
+from app.schemas.baseline import (
+    BaselineCreate,
+    BaselineDiffOut,
+    BaselineEdgeRef,
+    BaselineOut,
+    BaselineTaskChange,
+    BaselineTaskRef,
+)
+from app.services.baselines import (
+    DATE_COLUMNS,
+    EDGE_KINDS,
+    ScheduleSnapshot,
+    changed_rows,
+    diff_snapshots,
+    dump_snapshot,
+    load_snapshot,
+    take_snapshot,
+)
+from app.services.schedule_cache import load_schedule, schedule_cache
+
+router = APIRouter()
+
+
+def serialize_baseline(row: ScheduleBaseline, payload_bytes: int) -> BaselineOut:
+    return BaselineOut(
+        id=row.id,
+        project_id=row.project_id,
+        name=row.name,
+        schedule_version=row.schedule_version,
+        task_count=row.task_count,
+        dependency_count=row.dependency_count,
+        planned_length=row.planned_length,
+        payload_bytes=payload_bytes,
+        created_by=row.created_by,
+        created_at=row.created_at,
+    )
+
+
+def task_refs(snapshot: ScheduleSnapshot, rows: np.ndarray) -> list[BaselineTaskRef]:
+    return [
+        BaselineTaskRef(task_id=task_id, wbs_code=wbs_code, name=name)
+        for task_id, wbs_code, name in zip(
+            snapshot.task_ids[rows].tolist(), snapshot.wbs_codes[rows].tolist(), snapshot.names[rows].tolist()
+        )
+    ]
+
+
+def edge_refs(snapshot: ScheduleSnapshot, edges: np.ndarray) -> list[BaselineEdgeRef]:
+    return [
+        BaselineEdgeRef(predecessor_task_id=pred, successor_task_id=succ, dependency_type=EDGE_KINDS[kind], lag_days=lag)
+        for pred, succ, kind, lag in zip(
+            snapshot.task_ids[snapshot.edge_pred[edges]].tolist(),
+            snapshot.task_ids[snapshot.edge_succ[edges]].tolist(),
+            snapshot.edge_kind[edges].tolist(),
+            snapshot.edge_lag[edges].tolist(),
+        )
+    ]
+
+
+@router.post("/baselines", response_model=BaselineOut)
+def create_baseline(payload: BaselineCreate, db: Session = Depends(get_db)):
+    if db.get(Project, payload.project_id) is None:
+        raise HTTPException(status_code=404, detail="project not found")
+    # Baselines are kept for good: compute from scratch rather than from the incrementally patched cache.
+    schedule = load_schedule(db, payload.project_id)
+    snapshot = take_snapshot(db, payload.project_id, schedule)
+    blob = dump_snapshot(snapshot)
+    row = ScheduleBaseline(
+        project_id=payload.project_id,
+        name=payload.name,
+        schedule_version=schedule.version,
+        task_count=snapshot.task_count,
+        dependency_count=len(snapshot.edge_pred),
+        planned_length=snapshot.length,
+        payload=blob,
+        created_by=payload.created_by,
+    )
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+    return serialize_baseline(row, len(blob))
+
+
+@router.get("/baselines", response_model=list[BaselineOut])
+def list_baselines(project_id: str = Query(...), db: Session = Depends(get_db)):
+    # Leave the blob on the server; only its size is reported.
+    columns = [column for column in ScheduleBaseline.__table__.c if column.key != "payload"]
+    rows = db.execute(
+        select(*columns, func.length(ScheduleBaseline.payload).label("payload_bytes"))
+        .where(ScheduleBaseline.project_id == project_id)
+        .order_by(ScheduleBaseline.created_at.desc())
+    ).all()
+    return [BaselineOut(**row._mapping) for row in rows]
+
+
+@router.get("/baselines/{baseline_id}/diff", response_model=BaselineDiffOut)
+def baseline_diff(baseline_id: str, db: Session = Depends(get_db)):
+    row = db.get(ScheduleBaseline, baseline_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="baseline not found")
+    base = load_snapshot(row.payload)
+    schedule = schedule_cache.get(db, row.project_id)
+    current = take_snapshot(db, row.project_id, schedule)
+    diff = diff_snapshots(base, current)
+
+    changed = changed_rows(diff)
+    # Largest finish slip first.
+    changed = changed[np.argsort(-np.abs(diff.early_finish_shift[changed]), kind="stable")]
+    current_rows = diff.current_rows[changed]
+    shifts = {
+        name: [None if np.isnan(v) else int(v) for v in diff.date_shifts[name][changed].tolist()]
+        for name in DATE_COLUMNS
+    }
+    changed_tasks = [
+        BaselineTaskChange(
+            task_id=task_id,
+            wbs_code=wbs_code,
+            name=name,
+            planned_start_shift=shifts["planned_start"][i],
+            planned_end_shift=shifts["planned_end"][i],
+            actual_start_shift=shifts["actual_start"][i],
+            actual_end_shift=shifts["actual_end"][i],
+            duration_change=duration_change,
+            early_start_shift=es_shift,
+            early_finish_shift=ef_shift,
+            was_critical=was_critical,
+            is_critical=is_critical,
+        )
+        for i, (task_id, wbs_code, name, duration_change, es_shift, ef_shift, was_critical, is_critical) in enumerate(
+            zip(
+                diff.common[changed].tolist(),
+                current.wbs_codes[current_rows].tolist(),
+                current.names[current_rows].tolist(),
+                diff.duration_change[changed].tolist(),
+                diff.early_start_shift[changed].tolist(),
+                diff.early_finish_shift[changed].tolist(),
+                base.critical[diff.base_rows[changed]].tolist(),
+                current.critical[current_rows].tolist(),
+            )
+        )
+    ]
+    return BaselineDiffOut(
+        baseline_id=row.id,
+        baseline_version=row.schedule_version,
+        current_version=schedule.version,
+        baseline_length=base.length,
+        current_length=current.length,
+        length_change=diff.length_change,
+        cycle=base.cycle or current.cycle,
+        added_tasks=task_refs(current, diff.added),
+        removed_tasks=task_refs(base, diff.removed),
+        changed_tasks=changed_tasks,
+        added_dependencies=edge_refs(current, diff.edges_added),
+        removed_dependencies=edge_refs(base, diff.edges_removed),
+    )
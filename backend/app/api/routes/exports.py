@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.services.exports import EXPORTS, FORMATS, stream_export
+
+router = APIRouter()
+
+
+@router.get("/exports/{entity}")
+def export_entity(
+    entity: str,
+    format: Literal["ndjson", "csv"] = Query(default="ndjson"),
+    compression: Literal["none", "gzip"] = Query(default="none"),
+    project_id: str | None = Query(default=None),
+    since: datetime | None = Query(default=None),
+):
+    """Stream every row of ``entity`` (tasks, quality-issues, quality-issue-events, documents)."""
+    if entity not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"unknown export: {entity}")
+    gzip = compression == "gzip"
+    filename = f"{entity}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_export(entity, format, project_id, since, gzip),
+        media_type="application/gzip" if gzip else FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
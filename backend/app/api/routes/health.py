@@ -1,8 +1,15 @@
 from fastapi import APIRouter
 
+from app.services.response_cache import response_cache
+
 router = APIRouter()
 
 
 @router.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@router.get("/health/cache")
+def cache_stats():
+    return response_cache.stats()
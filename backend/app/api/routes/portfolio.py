@@ -0,0 +1,52 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal, get_db
+from app.jobs.portfolio_schedule import refresh_portfolio
+from app.models.entities import Project, ProjectScheduleSummary
+from app.schemas.portfolio import PortfolioRefreshOut, ProjectScheduleSummaryOut
+
+router = APIRouter()
+
+
+@router.get("/portfolio/schedule", response_model=list[ProjectScheduleSummaryOut])
+def portfolio_schedule(limit: int = Query(default=200, ge=1, le=1000), db: Session = Depends(get_db)):
+    rows = db.execute(
+        select(
+            ProjectScheduleSummary,
+            Project.code,
+            Project.name,
+            Project.schedule_version.label("current_version"),
+        )
+        .join(Project, Project.id == ProjectScheduleSummary.project_id)
+        .order_by(ProjectScheduleSummary.slippage_days.desc(), ProjectScheduleSummary.project_id)
+        .limit(limit)
+    ).all()
+    return [
+        ProjectScheduleSummaryOut(
+            project_id=summary.project_id,
+            project_code=code,
+            project_name=name,
+            schedule_version=summary.schedule_version,
+            stale=summary.schedule_version != current_version,
+            task_count=summary.task_count,
+            cycle=summary.cycle,
+            planned_length=summary.planned_length,
+            actual_length=summary.actual_length,
+            slippage_days=summary.slippage_days,
+            computed_at=summary.computed_at,
+        )
+        for summary, code, name, current_version in rows
+    ]
+
+
+def _refresh_in_background(force: bool) -> None:
+    with SessionLocal() as db:
+        refresh_portfolio(db, force=force)
+
+
+@router.post("/portfolio/schedule/refresh", response_model=PortfolioRefreshOut, status_code=202)
+def refresh_portfolio_schedule(background_tasks: BackgroundTasks, force: bool = False):
+    background_tasks.add_task(_refresh_in_background, force)
+    return PortfolioRefreshOut(scheduled=True)
@@ -1,25 +1,91 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, HTTPException, Query, Request
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.models.entities import Project
+from app.api.caching import cached_json
+from app.api.fast_json import row_dicts
+from app.models.entities import Project, Section, WorkArea
+from app.models.enums import WorkAreaStatus
 
 router = APIRouter()
 
+PROJECT_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.code,
+    Project.status,
+    Project.location_text.label("location"),
+    Project.start_date.label("startDate"),
+    Project.end_date.label("endDate"),
+)
+
+
+def project_list_statement():
+    return select(*PROJECT_COLUMNS).order_by(Project.created_at.desc()).limit(200)
+
+
+def _require_project(db: Session, project_id: str) -> None:
+    if db.scalar(select(Project.id).where(Project.id == project_id)) is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
 
 @router.get("/projects")
-def list_projects(db: Session = Depends(get_db)):
-    rows = db.scalars(select(Project).order_by(Project.created_at.desc()).limit(200)).all()
-    return [
-        {
-            "id": row.id,
-            "name": row.name,
-            "code": row.code,
-            "status": row.status.value,
-            "location": row.location_text,
-            "startDate": row.start_date.isoformat() if row.start_date else None,
-            "endDate": row.end_date.isoformat() if row.end_date else None,
-        }
-        for row in rows
-    ]
+def list_projects(request: Request):
+    return cached_json(request, "projects", ["projects"], lambda db: row_dicts(db.execute(project_list_statement())))
+
+
+@router.get("/projects/{project_id}")
+def get_project(project_id: str, request: Request):
+    def build(db: Session):
+        stmt = select(*PROJECT_COLUMNS, Project.organization_id.label("organizationId")).where(Project.id == project_id)
+        rows = row_dicts(db.execute(stmt))
+        if not rows:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return rows[0]
+
+    return cached_json(request, "project", [f"project:{project_id}"], build)
+
+
+@router.get("/projects/{project_id}/sections")
+def list_sections(project_id: str, request: Request):
+    def build(db: Session):
+        _require_project(db, project_id)
+        stmt = (
+            select(Section.id, Section.code, Section.name, Section.manager_name.label("managerName"))
+            .where(Section.project_id == project_id)
+            .order_by(Section.code)
+        )
+        return row_dicts(db.execute(stmt))
+
+    return cached_json(request, "sections", [f"sections:{project_id}"], build)
+
+
+@router.get("/projects/{project_id}/work-areas")
+def list_work_areas(
+    project_id: str,
+    request: Request,
+    section_id: str | None = Query(default=None),
+    status: WorkAreaStatus | None = Query(default=None),
+):
+    def build(db: Session):
+        _require_project(db, project_id)
+        stmt = (
+            select(
+                WorkArea.id,
+                WorkArea.section_id.label("sectionId"),
+                WorkArea.name,
+                WorkArea.manager_name.label("managerName"),
+                WorkArea.status,
+                WorkArea.progress_percent.label("progressPercent"),
+            )
+            .join(Section, Section.id == WorkArea.section_id)
+            .where(Section.project_id == project_id)
+            .order_by(Section.code, WorkArea.name)
+        )
+        if section_id:
+            stmt = stmt.where(WorkArea.section_id == section_id)
+        if status:
+            stmt = stmt.where(WorkArea.status == status)
+        return row_dicts(db.execute(stmt))
+
+    return cached_json(request, "work_areas", [f"work_areas:{project_id}"], build)
@@ -1,19 +1,53 @@
+import json
 from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session, selectinload
 
-from app.db.session import get_db
-from app.models.entities import QualityIssue, QualityIssueEvent
-from app.models.enums import QualityIssueStatus
+from app.api.conditional import etag_matches, make_etag, require_match, row_etag
+from app.api.fast_json import json_response, model_columns, row_dicts
+from app.api.pagination import after_cursor, decode_cursor, encode_cursor
+from app.db.session import SessionLocal, get_db
+from app.db.versioning import versioned_update
+from app.models.entities import (
+    ArchivedQualityIssue,
+    QualityAcceptance,
+    QualityIssue,
+    QualityIssueEvent,
+    QualityKpi,
+    QualityRectification,
+    uuid_str,
+)
+from app.models.enums import QualityIssueStatus, QualityLevel
 from app.schemas.quality import (
+    QualityAcceptanceOut,
+    QualityDwellStatOut,
+    QualityDwellStatsOut,
+    QualityIssueBatchResult,
+    QualityIssueBatchTransition,
     QualityIssueCreate,
+    QualityIssueDetailOut,
     QualityIssueEventOut,
     QualityIssueOut,
+    QualityIssuePageOut,
+    QualityIssueSearchHit,
+    QualityIssueSearchOut,
     QualityIssueTransition,
     QualityIssueUpdate,
+    QualityKpiOut,
+    QualityKpiSummaryOut,
+    QualityRectificationOut,
 )
+from app.services.dwell_time import dwell_store
+from app.services.escalation import escalation_scheduler
+from app.services.live_feed import FeedOverflow, event_message, feed_broker, issue_message, publish
+from app.services.quality_archive import ArchivedIssue, find_archived_issue, read_archived_issue
+from app.services.quality_kpi import COUNTER_COLUMNS, OPEN_STATUSES, KpiDeltas, close_seconds, kpi_key
+from app.services.search_index import index_issues, search_index
 
 router = APIRouter()
 
@@ -28,6 +62,8 @@ TRANSITIONS: dict[QualityIssueStatus, set[QualityIssueStatus]] = {
     QualityIssueStatus.closed: set(),
     QualityIssueStatus.rejected: {QualityIssueStatus.rectifying},
 }
+FEED_KEEPALIVE_SECONDS = 15
+FEED_REPLAY_BATCH = 500
 
 
 def to_out(row: QualityIssue) -> QualityIssueOut:
@@ -46,8 +82,10 @@ def to_out(row: QualityIssue) -> QualityIssueOut:
         reported_at=row.reported_at,
         due_at=row.due_at,
         closed_at=row.closed_at,
+        overdue_at=row.overdue_at,
         created_at=row.created_at,
         updated_at=row.updated_at,
+        version=row.version,
     )
 
 
@@ -63,27 +101,341 @@ def event_out(row: QualityIssueEvent) -> QualityIssueEventOut:
     )
 
 
-@router.get("/quality-issues", response_model=list[QualityIssueOut])
-def list_quality_issues(
-    project_id: str | None = Query(default=None),
-    status: QualityIssueStatus | None = Query(default=None),
-    db: Session = Depends(get_db),
+def issue_list_statement(
+    project_id: str | None,
+    status: QualityIssueStatus | None,
+    level: QualityLevel | None,
+    owner_name: str | None,
+    overdue: bool,
+    due_from: datetime | None,
+    due_to: datetime | None,
+    cursor: str | None,
+    limit: int,
 ):
-    stmt = select(QualityIssue).order_by(QualityIssue.created_at.desc())
+    stmt = select(*model_columns(QualityIssue, QualityIssueOut)).order_by(
+        QualityIssue.created_at.desc(), QualityIssue.id.desc()
+    )
     if project_id:
         stmt = stmt.where(QualityIssue.project_id == project_id)
     if status:
         stmt = stmt.where(QualityIssue.status == status)
-    rows = db.scalars(stmt.limit(500)).all()
-    return [to_out(row) for row in rows]
+    if level:
+        stmt = stmt.where(QualityIssue.level == level)
+    if owner_name:
+        stmt = stmt.where(QualityIssue.owner_name == owner_name)
+    if overdue:
+        stmt = stmt.where(QualityIssue.status.in_(OPEN_STATUSES), QualityIssue.due_at < datetime.utcnow())
+    if due_from:
+        stmt = stmt.where(QualityIssue.due_at >= due_from)
+    if due_to:
+        stmt = stmt.where(QualityIssue.due_at < due_to)
+    if cursor:
+        stmt = stmt.where(after_cursor(QualityIssue.created_at, QualityIssue.id, cursor))
+    return stmt.limit(limit + 1)
+
+
+def issue_page(rows: list[dict], limit: int) -> Response:
+    next_cursor = encode_cursor(rows[limit - 1]["created_at"], rows[limit - 1]["id"]) if len(rows) > limit else None
+    return json_response({"items": rows[:limit], "next_cursor": next_cursor})
+
+
+@router.get("/quality-issues", response_model=QualityIssuePageOut)
+def list_quality_issues(
+    project_id: str | None = Query(default=None),
+    status: QualityIssueStatus | None = Query(default=None),
+    level: QualityLevel | None = Query(default=None),
+    owner_name: str | None = Query(default=None),
+    overdue: bool = Query(default=False),
+    due_from: datetime | None = Query(default=None),
+    due_to: datetime | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    stmt = issue_list_statement(project_id, status, level, owner_name, overdue, due_from, due_to, cursor, limit)
+    return issue_page(row_dicts(db.execute(stmt)), limit)
+
+
+def kpi_out(section_id: str | None, level: str | None, counts: dict[str, int]) -> QualityKpiOut:
+    open_count = counts["reported_count"] + counts["rectifying_count"] + counts["pending_review_count"]
+    closed = counts["closed_count"]
+    return QualityKpiOut(
+        section_id=section_id,
+        level=level,
+        open_count=open_count,
+        close_rate=closed / counts["total_count"] if counts["total_count"] else 0.0,
+        avg_close_hours=counts["close_seconds_total"] / closed / 3600 if closed else None,
+        **counts,
+    )
+
+
+def kpi_statement(project_id: str, section_id: str | None):
+    stmt = select(QualityKpi).where(QualityKpi.project_id == project_id)
+    if section_id is not None:
+        stmt = stmt.where(QualityKpi.section_key == section_id)
+    return stmt.order_by(QualityKpi.section_key, QualityKpi.level)
+
+
+def kpi_summary(project_id: str, section_id: str | None, rows: list[QualityKpi]) -> QualityKpiSummaryOut:
+    totals = dict.fromkeys(COUNTER_COLUMNS, 0)
+    items = []
+    for row in rows:
+        counts = {column: getattr(row, column) for column in COUNTER_COLUMNS}
+        for column, value in counts.items():
+            totals[column] += value
+        items.append(kpi_out(row.section_key or None, row.level.value, counts))
+    return QualityKpiSummaryOut(project_id=project_id, totals=kpi_out(section_id, None, totals), items=items)
+
+
+@router.get("/quality-issues/kpis", response_model=QualityKpiSummaryOut)
+def quality_kpis(
+    project_id: str = Query(...),
+    section_id: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    return kpi_summary(project_id, section_id, db.scalars(kpi_statement(project_id, section_id)).all())
+
+
+@router.get("/quality-issues/dwell-stats", response_model=QualityDwellStatsOut)
+def quality_dwell_stats(
+    group_by: Literal["project", "section", "level", "owner"] = Query(default="project"),
+    project_id: str | None = Query(default=None),
+    status: QualityIssueStatus | None = Query(default=None),
+    percentiles: str = Query(default="50,90,95", pattern=r"^\d{1,2}(,\d{1,2})*$"),
+    include_open: bool = Query(default=False),
+    db: Session = Depends(get_db),
+):
+    dwell_store.refresh(db)
+    stats = dwell_store.stats(
+        group_by,
+        sorted({int(p) for p in percentiles.split(",")}),
+        project_id=project_id,
+        status=status,
+        include_open=include_open,
+    )
+    return QualityDwellStatsOut(
+        group_by=group_by,
+        items=[
+            QualityDwellStatOut(
+                group=row.group,
+                status=row.status.value,
+                count=row.count,
+                mean_hours=row.mean_seconds / 3600,
+                percentile_hours={f"p{p}": value / 3600 for p, value in row.percentiles.items()},
+            )
+            for row in stats
+        ],
+    )
+
+
+@router.get("/quality-issues/search", response_model=QualityIssueSearchOut)
+def search_quality_issues(
+    q: str = Query(..., min_length=1, max_length=200),
+    project_id: str | None = Query(default=None),
+    status: QualityIssueStatus | None = Query(default=None),
+    level: QualityLevel | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+):
+    search_index.sync(db)
+    total, hits = search_index.search(
+        q,
+        project_id=project_id,
+        status=status.value if status else None,
+        level=level.value if level else None,
+        limit=limit,
+        offset=offset,
+    )
+    rows = db.scalars(select(QualityIssue).where(QualityIssue.id.in_([hit.issue_id for hit in hits])))
+    by_id = {row.id: row for row in rows}
+    return QualityIssueSearchOut(
+        total=total,
+        items=[
+            QualityIssueSearchHit(score=hit.score, issue=to_out(by_id[hit.issue_id]))
+            for hit in hits
+            if hit.issue_id in by_id
+        ],
+    )
+
+
+def load_missed_events(project_id: str, cursor: str) -> list[dict]:
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(QualityIssueEvent, QualityIssue)
+            .join(QualityIssue, QualityIssue.id == QualityIssueEvent.issue_id)
+            .where(
+                QualityIssue.project_id == project_id,
+                after_cursor(QualityIssueEvent.action_at, QualityIssueEvent.id, cursor, descending=False),
+            )
+            .order_by(QualityIssueEvent.action_at, QualityIssueEvent.id)
+            .limit(FEED_REPLAY_BATCH)
+        ).all()
+        return [event_message(event_out(event), to_out(issue)) for event, issue in rows]
+
+
+def sse(message: dict) -> str:
+    event_id = f"id: {message['cursor']}\n" if "cursor" in message else ""
+    return f"{event_id}event: {message['type']}\ndata: {json.dumps(message, ensure_ascii=False)}\n\n"
+
+
+async def feed_stream(project_id: str, cursor: str | None):
+    # Subscribe before replaying so nothing committed in between is lost;
+    # live events already covered by the replay are skipped.
+    async with feed_broker.subscribe(project_id) as subscription:
+        while cursor:
+            missed = await run_in_threadpool(load_missed_events, project_id, cursor)
+            for message in missed:
+                yield sse(message)
+            if len(missed) < FEED_REPLAY_BATCH:
+                break
+            cursor = missed[-1]["cursor"]
+        replayed_to = decode_cursor(cursor) if cursor else None
+
+        while True:
+            try:
+                message = await subscription.get(FEED_KEEPALIVE_SECONDS)
+            except FeedOverflow:
+                yield sse({"type": "reset"})
+                return
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+            if message["type"] == "event" and replayed_to and decode_cursor(message["cursor"]) <= replayed_to:
+                continue
+            yield sse(message)
+
+
+@router.get("/quality-issues/feed")
+async def quality_feed(
+    project_id: str = Query(...),
+    cursor: str | None = Query(default=None),
+    last_event_id: str | None = Header(default=None),
+):
+    """Server-sent events for a project; reconnect with the last ``id`` to replay missed events."""
+    cursor = cursor or last_event_id
+    if cursor:
+        decode_cursor(cursor)
+    return StreamingResponse(
+        feed_stream(project_id, cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def issue_response(row: QualityIssue, response: Response, if_none_match: str | None) -> QualityIssueOut | Response:
+    etag = row_etag(row.id, row.version)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return to_out(row)
+
+
+def archived_issue_out(archived: ArchivedIssue | None) -> QualityIssueOut:
+    if not archived:
+        raise HTTPException(status_code=404, detail="quality issue not found")
+    return QualityIssueOut.model_validate(archived.issue)
 
 
 @router.get("/quality-issues/{issue_id}", response_model=QualityIssueOut)
-def get_quality_issue(issue_id: str, db: Session = Depends(get_db)):
+def get_quality_issue(
+    issue_id: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
     row = db.get(QualityIssue, issue_id)
-    if not row:
+    if row:
+        return issue_response(row, response, if_none_match)
+    return archived_issue_out(find_archived_issue(db, issue_id))
+
+
+def detail_etag(
+    issue_id: str,
+    version: int,
+    rectification_count: int,
+    rectification_latest: datetime | None,
+    acceptance_count: int,
+    acceptance_latest: datetime | None,
+) -> str:
+    # Events never change without bumping the issue's version; children are counted for deletes.
+    return make_etag(
+        issue_id, version, rectification_count, rectification_latest, acceptance_count, acceptance_latest
+    )
+
+
+@router.get("/quality-issues/{issue_id}/detail", response_model=QualityIssueDetailOut)
+def get_quality_issue_detail(
+    issue_id: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    """Issue with events, rectifications and acceptances; ``If-None-Match`` costs one query."""
+    rectifications = select(QualityRectification).where(QualityRectification.issue_id == issue_id).subquery()
+    acceptances = select(QualityAcceptance).where(QualityAcceptance.issue_id == issue_id).subquery()
+    version = db.execute(
+        select(
+            QualityIssue.version,
+            select(func.count()).select_from(rectifications).scalar_subquery(),
+            select(func.max(rectifications.c.updated_at)).scalar_subquery(),
+            select(func.count()).select_from(acceptances).scalar_subquery(),
+            select(func.max(acceptances.c.created_at)).scalar_subquery(),
+        ).where(QualityIssue.id == issue_id)
+    ).first()
+    if version is not None:
+        etag = detail_etag(issue_id, *version)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        row = db.scalars(
+            select(QualityIssue)
+            .where(QualityIssue.id == issue_id)
+            .options(
+                selectinload(QualityIssue.events),
+                selectinload(QualityIssue.rectifications),
+                selectinload(QualityIssue.acceptances),
+            )
+        ).one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail="quality issue not found")
+        response.headers["ETag"] = detail_etag(
+            issue_id,
+            row.version,
+            len(row.rectifications),
+            max((item.updated_at for item in row.rectifications), default=None),
+            len(row.acceptances),
+            max((item.created_at for item in row.acceptances), default=None),
+        )
+        return QualityIssueDetailOut(
+            issue=to_out(row),
+            events=[event_out(event) for event in row.events],
+            rectifications=[
+                QualityRectificationOut.model_validate(item, from_attributes=True) for item in row.rectifications
+            ],
+            acceptances=[QualityAcceptanceOut.model_validate(item, from_attributes=True) for item in row.acceptances],
+        )
+
+    entry = db.get(ArchivedQualityIssue, issue_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="quality issue not found")
-    return to_out(row)
+    # Archived aggregates never change, so the manifest row answers a revalidation without reading the file.
+    etag = make_etag(issue_id, "archived", entry.archived_at)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    archived = read_archived_issue(entry.archive_file, issue_id)
+    if not archived:
+        raise HTTPException(status_code=404, detail="quality issue not found")
+    response.headers["ETag"] = etag
+    return QualityIssueDetailOut(
+        issue=QualityIssueOut.model_validate(archived.issue),
+        events=sorted(
+            (QualityIssueEventOut.model_validate(event) for event in archived.events),
+            key=lambda event: event.action_at,
+            reverse=True,
+        ),
+        rectifications=[QualityRectificationOut.model_validate(item) for item in archived.rectifications],
+        acceptances=[QualityAcceptanceOut.model_validate(item) for item in archived.acceptances],
+    )
 
 
 @router.post("/quality-issues", response_model=QualityIssueOut)
@@ -107,41 +459,88 @@ def create_quality_issue(payload: QualityIssueCreate, db: Session = Depends(get_
     )
     db.add(row)
     db.flush()
-    db.add(
-        QualityIssueEvent(
-            issue_id=row.id,
-            from_status=None,
-            to_status=QualityIssueStatus.reported,
-            action_by=payload.reporter_name or "system",
-            action_note="issue reported",
-            action_at=now,
-        )
+    event = QualityIssueEvent(
+        issue_id=row.id,
+        from_status=None,
+        to_status=QualityIssueStatus.reported,
+        action_by=payload.reporter_name or "system",
+        action_note="issue reported",
+        action_at=now,
     )
+    db.add(event)
+    deltas = KpiDeltas()
+    deltas.add_issue(kpi_key(row.project_id, row.section_id, row.level), row.status)
+    deltas.apply(db)
+    db.flush()
+    event_data = event_out(event)
     db.commit()
     db.refresh(row)
-    return to_out(row)
+    out = to_out(row)
+    index_issues([row])
+    publish(row.project_id, event_message(event_data, out))
+    if row.due_at:
+        escalation_scheduler.notify(row.id, row.due_at)
+    return out
 
 
 @router.patch("/quality-issues/{issue_id}", response_model=QualityIssueOut)
-def update_quality_issue(issue_id: str, payload: QualityIssueUpdate, db: Session = Depends(get_db)):
-    row = db.get(QualityIssue, issue_id)
-    if not row:
+def update_quality_issue(
+    issue_id: str,
+    payload: QualityIssueUpdate,
+    response: Response,
+    if_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    current = db.get(QualityIssue, issue_id, with_for_update=True)
+    if not current:
         raise HTTPException(status_code=404, detail="quality issue not found")
+    require_match(if_match, row_etag(current.id, current.version))
 
+    old_key = kpi_key(current.project_id, current.section_id, current.level)
     data = payload.model_dump(exclude_unset=True)
-    for k, v in data.items():
-        setattr(row, k, v)
-    row.updated_at = datetime.utcnow()
+    now = datetime.utcnow()
+    data["updated_at"] = now
+    overdue = current.overdue_at is not None
+    due_at = data.get("due_at", current.due_at)
+    # The deadline was extended; the scheduler flags the issue again if it lapses.
+    clear_overdue = "due_at" in data and overdue and (due_at is None or due_at > now)
+    if clear_overdue:
+        data["overdue_at"] = None
+    # The row lock makes the version check a formality here; it still guards the write.
+    row = versioned_update(db, QualityIssue, issue_id, current.version, data)
+    if row is None:
+        db.rollback()
+        raise HTTPException(status_code=412, detail="resource was modified; reload and retry")
+
+    new_key = kpi_key(row.project_id, row.section_id, row.level)
+    deltas = KpiDeltas()
+    closed = close_seconds(row.reported_at, row.closed_at) if row.status == QualityIssueStatus.closed else 0
+    deltas.move_issue(old_key, new_key, row.status, closed, overdue=overdue)
+    if clear_overdue:
+        deltas.set_overdue(new_key, row.status, False)
+    deltas.apply(db)
+    out = to_out(row)
     db.commit()
-    db.refresh(row)
-    return to_out(row)
+    index_issues([out])
+    publish(out.project_id, issue_message(out))
+    if "due_at" in data and out.due_at:
+        escalation_scheduler.notify(out.id, out.due_at)
+    response.headers["ETag"] = row_etag(out.id, out.version)
+    return out
 
 
 @router.post("/quality-issues/{issue_id}/transition", response_model=QualityIssueOut)
-def transition_quality_issue(issue_id: str, payload: QualityIssueTransition, db: Session = Depends(get_db)):
-    row = db.get(QualityIssue, issue_id)
+def transition_quality_issue(
+    issue_id: str,
+    payload: QualityIssueTransition,
+    response: Response,
+    if_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    row = db.get(QualityIssue, issue_id, with_for_update=True)
     if not row:
         raise HTTPException(status_code=404, detail="quality issue not found")
+    require_match(if_match, row_etag(row.id, row.version))
 
     allowed = TRANSITIONS.get(row.status, set())
     if payload.to_status not in allowed:
@@ -151,20 +550,127 @@ def transition_quality_issue(issue_id: str, payload: QualityIssueTransition, db:
     from_status = row.status
     row.status = payload.to_status
     row.updated_at = now
+    row.version += 1
     row.closed_at = now if payload.to_status == QualityIssueStatus.closed else None
-    db.add(
-        QualityIssueEvent(
-            issue_id=row.id,
-            from_status=from_status,
-            to_status=payload.to_status,
-            action_by=payload.actor,
-            action_note=payload.note,
-            action_at=now,
-        )
+    event = QualityIssueEvent(
+        issue_id=row.id,
+        from_status=from_status,
+        to_status=payload.to_status,
+        action_by=payload.actor,
+        action_note=payload.note,
+        action_at=now,
+    )
+    db.add(event)
+    deltas = KpiDeltas()
+    deltas.change_status(
+        kpi_key(row.project_id, row.section_id, row.level),
+        from_status,
+        row.status,
+        close_seconds(row.reported_at, row.closed_at),
+        overdue=row.overdue_at is not None,
     )
+    deltas.apply(db)
+    db.flush()
+    event_data = event_out(event)
+    out = to_out(row)
     db.commit()
-    db.refresh(row)
-    return to_out(row)
+    index_issues([out])
+    publish(out.project_id, event_message(event_data, out))
+    response.headers["ETag"] = row_etag(out.id, out.version)
+    return out
+
+
+@router.post("/quality-issues/transitions", response_model=list[QualityIssueBatchResult])
+def batch_transition_quality_issues(payload: QualityIssueBatchTransition, db: Session = Depends(get_db)):
+    issue_ids = list(dict.fromkeys(item.issue_id for item in payload.items))
+    current = {
+        row.id: row
+        for row in db.execute(
+            select(
+                QualityIssue.id,
+                QualityIssue.project_id,
+                QualityIssue.section_id,
+                QualityIssue.level,
+                QualityIssue.status,
+                QualityIssue.reported_at,
+                QualityIssue.overdue_at,
+                QualityIssue.version,
+            )
+            .where(QualityIssue.id.in_(issue_ids))
+            .order_by(QualityIssue.id)
+            .with_for_update()
+        )
+    }
+
+    now = datetime.utcnow()
+    results: list[QualityIssueBatchResult] = []
+    updates: list[dict] = []
+    events: list[dict] = []
+    deltas = KpiDeltas()
+    seen: set[str] = set()
+    for item in payload.items:
+        result = QualityIssueBatchResult(issue_id=item.issue_id, ok=False, to_status=item.to_status.value)
+        results.append(result)
+        issue = current.get(item.issue_id)
+        if issue is None:
+            result.error = "quality issue not found"
+            continue
+        from_status = issue.status
+        result.from_status = from_status.value
+        if item.issue_id in seen:
+            result.error = "duplicate issue in batch"
+            continue
+        seen.add(item.issue_id)
+        if item.to_status not in TRANSITIONS.get(from_status, set()):
+            result.error = f"invalid transition: {from_status.value} -> {item.to_status.value}"
+            continue
+        result.ok = True
+        closed_at = now if item.to_status == QualityIssueStatus.closed else None
+        updates.append(
+            {
+                "id": item.issue_id,
+                "status": item.to_status,
+                "updated_at": now,
+                "closed_at": closed_at,
+                "version": issue.version + 1,
+            }
+        )
+        deltas.change_status(
+            kpi_key(issue.project_id, issue.section_id, issue.level),
+            from_status,
+            item.to_status,
+            close_seconds(issue.reported_at, closed_at),
+            overdue=issue.overdue_at is not None,
+        )
+        events.append(
+            {
+                "id": uuid_str(),
+                "issue_id": item.issue_id,
+                "from_status": from_status,
+                "to_status": item.to_status,
+                "action_by": payload.actor,
+                "action_note": payload.note if item.note is None else item.note,
+                "action_at": now,
+            }
+        )
+
+    if updates:
+        db.execute(update(QualityIssue), updates)
+        db.execute(insert(QualityIssueEvent), events)
+        deltas.apply(db)
+    db.commit()
+
+    if events:
+        issues = db.scalars(select(QualityIssue).where(QualityIssue.id.in_([e["issue_id"] for e in events]))).all()
+        index_issues(issues)
+        issue_outs = {issue.id: to_out(issue) for issue in issues}
+        for event in events:
+            issue = issue_outs[event["issue_id"]]
+            event_data = QualityIssueEventOut(
+                **{**event, "from_status": event["from_status"].value, "to_status": event["to_status"].value}
+            )
+            publish(issue.project_id, event_message(event_data, issue))
+    return results
 
 
 @router.get("/quality-issues/{issue_id}/events", response_model=list[QualityIssueEventOut])
@@ -174,4 +680,9 @@ def list_quality_events(issue_id: str, db: Session = Depends(get_db)):
         .where(QualityIssueEvent.issue_id == issue_id)
         .order_by(QualityIssueEvent.action_at.desc())
     ).all()
+    if not rows:
+        archived = find_archived_issue(db, issue_id)
+        if archived:
+            events = sorted(archived.events, key=lambda event: event["action_at"], reverse=True)
+            return [QualityIssueEventOut.model_validate(event) for event in events]
     return [event_out(row) for row in rows]
@@ -1,14 +1,47 @@
-from collections import defaultdict, deque
-from datetime import datetime
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import delete, select
+import numpy as np
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
 
+from app.api.conditional import etag_matches, require_match, row_etag
+from app.api.fast_json import json_response, model_columns, row_dicts
+from app.api.pagination import after_cursor, encode_cursor
 from app.db.session import get_db
-from app.models.entities import Task, TaskDependency
+from app.db.versioning import versioned_update
+from app.models.entities import Project, Task, TaskDependency, uuid_str
 from app.models.enums import DependencyType
-from app.schemas.task import CriticalPathOut, TaskCreate, TaskOut, TaskUpdate
+from app.schemas.task import (
+    CriticalPathOut,
+    ScheduleRiskOut,
+    ScheduleRiskRequest,
+    TaskCriticalityOut,
+    TaskCreate,
+    TaskOut,
+    TaskPageOut,
+    TaskScheduleOut,
+    TaskTreeNodeOut,
+    TaskUpdate,
+    WbsImport,
+    WbsImportOut,
+    WbsTaskIn,
+)
+from app.services.gantt import stream_gantt
+from app.services.schedule_cache import bump_schedule_version, schedule_cache
+from app.services.schedule_risk import duration_bounds, risk_cache, simulate
+from app.services.scheduling import ScheduleGraph, ScheduleResult, find_critical_path
+from app.services.topo_order import (
+    DependencyCycleError,
+    UnknownPredecessorError,
+    insert_dependency,
+    next_topo_order,
+)
+from app.services.wbs_import import WbsImportError, import_wbs, parse_wbs_csv
+from app.services.wbs_tree import WbsHierarchyError, child_path, ensure_wbs_paths, load_tree, move_subtree
 
 router = APIRouter()
 
@@ -28,37 +61,97 @@ def serialize_task(task: Task, predecessor_task_ids: list[str]) -> TaskOut:
         planned_days=task.planned_days,
         actual_days=task.actual_days,
         progress_percent=float(task.progress_percent),
+        version=task.version,
         predecessor_task_ids=predecessor_task_ids,
     )
 
 
-def load_dependencies(db: Session, project_id: str) -> dict[str, list[str]]:
-    rows = db.scalars(
-        select(TaskDependency).where(TaskDependency.project_id == project_id)
-    ).all()
+def serialize_schedule(graph: ScheduleGraph, result: ScheduleResult, row: int) -> list[TaskScheduleOut]:
+    columns = zip(
+        result.early_start[row].tolist(),
+        result.early_finish[row].tolist(),
+        result.late_start[row].tolist(),
+        result.late_finish[row].tolist(),
+        result.total_float[row].tolist(),
+        result.free_float[row].tolist(),
+    )
+    return [
+        TaskScheduleOut(
+            task_id=task_id,
+            early_start=es,
+            early_finish=ef,
+            late_start=ls,
+            late_finish=lf,
+            total_float=tf,
+            free_float=ff,
+        )
+        for task_id, (es, ef, ls, lf, tf, ff) in zip(graph.task_ids, columns)
+    ]
+
+
+def predecessor_statement(task_ids: list[str]):
+    return select(TaskDependency.successor_task_id, TaskDependency.predecessor_task_id).where(
+        TaskDependency.successor_task_id.in_(task_ids)
+    )
+
+
+def group_predecessors(rows) -> dict[str, list[str]]:
     deps: dict[str, list[str]] = defaultdict(list)
-    for row in rows:
-        deps[row.successor_task_id].append(row.predecessor_task_id)
+    for successor_id, predecessor_id in rows:
+        deps[successor_id].append(predecessor_id)
     return deps
 
 
-@router.get("/tasks", response_model=list[TaskOut])
-def list_tasks(project_id: str | None = Query(default=None), db: Session = Depends(get_db)):
-    stmt = select(Task).order_by(Task.created_at.desc())
+def load_predecessors(db: Session, task_ids: list[str]) -> dict[str, list[str]]:
+    if not task_ids:
+        return defaultdict(list)
+    return group_predecessors(db.execute(predecessor_statement(task_ids)).all())
+
+
+def task_list_statement(project_id: str | None, cursor: str | None, limit: int):
+    stmt = select(*model_columns(Task, TaskOut, exclude=("predecessor_task_ids",)), Task.created_at).order_by(
+        Task.created_at.desc(), Task.id.desc()
+    )
     if project_id:
         stmt = stmt.where(Task.project_id == project_id)
-    rows = db.scalars(stmt.limit(1000)).all()
-    project_ids = {row.project_id for row in rows}
-    dep_map: dict[str, list[str]] = {}
-    for pid in project_ids:
-        dep_map.update(load_dependencies(db, pid))
-    return [serialize_task(row, dep_map.get(row.id, [])) for row in rows]
+    if cursor:
+        stmt = stmt.where(after_cursor(Task.created_at, Task.id, cursor))
+    return stmt.limit(limit + 1)
+
+
+def task_page(rows: list[dict], dep_map: dict[str, list[str]], limit: int) -> Response:
+    next_cursor = encode_cursor(rows[limit - 1]["created_at"], rows[limit - 1]["id"]) if len(rows) > limit else None
+    rows = rows[:limit]
+    for row in rows:
+        del row["created_at"]
+        row["predecessor_task_ids"] = dep_map.get(row["id"], [])
+    return json_response({"items": rows, "next_cursor": next_cursor})
+
+
+@router.get("/tasks", response_model=TaskPageOut)
+def list_tasks(
+    project_id: str | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    rows = row_dicts(db.execute(task_list_statement(project_id, cursor, limit)))
+    return task_page(rows, load_predecessors(db, [row["id"] for row in rows[:limit]]), limit)
 
 
 @router.post("/tasks", response_model=TaskOut)
 def create_task(payload: TaskCreate, db: Session = Depends(get_db)):
     now = datetime.utcnow()
+    # Bumping first takes the project row lock, serializing topo_order allocation.
+    version = bump_schedule_version(db, payload.project_id)
+    task_id = uuid_str()
+    try:
+        wbs_path = child_path(db, payload.project_id, payload.parent_task_id, task_id)
+    except WbsHierarchyError as exc:
+        db.rollback()
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
     row = Task(
+        id=task_id,
         project_id=payload.project_id,
         parent_task_id=payload.parent_task_id,
         wbs_code=payload.wbs_code,
@@ -71,6 +164,8 @@ def create_task(payload: TaskCreate, db: Session = Depends(get_db)):
         planned_days=payload.planned_days,
         actual_days=payload.actual_days,
         progress_percent=payload.progress_percent,
+        topo_order=next_topo_order(db, payload.project_id),
+        wbs_path=wbs_path,
         created_at=now,
         updated_at=now,
     )
@@ -89,21 +184,77 @@ def create_task(payload: TaskCreate, db: Session = Depends(get_db)):
         )
     db.commit()
     db.refresh(row)
+    schedule_cache.task_written(
+        row.project_id,
+        version,
+        row.id,
+        row.planned_days,
+        row.actual_days,
+        [(predecessor, row.id, DependencyType.fs, 0) for predecessor in payload.predecessor_task_ids],
+    )
     return serialize_task(row, payload.predecessor_task_ids)
 
 
+def run_wbs_import(db: Session, project_id: str, tasks: list[WbsTaskIn]) -> WbsImportOut:
+    try:
+        return import_wbs(db, project_id, tasks)
+    except WbsImportError as exc:
+        raise HTTPException(
+            status_code=409 if exc.conflict else 422,
+            detail=[error.model_dump() for error in exc.errors],
+        ) from exc
+
+
+@router.post("/tasks/import", response_model=WbsImportOut)
+def import_tasks(payload: WbsImport, db: Session = Depends(get_db)):
+    return run_wbs_import(db, payload.project_id, payload.tasks)
+
+
+@router.post("/tasks/import/csv", response_model=WbsImportOut)
+def import_tasks_csv(
+    project_id: str = Query(...),
+    content: bytes = Body(..., media_type="text/csv"),
+    db: Session = Depends(get_db),
+):
+    try:
+        known_codes = set(db.scalars(select(Task.wbs_code).where(Task.project_id == project_id)))
+        tasks = parse_wbs_csv(content.decode("utf-8-sig"), known_codes)
+    except WbsImportError as exc:
+        raise HTTPException(status_code=422, detail=[error.model_dump() for error in exc.errors]) from exc
+    return run_wbs_import(db, project_id, tasks)
+
+
 @router.patch("/tasks/{task_id}", response_model=TaskOut)
-def update_task(task_id: str, payload: TaskUpdate, db: Session = Depends(get_db)):
+def update_task(
+    task_id: str,
+    payload: TaskUpdate,
+    response: Response,
+    if_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
     row = db.get(Task, task_id)
     if not row:
         raise HTTPException(status_code=404, detail="task not found")
+    require_match(if_match, row_etag(row.id, row.version))
 
     data = payload.model_dump(exclude_unset=True, exclude={"predecessor_task_ids"})
-    for k, v in data.items():
-        setattr(row, k, v)
-    row.updated_at = datetime.utcnow()
+    if "parent_task_id" in data and data["parent_task_id"] != row.parent_task_id:
+        try:
+            ensure_wbs_paths(db, row.project_id)
+            old_path = db.scalar(select(Task.wbs_path).where(Task.id == row.id))
+            move_subtree(db, row.project_id, old_path, child_path(db, row.project_id, data["parent_task_id"], row.id))
+        except WbsHierarchyError as exc:
+            db.rollback()
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+    # No row lock: a concurrent editor's commit fails this version check instead of being overwritten.
+    row = versioned_update(db, Task, task_id, row.version, {**data, "updated_at": datetime.utcnow()})
+    if row is None:
+        db.rollback()
+        raise HTTPException(status_code=412, detail="resource was modified; reload and retry")
 
     predecessor_task_ids = payload.predecessor_task_ids
+    schedule_changed = predecessor_task_ids is not None or bool({"planned_days", "actual_days"} & data.keys())
+    version = bump_schedule_version(db, row.project_id) if schedule_changed else None
     if predecessor_task_ids is not None:
         db.execute(
             delete(TaskDependency).where(
@@ -112,6 +263,17 @@ def update_task(task_id: str, payload: TaskUpdate, db: Session = Depends(get_db)
             )
         )
         for predecessor in predecessor_task_ids:
+            try:
+                insert_dependency(db, row.project_id, predecessor, row.id)
+            except DependencyCycleError as exc:
+                db.rollback()
+                raise HTTPException(
+                    status_code=409,
+                    detail={"message": "dependency cycle", "cycle_task_ids": exc.cycle_task_ids},
+                ) from exc
+            except UnknownPredecessorError as exc:
+                db.rollback()
+                raise HTTPException(status_code=422, detail=str(exc)) from exc
             db.add(
                 TaskDependency(
                     project_id=row.project_id,
@@ -122,11 +284,24 @@ def update_task(task_id: str, payload: TaskUpdate, db: Session = Depends(get_db)
                     created_at=datetime.utcnow(),
                 )
             )
+            db.flush()
 
+    final_predecessors = predecessor_task_ids if predecessor_task_ids is not None else load_predecessors(db, [row.id]).get(row.id, [])
+    out = serialize_task(row, final_predecessors)
     db.commit()
-    db.refresh(row)
-    final_predecessors = predecessor_task_ids if predecessor_task_ids is not None else load_dependencies(db, row.project_id).get(row.id, [])
-    return serialize_task(row, final_predecessors)
+    if version is not None:
+        schedule_cache.task_written(
+            out.project_id,
+            version,
+            out.id,
+            out.planned_days,
+            out.actual_days,
+            None
+            if predecessor_task_ids is None
+            else [(predecessor, out.id, DependencyType.fs, 0) for predecessor in predecessor_task_ids],
+        )
+    response.headers["ETag"] = row_etag(out.id, out.version)
+    return out
 
 
 @router.delete("/tasks/{task_id}")
@@ -134,79 +309,127 @@ def delete_task(task_id: str, db: Session = Depends(get_db)):
     row = db.get(Task, task_id)
     if not row:
         raise HTTPException(status_code=404, detail="task not found")
+    project_id = row.project_id
+    ensure_wbs_paths(db, project_id)
+    # Children are detached by the FK (SET NULL); re-root their subtrees to match.
+    move_subtree(db, project_id, db.scalar(select(Task.wbs_path).where(Task.id == row.id)), "")
+    db.execute(update(Task).where(Task.parent_task_id == task_id).values(version=Task.version + 1))
     db.delete(row)
+    version = bump_schedule_version(db, project_id)
     db.commit()
+    schedule_cache.task_deleted(project_id, version, task_id)
     return {"ok": True}
 
 
-def compute_critical_path(tasks: list[Task], dependencies: list[TaskDependency], use_actual: bool) -> tuple[bool, int, list[str]]:
-    task_map = {t.id: t for t in tasks}
-    indegree: dict[str, int] = {t.id: 0 for t in tasks}
-    next_map: dict[str, list[str]] = defaultdict(list)
-    pred_map: dict[str, list[str]] = defaultdict(list)
-
-    for dep in dependencies:
-        if dep.predecessor_task_id not in task_map or dep.successor_task_id not in task_map:
-            continue
-        next_map[dep.predecessor_task_id].append(dep.successor_task_id)
-        pred_map[dep.successor_task_id].append(dep.predecessor_task_id)
-        indegree[dep.successor_task_id] += 1
-
-    q = deque([k for k, v in indegree.items() if v == 0])
-    order: list[str] = []
-    while q:
-        cur = q.popleft()
-        order.append(cur)
-        for n in next_map.get(cur, []):
-            indegree[n] -= 1
-            if indegree[n] == 0:
-                q.append(n)
-
-    if len(order) != len(tasks):
-        return True, 0, []
-
-    dist: dict[str, int] = {}
-    prev: dict[str, str | None] = {}
-    for node in order:
-        preds = pred_map.get(node, [])
-        best_prev = None
-        best = 0
-        for p in preds:
-            if dist.get(p, 0) > best:
-                best = dist.get(p, 0)
-                best_prev = p
-        days = task_map[node].actual_days if use_actual else task_map[node].planned_days
-        dist[node] = best + max(days or 0, 0)
-        prev[node] = best_prev
-
-    end_id = max(order, key=lambda i: dist.get(i, 0))
-    total = dist.get(end_id, 0)
-    path: list[str] = []
-    cur: str | None = end_id
-    while cur:
-        path.insert(0, cur)
-        cur = prev.get(cur)
-    return False, total, path
+@router.get("/tasks/tree", response_model=list[TaskTreeNodeOut])
+def task_tree(
+    project_id: str = Query(...),
+    root_task_id: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    return load_tree(db, project_id, root_task_id)
 
 
 @router.get("/tasks/critical-path", response_model=CriticalPathOut)
 def critical_path(project_id: str = Query(...), db: Session = Depends(get_db)):
-    tasks = db.scalars(select(Task).where(Task.project_id == project_id)).all()
-    deps = db.scalars(select(TaskDependency).where(TaskDependency.project_id == project_id)).all()
-    cycle, planned_len, planned_path = compute_critical_path(tasks, deps, use_actual=False)
-    if cycle:
+    schedule = schedule_cache.get(db, project_id)
+    graph, durations, result = schedule.graph, schedule.durations, schedule.result
+    if result is None:
         return CriticalPathOut(
             cycle=True,
             planned_length=0,
             actual_length=0,
             planned_path_task_ids=[],
             actual_path_task_ids=[],
+            planned_schedule=[],
         )
-    _, actual_len, actual_path = compute_critical_path(tasks, deps, use_actual=True)
+    # Planned (row 0) and actual (row 1) durations share one sweep.
     return CriticalPathOut(
         cycle=False,
-        planned_length=planned_len,
-        actual_length=actual_len,
-        planned_path_task_ids=planned_path,
-        actual_path_task_ids=actual_path,
+        planned_length=int(result.length[0]),
+        actual_length=int(result.length[1]),
+        planned_path_task_ids=find_critical_path(graph, result, durations, row=0),
+        actual_path_task_ids=find_critical_path(graph, result, durations, row=1),
+        planned_schedule=serialize_schedule(graph, result, row=0),
+    )
+
+
+@router.get("/tasks/gantt")
+def task_gantt(
+    project_id: str = Query(...),
+    window_start: date = Query(...),
+    window_end: date = Query(...),
+    basis: Literal["planned", "actual"] = Query(default="planned"),
+):
+    if window_end < window_start:
+        raise HTTPException(status_code=422, detail="window_end is before window_start")
+    return StreamingResponse(
+        stream_gantt(project_id, window_start, window_end, basis), media_type="application/json"
+    )
+
+
+@router.post("/tasks/schedule-risk", response_model=ScheduleRiskOut)
+def schedule_risk(payload: ScheduleRiskRequest, db: Session = Depends(get_db)):
+    schedule = schedule_cache.get(db, payload.project_id)
+    if schedule.result is None:
+        raise HTTPException(status_code=409, detail="dependency cycle")
+    graph = schedule.graph
+    overrides = {
+        graph.index[task_id]: (r.optimistic_days, r.most_likely_days, r.pessimistic_days)
+        for task_id, r in payload.task_overrides.items()
+        if task_id in graph.index
+    }
+    key = (
+        payload.project_id,
+        schedule.version,
+        payload.seed,
+        payload.iterations,
+        payload.optimistic_factor,
+        payload.pessimistic_factor,
+        tuple(sorted(overrides.items())),
+    )
+    result = risk_cache.get(key)
+    if result is None:
+        low, mode, high = duration_bounds(
+            schedule.durations[0], payload.optimistic_factor, payload.pessimistic_factor, overrides
+        )
+        result = simulate(graph, low, mode, high, payload.iterations, payload.seed)
+        risk_cache.put(key, result)
+
+    p50, p80, p90 = (int(v) for v in np.percentile(result.lengths, [50, 80, 90], method="higher"))
+    start_date = db.scalar(select(Project.start_date).where(Project.id == payload.project_id))
+    return ScheduleRiskOut(
+        project_id=payload.project_id,
+        schedule_version=schedule.version,
+        iterations=payload.iterations,
+        seed=payload.seed,
+        deterministic_length=int(schedule.result.length[0]),
+        mean_length=round(float(result.lengths.mean()), 2),
+        p50_length=p50,
+        p80_length=p80,
+        p90_length=p90,
+        p50_date=start_date + timedelta(days=p50) if start_date else None,
+        p80_date=start_date + timedelta(days=p80) if start_date else None,
+        p90_date=start_date + timedelta(days=p90) if start_date else None,
+        criticality=[
+            TaskCriticalityOut(task_id=task_id, criticality_index=round(float(ci), 4))
+            for task_id, ci in zip(graph.task_ids, result.criticality.tolist())
+        ],
     )
+
+
+@router.get("/tasks/{task_id}", response_model=TaskOut)
+def get_task(
+    task_id: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    row = db.get(Task, task_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="task not found")
+    etag = row_etag(row.id, row.version)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return serialize_task(row, load_predecessors(db, [row.id]).get(row.id, []))
@@ -0,0 +1,161 @@
+"""Compare list-endpoint serialization: ORM + Pydantic versus Core rows + orjson.
+
+Seeds a throwaway SQLite database, then times each path building a full
+JSON page for ``GET /quality-issues`` and ``GET /tasks``. The ORM path is
+what the endpoints did before: hydrate entities, convert each with
+``to_out`` / ``serialize_task`` and let the response model validate and
+dump the page. Both paths must produce identical JSON.
+
+Run with ``python -m app.benchmarks.list_serialization [--rows 1000] [--repeat 20]``.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.api.routes.quality_issues import list_quality_issues, to_out
+from app.api.routes.tasks import list_tasks, load_predecessors, serialize_task
+from app.db.base import Base
+from app.models.entities import Organization, Project, QualityIssue, Task, uuid_str
+from app.models.enums import QualityIssueStatus, QualityLevel
+from app.schemas.quality import QualityIssuePageOut
+from app.schemas.task import TaskPageOut
+
+
+def seed(db: Session, rows: int) -> str:
+    org = Organization(name="bench")
+    db.add(org)
+    db.flush()
+    project = Project(organization_id=org.id, name="bench", code="BENCH")
+    db.add(project)
+    db.flush()
+    start = datetime(2026, 1, 1)
+    statuses = list(QualityIssueStatus)
+    levels = list(QualityLevel)
+    db.execute(
+        insert(QualityIssue),
+        [
+            {
+                "id": uuid_str(),
+                "project_id": project.id,
+                "issue_code": f"QI-{i:06d}",
+                "title": f"issue {i}",
+                "description": "rebar cover below specification " * 3,
+                "level": levels[i % len(levels)],
+                "status": statuses[i % len(statuses)],
+                "owner_name": f"owner {i % 17}",
+                "reporter_name": "inspector",
+                "reported_at": start + timedelta(minutes=i),
+                "due_at": start + timedelta(days=7, minutes=i),
+                "created_at": start + timedelta(minutes=i),
+                "updated_at": start + timedelta(minutes=i),
+            }
+            for i in range(rows)
+        ],
+    )
+    db.execute(
+        insert(Task),
+        [
+            {
+                "id": uuid_str(),
+                "project_id": project.id,
+                "wbs_code": f"1.{i}",
+                "name": f"task {i}",
+                "planned_start": (start + timedelta(days=i)).date(),
+                "planned_end": (start + timedelta(days=i + 5)).date(),
+                "planned_days": 5,
+                "progress_percent": i % 100,
+                "created_at": start + timedelta(minutes=i),
+                "updated_at": start + timedelta(minutes=i),
+            }
+            for i in range(rows)
+        ],
+    )
+    db.commit()
+    return project.id
+
+
+def orm_issues(db: Session, project_id: str, limit: int) -> bytes:
+    rows = db.scalars(
+        select(QualityIssue)
+        .where(QualityIssue.project_id == project_id)
+        .order_by(QualityIssue.created_at.desc(), QualityIssue.id.desc())
+        .limit(limit + 1)
+    ).all()
+    page = QualityIssuePageOut(items=[to_out(row) for row in rows[:limit]], next_cursor=None)
+    return json.dumps(QualityIssuePageOut.model_validate(page.model_dump()).model_dump(mode="json")).encode()
+
+
+def fast_issues(db: Session, project_id: str, limit: int) -> bytes:
+    return list_quality_issues(
+        project_id=project_id,
+        status=None,
+        level=None,
+        owner_name=None,
+        overdue=False,
+        due_from=None,
+        due_to=None,
+        cursor=None,
+        limit=limit,
+        db=db,
+    ).body
+
+
+def orm_tasks(db: Session, project_id: str, limit: int) -> bytes:
+    rows = db.scalars(
+        select(Task)
+        .where(Task.project_id == project_id)
+        .order_by(Task.created_at.desc(), Task.id.desc())
+        .limit(limit + 1)
+    ).all()[:limit]
+    dep_map = load_predecessors(db, [row.id for row in rows])
+    page = TaskPageOut(items=[serialize_task(row, dep_map.get(row.id, [])) for row in rows], next_cursor=None)
+    return json.dumps(TaskPageOut.model_validate(page.model_dump()).model_dump(mode="json")).encode()
+
+
+def fast_tasks(db: Session, project_id: str, limit: int) -> bytes:
+    return list_tasks(project_id=project_id, cursor=None, limit=limit, db=db).body
+
+
+def timed(func, engine, project_id: str, limit: int, repeat: int) -> tuple[float, bytes]:
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        # A fresh session per request, as with get_db.
+        with Session(engine) as db:
+            started = time.perf_counter()
+            body = func(db, project_id, limit)
+            best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="page size (and rows seeded per table)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            project_id = seed(db, args.rows)
+        for name, orm, fast in (("quality-issues", orm_issues, fast_issues), ("tasks", orm_tasks, fast_tasks)):
+            orm_time, orm_body = timed(orm, engine, project_id, args.rows, args.repeat)
+            fast_time, fast_body = timed(fast, engine, project_id, args.rows, args.repeat)
+            if json.loads(orm_body) != json.loads(fast_body):
+                raise SystemExit(f"{name}: payloads differ")
+            print(
+                f"{name}: {args.rows} rows  orm+pydantic {orm_time * 1000:.1f} ms  "
+                f"core+orjson {fast_time * 1000:.1f} ms  ({orm_time / fast_time:.1f}x)"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Load-test a read route on the sync and async stacks at rising concurrency.
+
+Drives the ASGI app in-process with ``httpx`` against the database in
+``DATABASE_URL`` (point it at a realistic copy; the async side needs the
+async driver). Sync routes hold one of Starlette's worker threads (40 by
+default) for the whole request, so past that many concurrent requests they
+queue for a thread; async routes only queue for pool connections.
+
+Run with ``python -m app.benchmarks.read_concurrency --path "/api/quality-issues?limit=200" [--concurrency 10,50,200] [--requests 1000]``.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+from anyio.to_thread import current_default_thread_limiter
+from fastapi import FastAPI
+
+from app.api.routes.async_reads import router as async_read_router
+from app.api.routes.projects import router as project_router
+from app.api.routes.quality_issues import router as quality_router
+from app.api.routes.tasks import router as task_router
+from app.db.session import dispose_async_engine
+
+
+def build_app(mode: str) -> FastAPI:
+    app = FastAPI()
+    if mode == "async":
+        # Mounted first, as in app.main; paths it does not serve fall through to the sync routes.
+        app.include_router(async_read_router, prefix="/api")
+    for router in (project_router, quality_router, task_router):
+        app.include_router(router, prefix="/api")
+    return app
+
+
+async def run(app: FastAPI, path: str, concurrency: int, total: int) -> tuple[float, np.ndarray, int]:
+    gate = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def one(client: httpx.AsyncClient) -> None:
+        nonlocal failures
+        async with gate:
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            failures += response.status_code != 200
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.get(path)  # warm up connections and caches
+        started = time.perf_counter()
+        await asyncio.gather(*(one(client) for _ in range(total)))
+        elapsed = time.perf_counter() - started
+    return elapsed, np.array(latencies), failures
+
+
+async def main_async(path: str, levels: list[int], total: int) -> None:
+    print(f"thread pool tokens: {current_default_thread_limiter().total_tokens}")
+    for mode in ("sync", "async"):
+        app = build_app(mode)
+        for concurrency in levels:
+            elapsed, latencies, failures = await run(app, path, concurrency, total)
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            print(
+                f"{mode:5} c={concurrency:<4} {total / elapsed:8.1f} req/s  "
+                f"p50 {p50:7.1f} ms  p99 {p99:7.1f} ms  failures {failures}"
+            )
+    await dispose_async_engine()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", default="/api/quality-issues?limit=200")
+    parser.add_argument("--concurrency", default="10,50,200", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per level")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.concurrency.split(",")]
+    asyncio.run(main_async(args.path, levels, args.requests))
+
+
+if __name__ == "__main__":
+    main()
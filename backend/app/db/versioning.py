@@ -0,0 +1,28 @@
+"""Version-checked single-row updates for models with a ``version`` column."""
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+
+def versioned_update(db: Session, model, row_id: str, expected_version: int, values: dict):
+    """``UPDATE ... WHERE id = :id AND version = :expected``, bumping ``version``.
+
+    Returns the updated row, or ``None`` if another writer changed it first.
+    Where the dialect has ``UPDATE ... RETURNING`` the new row comes back with
+    the statement; elsewhere (MySQL) the SET clause is applied to the row
+    already in the session. Either way no refresh query follows. Serialize
+    the row before commit, which expires it.
+    """
+    stmt = (
+        update(model)
+        .where(model.id == row_id, model.version == expected_version)
+        .values(**values, version=model.version + 1)
+    )
+    if db.get_bind().dialect.update_returning:
+        return db.scalars(
+            stmt.returning(model), execution_options={"populate_existing": True, "synchronize_session": False}
+        ).one_or_none()
+    result = db.execute(stmt, execution_options={"synchronize_session": "evaluate"})
+    if result.rowcount != 1:
+        return None
+    return db.get(model, row_id)
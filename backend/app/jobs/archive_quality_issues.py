@@ -0,0 +1,24 @@
+"""Move closed quality issues past the retention window into cold storage.
+
+Run with ``python -m app.jobs.archive_quality_issues [--days 180] [--project-id ID]``.
+"""
+
+import argparse
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.quality_archive import archive_closed_issues
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=180, help="archive issues closed more than this many days ago")
+    parser.add_argument("--project-id", help="only archive this project")
+    args = parser.parse_args()
+    with SessionLocal() as db:
+        count = archive_closed_issues(db, args.days, args.project_id)
+    print(f"archived {count} closed quality issues to {settings.quality_archive_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""Run the quality issue overdue scheduler as a standalone worker.
+
+Run with ``python -m app.jobs.escalation_scheduler``.
+"""
+
+import asyncio
+
+from app.services.escalation import escalation_scheduler
+
+
+def main() -> None:
+    asyncio.run(escalation_scheduler.run())
+
+
+if __name__ == "__main__":
+    main()
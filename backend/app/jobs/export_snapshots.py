@@ -0,0 +1,36 @@
+"""Write Parquet or Arrow IPC snapshots of project data for analytics.
+
+Run with ``python -m app.jobs.export_snapshots [--project-id ID] [--format parquet|arrow] [--table NAME] [--full]``.
+Needs ``pyarrow``: ``pip install -r requirements-analytics.txt``.
+"""
+
+import argparse
+import sys
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+try:
+    from app.services.snapshots import FORMATS, SNAPSHOTS, write_snapshot
+except ModuleNotFoundError as exc:
+    if exc.name is None or exc.name.split(".")[0] != "pyarrow":
+        raise
+    sys.exit("export_snapshots needs pyarrow: pip install -r requirements-analytics.txt")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project-id", help="snapshot one project instead of the whole portfolio")
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--table", action="append", choices=list(SNAPSHOTS), help="limit to these tables (repeatable)")
+    parser.add_argument("--full", action="store_true", help="rewrite from scratch instead of appending changes")
+    args = parser.parse_args()
+    with SessionLocal() as db:
+        for table in args.table or SNAPSHOTS:
+            count = write_snapshot(db, table, args.project_id, args.format, args.full)
+            print(f"{table}: wrote {count} rows")
+    print(f"snapshots under {settings.snapshot_path}")
+
+
+if __name__ == "__main__":
+    main()
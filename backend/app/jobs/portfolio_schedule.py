@@ -0,0 +1,155 @@
+"""Recompute per-project schedule summaries for the whole portfolio.
+
+Tasks and dependencies of stale projects are read a chunk of projects at a
+time and scheduled project by project in worker processes. A summary is
+stale when it is missing or was computed for an older
+``projects.schedule_version``. The actual schedule counts tasks without
+``actual_days`` at their planned length, so unfinished work neither shortens
+the project nor shows up as negative slippage.
+
+Run with ``python -m app.jobs.portfolio_schedule [--force]``.
+"""
+
+import argparse
+import itertools
+import os
+from collections.abc import Iterator
+from concurrent.futures import Future
+from datetime import datetime
+
+import numpy as np
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.entities import Project, ProjectScheduleSummary, Task, TaskDependency
+from app.models.enums import ProjectStatus
+from app.services.process_pool import get_process_pool
+from app.services.scheduling import build_graph, compute_schedule
+
+PROJECT_CHUNK = 200
+WRITE_BATCH = 500
+OPEN_STATUSES = (ProjectStatus.planning, ProjectStatus.active, ProjectStatus.paused)
+
+
+def summarize(
+    project_id: str,
+    version: int,
+    task_ids: list[str],
+    planned: list[int],
+    actual: list[int],
+    edges: list[tuple[str, str, str, int]],
+) -> dict:
+    graph = build_graph(task_ids, edges)
+    planned_length = actual_length = 0
+    if not graph.cycle and task_ids:
+        result = compute_schedule(graph, np.array([planned, actual], dtype=np.int64))
+        planned_length, actual_length = (int(v) for v in result.length)
+    return {
+        "project_id": project_id,
+        "schedule_version": version,
+        "task_count": len(task_ids),
+        "cycle": graph.cycle,
+        "planned_length": planned_length,
+        "actual_length": actual_length,
+        "slippage_days": actual_length - planned_length,
+        "computed_at": datetime.utcnow(),
+    }
+
+
+def refresh_portfolio(
+    db: Session, statuses: tuple[ProjectStatus, ...] = OPEN_STATUSES, force: bool = False
+) -> int:
+    """Refresh stale summaries of projects in ``statuses``; returns the number written."""
+    stale = (
+        select(Project.id)
+        .outerjoin(ProjectScheduleSummary, ProjectScheduleSummary.project_id == Project.id)
+        .where(Project.status.in_(statuses))
+    )
+    if not force:
+        stale = stale.where(
+            or_(
+                ProjectScheduleSummary.project_id.is_(None),
+                ProjectScheduleSummary.schedule_version != Project.schedule_version,
+            )
+        )
+    versions = dict(
+        db.execute(select(Project.id, Project.schedule_version).where(Project.id.in_(stale.scalar_subquery()))).all()
+    )
+    if not versions:
+        return 0
+
+    pool = get_process_pool()
+    in_flight: list[Future] = []
+    summaries: list[dict] = []
+    max_in_flight = 2 * (settings.process_pool_workers or os.cpu_count() or 1)
+    seen: set[str] = set()
+    for project_id, tasks, edges in _load_by_project(db, sorted(versions)):
+        seen.add(project_id)
+        in_flight.append(
+            pool.submit(
+                summarize,
+                project_id,
+                versions[project_id],
+                [row.id for row in tasks],
+                [row.planned_days or 0 for row in tasks],
+                [row.actual_days if row.actual_days is not None else row.planned_days or 0 for row in tasks],
+                [(e.predecessor_task_id, e.successor_task_id, e.dependency_type.value, e.lag_days) for e in edges],
+            )
+        )
+        if len(in_flight) >= max_in_flight:
+            summaries.append(in_flight.pop(0).result())
+    summaries += [future.result() for future in in_flight]
+    # Projects with no tasks never appear in the chunks.
+    summaries += [summarize(pid, version, [], [], [], []) for pid, version in versions.items() if pid not in seen]
+
+    db.execute(delete(ProjectScheduleSummary).where(ProjectScheduleSummary.project_id.in_(list(versions))))
+    for start in range(0, len(summaries), WRITE_BATCH):
+        db.execute(insert(ProjectScheduleSummary), summaries[start : start + WRITE_BATCH])
+    db.commit()
+    return len(summaries)
+
+
+def _load_by_project(db: Session, project_ids: list[str]) -> Iterator[tuple[str, list, list]]:
+    """Tasks and dependencies of ``project_ids``, one project at a time.
+
+    Both tables are read per chunk of projects with plain buffered queries: two
+    server-side cursors open on one connection do not mix (pymysql drains the first
+    when the second starts), and a chunk bounds memory just as well.
+    """
+    for start in range(0, len(project_ids), PROJECT_CHUNK):
+        chunk = project_ids[start : start + PROJECT_CHUNK]
+        task_rows = db.execute(
+            select(Task.project_id, Task.id, Task.planned_days, Task.actual_days)
+            .where(Task.project_id.in_(chunk))
+            .order_by(Task.project_id)
+        ).all()
+        dep_rows = db.execute(
+            select(
+                TaskDependency.project_id,
+                TaskDependency.predecessor_task_id,
+                TaskDependency.successor_task_id,
+                TaskDependency.dependency_type,
+                TaskDependency.lag_days,
+            ).where(TaskDependency.project_id.in_(chunk))
+        ).all()
+        edges_by_project: dict[str, list] = {}
+        for row in dep_rows:
+            edges_by_project.setdefault(row.project_id, []).append(row)
+        for project_id, tasks in itertools.groupby(task_rows, key=lambda row: row.project_id):
+            yield project_id, list(tasks), edges_by_project.get(project_id, [])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="recompute summaries that are already current")
+    args = parser.parse_args()
+    with SessionLocal() as db:
+        count = refresh_portfolio(db, force=args.force)
+    print(f"refreshed {count} project schedule summaries ({settings.app_env})")
+
+
+if __name__ == "__main__":
+    main()
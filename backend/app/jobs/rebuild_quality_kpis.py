@@ -0,0 +1,22 @@
+"""Rebuild the quality KPI aggregates from the issues table.
+
+Run with ``python -m app.jobs.rebuild_quality_kpis [--project-id ID]``.
+"""
+
+import argparse
+
+from app.db.session import SessionLocal
+from app.services.quality_kpi import rebuild_kpis
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project-id", help="only rebuild this project")
+    args = parser.parse_args()
+    with SessionLocal() as db:
+        count = rebuild_kpis(db, args.project_id)
+    print(f"rebuilt quality KPIs from {count} issues")
+
+
+if __name__ == "__main__":
+    main()
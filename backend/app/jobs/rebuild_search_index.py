@@ -0,0 +1,18 @@
+"""Rebuild the local quality issue search index from the database.
+
+Run with ``python -m app.jobs.rebuild_search_index``.
+"""
+
+from app.db.session import SessionLocal
+from app.services.search_index import search_index
+
+
+def main() -> None:
+    search_index.reset()
+    with SessionLocal() as db:
+        count = search_index.sync(db, force=True)
+    print(f"indexed {count} quality issues")
+
+
+if __name__ == "__main__":
+    main()
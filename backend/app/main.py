@@ -1,14 +1,38 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.api.routes.async_reads import router as async_read_router
+from app.api.routes.baselines import router as baseline_router
+from app.api.routes.exports import router as export_router
 from app.api.routes.health import router as health_router
+from app.api.routes.portfolio import router as portfolio_router
 from app.api.routes.projects import router as project_router
 from app.api.routes.quality_issues import router as quality_router
 from app.api.routes.tasks import router as task_router
 from app.core.config import settings
+from app.db.session import dispose_async_engine
+from app.services.escalation import escalation_scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler = asyncio.create_task(escalation_scheduler.run()) if settings.escalation_in_process else None
+    yield
+    if scheduler is not None:
+        scheduler.cancel()
+    await dispose_async_engine()
 
 
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
+if settings.async_reads:
+    # Registered first so these paths match before their sync counterparts.
+    app.include_router(async_read_router, prefix="/api")
 app.include_router(health_router, prefix="/api")
+app.include_router(baseline_router, prefix="/api")
+app.include_router(export_router, prefix="/api")
+app.include_router(portfolio_router, prefix="/api")
 app.include_router(project_router, prefix="/api")
 app.include_router(quality_router, prefix="/api")
 app.include_router(task_router, prefix="/api")
@@ -1,4 +1,5 @@
 from app.models.entities import (  # noqa: F401
+    ArchivedQualityIssue,
     BoqItem,
     ChangeOrder,
     Contract,
@@ -7,10 +8,13 @@ from app.models.entities import (  # noqa: F401
     Organization,
     PaymentCertificate,
     Project,
+    ProjectScheduleSummary,
     QualityAcceptance,
     QualityIssue,
     QualityIssueEvent,
+    QualityKpi,
     QualityRectification,
+    ScheduleBaseline,
     Section,
     Task,
     TaskDependency,
@@ -9,11 +9,13 @@ from sqlalchemy import (
     Enum,
     ForeignKey,
     Integer,
+    LargeBinary,
     Numeric,
     String,
     Text,
     UniqueConstraint,
 )
+from sqlalchemy.dialects.mysql import DATETIME, LONGBLOB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -64,6 +66,20 @@ class Project(Base, TimestampMixin):
     status: Mapped[ProjectStatus] = mapped_column(Enum(ProjectStatus, native_enum=False), default=ProjectStatus.planning)
     start_date: Mapped[date | None] = mapped_column(Date)
     end_date: Mapped[date | None] = mapped_column(Date)
+    schedule_version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class ProjectScheduleSummary(Base):
+    __tablename__ = "project_schedule_summaries"
+
+    project_id: Mapped[str] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    schedule_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    task_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    cycle: Mapped[bool] = mapped_column(default=False, nullable=False)
+    planned_length: Mapped[int] = mapped_column(Integer, nullable=False)
+    actual_length: Mapped[int] = mapped_column(Integer, nullable=False)
+    slippage_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
 
 class Section(Base, TimestampMixin):
@@ -132,8 +148,12 @@ class Task(Base, TimestampMixin):
     planned_days: Mapped[int | None] = mapped_column(Integer)
     actual_days: Mapped[int | None] = mapped_column(Integer)
     progress_percent: Mapped[Decimal] = mapped_column(Numeric(5, 2), default=0, nullable=False)
+    topo_order: Mapped[int | None] = mapped_column(Integer)
+    wbs_path: Mapped[str | None] = mapped_column(String(720))
     created_by: Mapped[str | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
     updated_by: Mapped[str | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
+    # Bumped by every write; the ETag for conditional requests and the optimistic lock for PATCH.
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
 
     parent: Mapped["Task | None"] = relationship(remote_side="Task.id")
 
@@ -160,6 +180,21 @@ class TaskDependency(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
 
+class ScheduleBaseline(Base):
+    __tablename__ = "schedule_baselines"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=uuid_str)
+    project_id: Mapped[str] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    name: Mapped[str] = mapped_column(String(200), nullable=False)
+    schedule_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    task_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    dependency_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    planned_length: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary().with_variant(LONGBLOB(), "mysql"), nullable=False)
+    created_by: Mapped[str | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class QualityIssue(Base, TimestampMixin):
     __tablename__ = "quality_issues"
     __table_args__ = (UniqueConstraint("project_id", "issue_code", name="uk_quality_issue_project_code"),)
@@ -180,6 +215,55 @@ class QualityIssue(Base, TimestampMixin):
     reported_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     due_at: Mapped[datetime | None] = mapped_column(DateTime)
     closed_at: Mapped[datetime | None] = mapped_column(DateTime)
+    # Set by the escalation scheduler when due_at passes while the issue is open.
+    overdue_at: Mapped[datetime | None] = mapped_column(DateTime)
+    # Bumped by every write; the ETag for conditional requests and the optimistic lock for PATCH.
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+
+    # Read-only; loaded explicitly (selectinload) for the detail aggregate.
+    events: Mapped[list["QualityIssueEvent"]] = relationship(
+        order_by="QualityIssueEvent.action_at.desc()", viewonly=True
+    )
+    rectifications: Mapped[list["QualityRectification"]] = relationship(
+        order_by="QualityRectification.created_at", viewonly=True
+    )
+    acceptances: Mapped[list["QualityAcceptance"]] = relationship(
+        order_by="QualityAcceptance.created_at", viewonly=True
+    )
+
+
+class ArchivedQualityIssue(Base):
+    """Manifest of issues moved to cold storage; keeps what KPI rebuilds and lookups need."""
+
+    __tablename__ = "archived_quality_issues"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    project_id: Mapped[str] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    section_id: Mapped[str | None] = mapped_column(String(36))
+    issue_code: Mapped[str] = mapped_column(String(100), nullable=False)
+    level: Mapped[QualityLevel] = mapped_column(Enum(QualityLevel, native_enum=False), nullable=False)
+    reported_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    closed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    overdue_at: Mapped[datetime | None] = mapped_column(DateTime)
+    archive_file: Mapped[str] = mapped_column(String(255), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class QualityKpi(Base):
+    __tablename__ = "quality_kpis"
+
+    project_id: Mapped[str] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    # Empty string for issues without a section, so the key stays NOT NULL.
+    section_key: Mapped[str] = mapped_column(String(36), primary_key=True)
+    level: Mapped[QualityLevel] = mapped_column(Enum(QualityLevel, native_enum=False), primary_key=True)
+    total_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    reported_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rectifying_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    pending_review_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    closed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rejected_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    close_seconds_total: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    overdue_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
 
 class QualityIssueEvent(Base):
@@ -191,7 +275,10 @@ class QualityIssueEvent(Base):
     to_status: Mapped[QualityIssueStatus] = mapped_column(Enum(QualityIssueStatus, native_enum=False), nullable=False)
     action_by: Mapped[str | None] = mapped_column(String(100))
     action_note: Mapped[str | None] = mapped_column(Text)
-    action_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    # Microsecond precision on MySQL too: feed cursors are encoded from the in-memory value.
+    action_at: Mapped[datetime] = mapped_column(
+        DateTime().with_variant(DATETIME(fsp=6), "mysql"), default=datetime.utcnow, nullable=False
+    )
 
 
 class QualityRectification(Base, TimestampMixin):
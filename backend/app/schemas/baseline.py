@@ -0,0 +1,66 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+from app.models.enums import DependencyType
+
+
+class BaselineCreate(BaseModel):
+    project_id: str
+    name: str = Field(min_length=1, max_length=200)
+    created_by: str | None = None
+
+
+class BaselineOut(BaseModel):
+    id: str
+    project_id: str
+    name: str
+    schedule_version: int
+    task_count: int
+    dependency_count: int
+    planned_length: int
+    payload_bytes: int
+    created_by: str | None
+    created_at: datetime
+
+
+class BaselineTaskRef(BaseModel):
+    task_id: str
+    wbs_code: str
+    name: str
+
+
+class BaselineTaskChange(BaseModel):
+    task_id: str
+    wbs_code: str
+    name: str
+    planned_start_shift: int | None
+    planned_end_shift: int | None
+    actual_start_shift: int | None
+    actual_end_shift: int | None
+    duration_change: int
+    early_start_shift: int
+    early_finish_shift: int
+    was_critical: bool
+    is_critical: bool
+
+
+class BaselineEdgeRef(BaseModel):
+    predecessor_task_id: str
+    successor_task_id: str
+    dependency_type: DependencyType
+    lag_days: int
+
+
+class BaselineDiffOut(BaseModel):
+    baseline_id: str
+    baseline_version: int
+    current_version: int
+    baseline_length: int
+    current_length: int
+    length_change: int
+    cycle: bool
+    added_tasks: list[BaselineTaskRef]
+    removed_tasks: list[BaselineTaskRef]
+    changed_tasks: list[BaselineTaskChange]
+    added_dependencies: list[BaselineEdgeRef]
+    removed_dependencies: list[BaselineEdgeRef]
@@ -0,0 +1,20 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class ProjectScheduleSummaryOut(BaseModel):
+    project_id: str
+    project_code: str
+    project_name: str
+    schedule_version: int
+    stale: bool
+    task_count: int
+    cycle: bool
+    planned_length: int
+    actual_length: int
+    slippage_days: int
+    computed_at: datetime
+
+
+class PortfolioRefreshOut(BaseModel):
+    scheduled: bool
@@ -31,6 +31,26 @@ class QualityIssueTransition(BaseModel):
     actor: str = "system"
 
 
+class QualityIssueBatchItem(BaseModel):
+    issue_id: str
+    to_status: QualityIssueStatus
+    note: str | None = None
+
+
+class QualityIssueBatchTransition(BaseModel):
+    items: list[QualityIssueBatchItem] = Field(min_length=1, max_length=1000)
+    note: str = ""
+    actor: str = "system"
+
+
+class QualityIssueBatchResult(BaseModel):
+    issue_id: str
+    ok: bool
+    from_status: str | None = None
+    to_status: str
+    error: str | None = None
+
+
 class QualityIssueOut(BaseModel):
     id: str
     project_id: str
@@ -46,8 +66,25 @@ class QualityIssueOut(BaseModel):
     reported_at: datetime
     due_at: datetime | None
     closed_at: datetime | None
+    overdue_at: datetime | None
     created_at: datetime
     updated_at: datetime
+    version: int
+
+
+class QualityIssuePageOut(BaseModel):
+    items: list[QualityIssueOut]
+    next_cursor: str | None
+
+
+class QualityIssueSearchHit(BaseModel):
+    score: float
+    issue: QualityIssueOut
+
+
+class QualityIssueSearchOut(BaseModel):
+    total: int
+    items: list[QualityIssueSearchHit]
 
 
 class QualityIssueEventOut(BaseModel):
@@ -58,3 +95,69 @@ class QualityIssueEventOut(BaseModel):
     action_by: str | None
     action_note: str | None
     action_at: datetime
+
+
+class QualityKpiOut(BaseModel):
+    section_id: str | None
+    level: str | None
+    total_count: int
+    reported_count: int
+    rectifying_count: int
+    pending_review_count: int
+    closed_count: int
+    rejected_count: int
+    close_seconds_total: int
+    overdue_count: int
+    open_count: int
+    close_rate: float
+    avg_close_hours: float | None
+
+
+class QualityKpiSummaryOut(BaseModel):
+    project_id: str
+    totals: QualityKpiOut
+    items: list[QualityKpiOut]
+
+
+class QualityDwellStatOut(BaseModel):
+    group: str | None
+    status: str
+    count: int
+    mean_hours: float
+    percentile_hours: dict[str, float]
+
+
+class QualityDwellStatsOut(BaseModel):
+    group_by: str
+    items: list[QualityDwellStatOut]
+
+
+class QualityRectificationOut(BaseModel):
+    id: str
+    issue_id: str
+    rectification_plan: str
+    rectification_result: str | None
+    owner_user_id: str | None
+    started_at: datetime | None
+    submitted_at: datetime | None
+    status: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class QualityAcceptanceOut(BaseModel):
+    id: str
+    issue_id: str
+    rectification_id: str | None
+    accepted_by_user_id: str | None
+    accepted_at: datetime | None
+    result: str
+    comments: str | None
+    created_at: datetime
+
+
+class QualityIssueDetailOut(BaseModel):
+    issue: QualityIssueOut
+    events: list[QualityIssueEventOut]
+    rectifications: list[QualityRectificationOut]
+    acceptances: list[QualityAcceptanceOut]
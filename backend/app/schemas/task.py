@@ -1,7 +1,7 @@
 from datetime import date
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
-from app.models.enums import TaskStatus
+from app.models.enums import DependencyType, TaskStatus
 
 
 class TaskCreate(BaseModel):
@@ -49,12 +49,125 @@ class TaskOut(BaseModel):
     planned_days: int | None
     actual_days: int | None
     progress_percent: float
+    version: int
     predecessor_task_ids: list[str]
 
 
+class TaskPageOut(BaseModel):
+    items: list[TaskOut]
+    next_cursor: str | None
+
+
+class TaskTreeNodeOut(BaseModel):
+    id: str
+    parent_task_id: str | None
+    wbs_code: str
+    name: str
+    status: str
+    planned_days: int | None
+    progress_percent: float
+    rollup_progress_percent: float
+    rollup_planned_start: date | None
+    rollup_planned_end: date | None
+    rollup_actual_start: date | None
+    rollup_actual_end: date | None
+    children: list["TaskTreeNodeOut"]
+
+
+class TaskScheduleOut(BaseModel):
+    task_id: str
+    early_start: int
+    early_finish: int
+    late_start: int
+    late_finish: int
+    total_float: int
+    free_float: int
+
+
 class CriticalPathOut(BaseModel):
     cycle: bool
     planned_length: int
     actual_length: int
     planned_path_task_ids: list[str]
     actual_path_task_ids: list[str]
+    planned_schedule: list[TaskScheduleOut]
+
+
+class WbsPredecessorIn(BaseModel):
+    wbs_code: str = Field(min_length=1, max_length=100)
+    dependency_type: DependencyType = DependencyType.fs
+    lag_days: int = 0
+
+
+class WbsTaskIn(BaseModel):
+    wbs_code: str = Field(min_length=1, max_length=100)
+    name: str = Field(min_length=1, max_length=255)
+    parent_wbs_code: str | None = None
+    status: TaskStatus = TaskStatus.not_started
+    planned_start: date | None = None
+    planned_end: date | None = None
+    actual_start: date | None = None
+    actual_end: date | None = None
+    planned_days: int | None = None
+    actual_days: int | None = None
+    progress_percent: float = 0
+    predecessors: list[WbsPredecessorIn] = []
+
+
+class WbsImport(BaseModel):
+    project_id: str
+    tasks: list[WbsTaskIn]
+
+
+class WbsImportRowError(BaseModel):
+    row: int
+    wbs_code: str | None
+    error: str
+
+
+class WbsImportOut(BaseModel):
+    created_tasks: int
+    created_dependencies: int
+    errors: list[WbsImportRowError]
+
+
+class TaskDurationRange(BaseModel):
+    optimistic_days: float = Field(ge=0)
+    most_likely_days: float = Field(ge=0)
+    pessimistic_days: float = Field(ge=0)
+
+    @model_validator(mode="after")
+    def check_order(self) -> "TaskDurationRange":
+        if not self.optimistic_days <= self.most_likely_days <= self.pessimistic_days:
+            raise ValueError("expected optimistic_days <= most_likely_days <= pessimistic_days")
+        return self
+
+
+class ScheduleRiskRequest(BaseModel):
+    project_id: str
+    iterations: int = Field(default=10_000, ge=100, le=200_000)
+    seed: int = Field(default=0, ge=0)
+    optimistic_factor: float = Field(default=0.8, ge=0, le=1)
+    pessimistic_factor: float = Field(default=1.5, ge=1)
+    task_overrides: dict[str, TaskDurationRange] = {}
+
+
+class TaskCriticalityOut(BaseModel):
+    task_id: str
+    criticality_index: float
+
+
+class ScheduleRiskOut(BaseModel):
+    project_id: str
+    schedule_version: int
+    iterations: int
+    seed: int
+    deterministic_length: int
+    mean_length: float
+    p50_length: int
+    p80_length: int
+    p90_length: int
+    p50_date: date | None
+    p80_date: date | None
+    p90_date: date | None
+    criticality: list[TaskCriticalityOut]
@@ -0,0 +1,240 @@
+"""Schedule baselines stored as one compressed columnar blob per snapshot.
+
+A baseline freezes a project's tasks, dependency edges and planned CPM
+result. Columns are kept as numpy arrays in a single ``.npz`` payload, so a
+snapshot is one INSERT and a diff is a handful of array operations over the
+aligned task columns instead of a row-by-row comparison.
+"""
+
+import io
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.entities import Task
+from app.models.enums import DependencyType
+from app.services.schedule_cache import ProjectSchedule
+from app.services.scheduling import FROM_FINISH, TO_FINISH
+
+DATE_COLUMNS = ("planned_start", "planned_end", "actual_start", "actual_end")
+EDGE_KINDS = {2 * FROM_FINISH[kind] + TO_FINISH[kind]: kind for kind in DependencyType}
+
+
+@dataclass(frozen=True)
+class ScheduleSnapshot:
+    """Columnar view of a project schedule; task columns share one row order."""
+
+    task_ids: np.ndarray
+    wbs_codes: np.ndarray
+    names: np.ndarray
+    dates: dict[str, np.ndarray]
+    planned_days: np.ndarray
+    early_start: np.ndarray
+    early_finish: np.ndarray
+    total_float: np.ndarray
+    edge_pred: np.ndarray
+    edge_succ: np.ndarray
+    edge_kind: np.ndarray
+    edge_lag: np.ndarray
+    length: int
+    cycle: bool
+
+    @property
+    def task_count(self) -> int:
+        return len(self.task_ids)
+
+    @property
+    def critical(self) -> np.ndarray:
+        return self.total_float == 0 if not self.cycle else np.zeros(self.task_count, dtype=bool)
+
+
+@dataclass(frozen=True)
+class ScheduleDiff:
+    """Task and edge fields hold row indexes; per-task arrays align with ``common``."""
+
+    added: np.ndarray  # rows of the current snapshot
+    removed: np.ndarray  # rows of the base snapshot
+    common: np.ndarray
+    base_rows: np.ndarray
+    current_rows: np.ndarray
+    date_shifts: dict[str, np.ndarray]
+    duration_change: np.ndarray
+    early_start_shift: np.ndarray
+    early_finish_shift: np.ndarray
+    became_critical: np.ndarray
+    left_critical: np.ndarray
+    edges_added: np.ndarray  # edges of the current snapshot
+    edges_removed: np.ndarray  # edges of the base snapshot
+    length_change: int
+
+
+def take_snapshot(db: Session, project_id: str, schedule: ProjectSchedule) -> ScheduleSnapshot:
+    """Combine a computed schedule with one column query for dates and labels."""
+    graph, result = schedule.graph, schedule.result
+    n = graph.size
+    rows = db.execute(
+        select(
+            Task.id,
+            Task.wbs_code,
+            Task.name,
+            Task.planned_start,
+            Task.planned_end,
+            Task.actual_start,
+            Task.actual_end,
+        ).where(Task.project_id == project_id)
+    ).all()
+    position = np.full(len(rows), -1, dtype=np.int64)
+    for i, row in enumerate(rows):
+        position[i] = graph.index.get(row.id, -1)
+    # Tasks written after the graph was loaded are left out of the snapshot.
+    keep = np.flatnonzero(position >= 0)
+    target = position[keep]
+
+    def column(values: list, dtype, fill) -> np.ndarray:
+        values = np.asarray(values, dtype=dtype)
+        out = np.full(n, fill, dtype=values.dtype)
+        out[target] = values[keep]
+        return out
+
+    cycle = result is None
+    zeros = np.zeros(n, dtype=np.int32)
+    return ScheduleSnapshot(
+        task_ids=np.asarray(graph.task_ids, dtype="U36"),
+        wbs_codes=column([row.wbs_code for row in rows], np.str_, ""),
+        names=column([row.name for row in rows], np.str_, ""),
+        dates={name: column([getattr(row, name) for row in rows], "datetime64[D]", "NaT") for name in DATE_COLUMNS},
+        planned_days=schedule.durations[0].astype(np.int32),
+        early_start=zeros if cycle else result.early_start[0].astype(np.int32),
+        early_finish=zeros if cycle else result.early_finish[0].astype(np.int32),
+        total_float=zeros if cycle else result.total_float[0].astype(np.int32),
+        edge_pred=graph.pred.astype(np.int32),
+        edge_succ=graph.succ.astype(np.int32),
+        edge_kind=(2 * graph.from_finish + graph.to_finish).astype(np.int8),
+        edge_lag=graph.lag.astype(np.int32),
+        length=0 if cycle else int(result.length[0]),
+        cycle=cycle,
+    )
+
+
+def dump_snapshot(snapshot: ScheduleSnapshot) -> bytes:
+    buffer = io.BytesIO()
+    np.savez_compressed(
+        buffer,
+        task_ids=snapshot.task_ids,
+        wbs_codes=snapshot.wbs_codes,
+        names=snapshot.names,
+        planned_days=snapshot.planned_days,
+        early_start=snapshot.early_start,
+        early_finish=snapshot.early_finish,
+        total_float=snapshot.total_float,
+        edge_pred=snapshot.edge_pred,
+        edge_succ=snapshot.edge_succ,
+        edge_kind=snapshot.edge_kind,
+        edge_lag=snapshot.edge_lag,
+        meta=np.array([snapshot.length, int(snapshot.cycle)], dtype=np.int64),
+        **{f"date_{name}": values for name, values in snapshot.dates.items()},
+    )
+    return buffer.getvalue()
+
+
+def load_snapshot(payload: bytes) -> ScheduleSnapshot:
+    with np.load(io.BytesIO(payload), allow_pickle=False) as data:
+        length, cycle = data["meta"].tolist()
+        return ScheduleSnapshot(
+            task_ids=data["task_ids"],
+            wbs_codes=data["wbs_codes"],
+            names=data["names"],
+            dates={name: data[f"date_{name}"] for name in DATE_COLUMNS},
+            planned_days=data["planned_days"],
+            early_start=data["early_start"],
+            early_finish=data["early_finish"],
+            total_float=data["total_float"],
+            edge_pred=data["edge_pred"],
+            edge_succ=data["edge_succ"],
+            edge_kind=data["edge_kind"],
+            edge_lag=data["edge_lag"],
+            length=length,
+            cycle=bool(cycle),
+        )
+
+
+def diff_snapshots(base: ScheduleSnapshot, current: ScheduleSnapshot) -> ScheduleDiff:
+    """Align both snapshots on task id and compare every column at once.
+
+    Shifts are ``current - base`` in days; date shifts are NaN where either
+    side has no date.
+    """
+    common, base_rows, current_rows = np.intersect1d(
+        base.task_ids, current.task_ids, assume_unique=True, return_indices=True
+    )
+    date_shifts = {}
+    for name in DATE_COLUMNS:
+        before = base.dates[name][base_rows]
+        after = current.dates[name][current_rows]
+        shift = (after - before).astype(np.float64)
+        shift[np.isnat(before) | np.isnat(after)] = np.nan
+        date_shifts[name] = shift
+
+    base_critical = base.critical[base_rows]
+    current_critical = current.critical[current_rows]
+    edges_added, edges_removed = _match_edges(base, current, base_rows, current_rows)
+    return ScheduleDiff(
+        added=np.flatnonzero(~np.isin(current.task_ids, base.task_ids, assume_unique=True)),
+        removed=np.flatnonzero(~np.isin(base.task_ids, current.task_ids, assume_unique=True)),
+        common=common,
+        base_rows=base_rows,
+        current_rows=current_rows,
+        date_shifts=date_shifts,
+        duration_change=current.planned_days[current_rows].astype(np.int64) - base.planned_days[base_rows],
+        early_start_shift=current.early_start[current_rows].astype(np.int64) - base.early_start[base_rows],
+        early_finish_shift=current.early_finish[current_rows].astype(np.int64) - base.early_finish[base_rows],
+        became_critical=current_critical & ~base_critical,
+        left_critical=base_critical & ~current_critical,
+        edges_added=edges_added,
+        edges_removed=edges_removed,
+        length_change=current.length - base.length,
+    )
+
+
+def changed_rows(diff: ScheduleDiff) -> np.ndarray:
+    """Indexes into ``diff.common`` of tasks with any shift or criticality change."""
+    changed = (
+        (diff.duration_change != 0)
+        | (diff.early_start_shift != 0)
+        | (diff.early_finish_shift != 0)
+        | diff.became_critical
+        | diff.left_critical
+    )
+    for shift in diff.date_shifts.values():
+        changed |= np.nan_to_num(shift) != 0
+    return np.flatnonzero(changed)
+
+
+def _match_edges(
+    base: ScheduleSnapshot, current: ScheduleSnapshot, base_rows: np.ndarray, current_rows: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return (added, removed) edge indexes.
+
+    Base edges are renumbered into the current task rows and keyed by
+    ``(pred, succ, kind)``, which is unique per project; an edge whose lag
+    changed counts as removed and added.
+    """
+    n = max(current.task_count, 1)
+    to_current = np.full(base.task_count, -1, dtype=np.int64)
+    to_current[base_rows] = current_rows
+    base_pred = to_current[base.edge_pred]
+    base_succ = to_current[base.edge_succ]
+    base_key = (base_pred * n + base_succ) * 4 + base.edge_kind
+    current_key = (current.edge_pred.astype(np.int64) * n + current.edge_succ) * 4 + current.edge_kind
+
+    kept = (base_pred >= 0) & (base_succ >= 0)
+    if not len(current_key):
+        return np.array([], dtype=np.int64), np.arange(len(base_key))
+    order = np.argsort(current_key)
+    match = order[np.minimum(np.searchsorted(current_key[order], base_key), len(order) - 1)]
+    kept &= (current_key[match] == base_key) & (current.edge_lag[match] == base.edge_lag)
+    matched = np.zeros(len(current_key), dtype=bool)
+    matched[match[kept]] = True
+    return np.flatnonzero(~matched), np.flatnonzero(~kept)
@@ -0,0 +1,298 @@
+"""Time-in-status analytics built from ``quality_issue_events``.
+
+Every status change closes the interval the issue spent in its previous
+status. ``DwellStore`` keeps those intervals as numpy columns and folds in
+only the events past its ``action_at`` watermark on each refresh, so a
+worker replays the full history once and then reads a handful of rows per
+request. Events that keep the status (escalations) do not split intervals.
+Transitions of one issue are serialised by its row lock, so re-reading a
+short overlap is enough to pick up events committed out of order.
+
+Issue attributes (project, section, level, owner) are looked up at query
+time from per-issue columns, refreshed for issues touched since the last
+refresh, so percentiles follow the issue's current grouping.
+
+Archiving moves a closed issue's events out of the hot table, so the first
+refresh also replays the archive files for issues it has not seen; the
+numbers then do not depend on when the process started.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import NamedTuple
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.pagination import after_cursor, encode_cursor
+from app.models.entities import ArchivedQualityIssue, QualityIssue, QualityIssueEvent
+from app.models.enums import QualityIssueStatus
+from app.services.quality_archive import read_archive_table
+
+STATUSES = list(QualityIssueStatus)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+GROUP_COLUMNS = {
+    "project": QualityIssue.project_id,
+    "section": QualityIssue.section_id,
+    "level": QualityIssue.level,
+    "owner": QualityIssue.owner_name,
+}
+LOAD_BATCH = 50_000
+# Events that commit out of action_at order are caught by re-reading this far back.
+REFRESH_OVERLAP = timedelta(minutes=1)
+_EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class DwellStats:
+    group: str | None
+    status: QualityIssueStatus
+    count: int
+    mean_seconds: float
+    percentiles: dict[int, float]
+
+
+class _ArchivedEvent(NamedTuple):
+    id: str
+    issue_id: str
+    from_status: str | None
+    to_status: str
+    action_at: datetime
+
+
+def _seconds(values: list[datetime]) -> np.ndarray:
+    return np.array([(value - _EPOCH).total_seconds() for value in values], dtype=np.float64)
+
+
+class _Labels:
+    """Interns strings as dense integer codes; code 0 is ``None``."""
+
+    def __init__(self) -> None:
+        self.values: list[str | None] = [None]
+        self.codes: dict[str | None, int] = {None: 0}
+
+    def code(self, value: str | None) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class DwellStore:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._watermark: datetime | None = None
+        self._seen: dict[str, datetime] = {}
+        self._attr_watermark: datetime | None = None
+        self._archive_loaded = False
+        self._issues = _Labels()
+        self._groups = {name: _Labels() for name in GROUP_COLUMNS}
+        # Per issue (indexed by issue code): current status and when it was entered.
+        self._state_status = np.full(1, -1, dtype=np.int8)
+        self._state_since = np.zeros(1, dtype=np.float64)
+        self._attrs = {name: np.zeros(1, dtype=np.int32) for name in GROUP_COLUMNS}
+        # Completed intervals.
+        self._issue = np.empty(0, dtype=np.int32)
+        self._status = np.empty(0, dtype=np.int8)
+        self._duration = np.empty(0, dtype=np.float64)
+
+    def refresh(self, db: Session) -> int:
+        """Fold in events not seen yet; returns the number of events applied."""
+        with self._lock:
+            total = 0
+            cursor = None
+            while True:
+                stmt = (
+                    select(
+                        QualityIssueEvent.id,
+                        QualityIssueEvent.issue_id,
+                        QualityIssueEvent.from_status,
+                        QualityIssueEvent.to_status,
+                        QualityIssueEvent.action_at,
+                    )
+                    .order_by(QualityIssueEvent.action_at, QualityIssueEvent.id)
+                    .limit(LOAD_BATCH)
+                )
+                if cursor:
+                    stmt = stmt.where(
+                        after_cursor(QualityIssueEvent.action_at, QualityIssueEvent.id, cursor, descending=False)
+                    )
+                elif self._watermark is not None:
+                    stmt = stmt.where(QualityIssueEvent.action_at >= self._watermark - REFRESH_OVERLAP)
+                rows = db.execute(stmt).all()
+                if rows:
+                    cursor = encode_cursor(rows[-1].action_at, rows[-1].id)
+                    fresh = [row for row in rows if row.id not in self._seen]
+                    self._apply_events(fresh)
+                    self._remember(fresh)
+                    total += len(fresh)
+                if len(rows) < LOAD_BATCH:
+                    break
+            if not self._archive_loaded:
+                total += self._replay_archive(db)
+                self._archive_loaded = True
+            self._refresh_attributes(db)
+            return total
+
+    def _replay_archive(self, db: Session) -> int:
+        """Fold in archived issues not seen in the hot table; their events were all moved together."""
+        total = 0
+        for archive_file in db.scalars(select(ArchivedQualityIssue.archive_file).distinct()):
+            issues = [
+                issue
+                for issue in read_archive_table(archive_file, "issues")
+                if issue["id"] not in self._issues.codes or self._state_status[self._issues.codes[issue["id"]]] < 0
+            ]
+            if not issues:
+                continue
+            wanted = {issue["id"] for issue in issues}
+            events = sorted(
+                (
+                    _ArchivedEvent(row["id"], row["issue_id"], row["from_status"], row["to_status"], row["action_at"])
+                    for row in read_archive_table(archive_file, "events")
+                    if row["issue_id"] in wanted
+                ),
+                key=lambda event: (event.action_at, event.id),
+            )
+            self._apply_events(events)
+            codes = np.array([self._issues.code(issue["id"]) for issue in issues], dtype=np.int64)
+            self._grow(len(self._issues.values))
+            for name, column in GROUP_COLUMNS.items():
+                labels = self._groups[name]
+                self._attrs[name][codes] = [
+                    labels.code(None if issue[column.key] is None else str(issue[column.key])) for issue in issues
+                ]
+            total += len(events)
+        return total
+
+    def _remember(self, rows) -> None:
+        if not rows:
+            return
+        for row in rows:
+            self._seen[row.id] = row.action_at
+        self._watermark = max(self._watermark or rows[-1].action_at, rows[-1].action_at)
+        horizon = self._watermark - REFRESH_OVERLAP
+        self._seen = {event_id: at for event_id, at in self._seen.items() if at >= horizon}
+
+    def _grow(self, size: int) -> None:
+        current = len(self._state_status)
+        if size <= current:
+            return
+        extra = max(size, 2 * current) - current
+        self._state_status = np.concatenate((self._state_status, np.full(extra, -1, dtype=np.int8)))
+        self._state_since = np.concatenate((self._state_since, np.zeros(extra)))
+        for name, values in self._attrs.items():
+            self._attrs[name] = np.concatenate((values, np.zeros(extra, dtype=np.int32)))
+
+    def _apply_events(self, rows) -> None:
+        rows = [row for row in rows if row.from_status != row.to_status]
+        if not rows:
+            return
+        issue = np.array([self._issues.code(row.issue_id) for row in rows], dtype=np.int32)
+        status = np.array([STATUS_CODES[row.to_status] for row in rows], dtype=np.int8)
+        at = _seconds([row.action_at for row in rows])
+        self._grow(len(self._issues.values))
+
+        order = np.argsort(issue, kind="stable")  # rows arrive in time order
+        issue, status, at = issue[order], status[order], at[order]
+        first = np.ones(len(issue), dtype=bool)
+        first[1:] = issue[1:] != issue[:-1]
+        last = np.ones(len(issue), dtype=bool)
+        last[:-1] = first[1:]
+
+        # Consecutive events of one issue bound an interval in the earlier event's status.
+        inner = ~last
+        # The first event of an issue closes the interval left open by earlier batches.
+        carried = first & (self._state_status[issue] >= 0)
+        new_issue = np.concatenate((issue[inner], issue[carried]))
+        new_status = np.concatenate((status[inner], self._state_status[issue[carried]]))
+        new_duration = np.concatenate(
+            (
+                at[np.flatnonzero(inner) + 1] - at[inner],
+                at[carried] - self._state_since[issue[carried]],
+            )
+        )
+        self._issue = np.concatenate((self._issue, new_issue))
+        self._status = np.concatenate((self._status, new_status))
+        self._duration = np.concatenate((self._duration, new_duration))
+
+        self._state_status[issue[last]] = status[last]
+        self._state_since[issue[last]] = at[last]
+
+    def _refresh_attributes(self, db: Session) -> None:
+        stmt = select(QualityIssue.id, QualityIssue.updated_at, *GROUP_COLUMNS.values())
+        if self._attr_watermark is not None:
+            stmt = stmt.where(QualityIssue.updated_at >= self._attr_watermark - REFRESH_OVERLAP)
+        for rows in db.execute(stmt.execution_options(yield_per=LOAD_BATCH)).partitions():
+            codes = np.array([self._issues.code(row.id) for row in rows], dtype=np.int64)
+            self._grow(len(self._issues.values))
+            for position, name in enumerate(GROUP_COLUMNS, start=2):
+                labels = self._groups[name]
+                self._attrs[name][codes] = [labels.code(None if row[position] is None else str(row[position])) for row in rows]
+            latest = max(row.updated_at for row in rows)
+            if self._attr_watermark is None or latest > self._attr_watermark:
+                self._attr_watermark = latest
+
+    def stats(
+        self,
+        group_by: str,
+        percentiles: list[int],
+        project_id: str | None = None,
+        status: QualityIssueStatus | None = None,
+        include_open: bool = False,
+        now: datetime | None = None,
+    ) -> list[DwellStats]:
+        """Dwell-time distribution per (group, status), durations in seconds."""
+        with self._lock:
+            issue, status_col, duration = self._issue, self._status, self._duration
+            if include_open:
+                open_issues = np.flatnonzero(self._state_status >= 0)
+                current = _seconds([now or datetime.utcnow()])[0]
+                issue = np.concatenate((issue, open_issues.astype(np.int32)))
+                status_col = np.concatenate((status_col, self._state_status[open_issues]))
+                duration = np.concatenate((duration, current - self._state_since[open_issues]))
+            group = self._attrs[group_by][issue]
+            keep = np.ones(len(issue), dtype=bool)
+            if project_id is not None:
+                project_code = self._groups["project"].codes.get(project_id, -1)
+                keep &= self._attrs["project"][issue] == project_code
+            if status is not None:
+                keep &= status_col == STATUS_CODES[status]
+            labels = self._groups[group_by].values
+        group, status_col, duration = group[keep], status_col[keep], duration[keep]
+        if not len(duration):
+            return []
+
+        # Sort by (group, status, duration); each (group, status) run is then one sorted sample.
+        order = np.lexsort((duration, status_col, group))
+        group, status_col, duration = group[order], status_col[order], duration[order]
+        starts = np.flatnonzero(
+            np.concatenate(([True], (group[1:] != group[:-1]) | (status_col[1:] != status_col[:-1])))
+        )
+        counts = np.diff(np.append(starts, len(duration)))
+        sums = np.add.reduceat(duration, starts)
+        # Linear interpolation between closest ranks, for all runs at once.
+        quantiles = {}
+        for p in percentiles:
+            rank = (counts - 1) * (p / 100)
+            low = np.floor(rank).astype(np.int64)
+            high = np.minimum(low + 1, counts - 1)
+            frac = rank - low
+            quantiles[p] = duration[starts + low] * (1 - frac) + duration[starts + high] * frac
+
+        return [
+            DwellStats(
+                group=labels[group[start]],
+                status=STATUSES[status_col[start]],
+                count=int(counts[i]),
+                mean_seconds=float(sums[i] / counts[i]),
+                percentiles={p: float(values[i]) for p, values in quantiles.items()},
+            )
+            for i, start in enumerate(starts.tolist())
+        ]
+
+
+dwell_store = DwellStore()
@@ -0,0 +1,199 @@
+"""Flag quality issues as overdue when their ``due_at`` passes.
+
+Upcoming deadlines sit in a min-heap. Every ``reload_seconds`` the heap is
+topped up with open, unflagged issues due within the look-ahead window,
+which is a range scan on ``(status, overdue_at, due_at)``; between reloads
+the scheduler sleeps until the earliest deadline. Writers in the same
+process call ``notify`` so deadlines set inside the window are not missed
+until the next reload.
+
+Flagging re-checks each issue under a row lock, so stale heap entries
+(issue closed or deadline moved) are dropped there. Each flag writes
+``overdue_at``, a same-status escalation event and an ``overdue_count``
+delta, and is published on the live feed.
+
+``clock`` and ``sleep`` are injectable so tests can drive it with a fake
+clock. Run it in-process (``ESCALATION_IN_PROCESS=true``) or as a worker
+with ``python -m app.jobs.escalation_scheduler``.
+"""
+
+import asyncio
+import heapq
+import logging
+import threading
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.session import SessionLocal
+from app.models.entities import QualityIssue, QualityIssueEvent, uuid_str
+from app.schemas.quality import QualityIssueEventOut, QualityIssueOut
+from app.services.live_feed import event_message, publish
+from app.services.quality_kpi import OPEN_STATUSES, KpiDeltas, kpi_key
+
+ESCALATION_ACTOR = "sla-scheduler"
+FLAG_BATCH = 500
+ERROR_BACKOFF_SECONDS = 1.0
+MAX_ERROR_BACKOFF_SECONDS = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+class EscalationScheduler:
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session] = SessionLocal,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        lookahead: timedelta = timedelta(hours=1),
+        reload_seconds: float = 300,
+    ) -> None:
+        self._session_factory = session_factory
+        self._clock = clock
+        self._sleep = sleep
+        self._lookahead = lookahead
+        self._reload_every = timedelta(seconds=reload_seconds)
+        self._heap: list[tuple[datetime, str]] = []
+        self._queued: set[tuple[datetime, str]] = set()
+        self._lock = threading.Lock()
+        self._horizon: datetime | None = None
+        self._next_reload: datetime | None = None
+        self.running = False
+
+    def notify(self, issue_id: str, due_at: datetime) -> None:
+        """Queue a deadline written by this process; ignored outside the loaded window."""
+        with self._lock:
+            if self.running and self._horizon is not None and due_at <= self._horizon:
+                self._push(due_at, issue_id)
+
+    def tick(self) -> int:
+        """Reload if due, flag every issue whose deadline has passed; returns the number flagged."""
+        now = self._clock()
+        if self._next_reload is None or now >= self._next_reload:
+            self._reload(now)
+        with self._lock:
+            due: list[str] = []
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                self._queued.discard(entry)
+                due.append(entry[1])
+        flagged = 0
+        for start in range(0, len(due), FLAG_BATCH):
+            flagged += self._flag(list(dict.fromkeys(due[start : start + FLAG_BATCH])), now)
+        return flagged
+
+    def seconds_until_next(self) -> float:
+        now = self._clock()
+        wake = self._next_reload or now
+        with self._lock:
+            if self._heap:
+                wake = min(wake, self._heap[0][0])
+        return max((wake - now).total_seconds(), 0.0)
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """Flag deadlines until ``stop`` is set; database work runs in a worker thread.
+
+        A failed tick (deadlock, dropped connection) is logged and retried with
+        exponential backoff rather than ending the loop.
+        """
+        self.running = True
+        failures = 0
+        try:
+            while stop is None or not stop.is_set():
+                try:
+                    await asyncio.to_thread(self.tick)
+                except Exception:
+                    failures += 1
+                    logger.exception("escalation tick failed (%d in a row)", failures)
+                    # The failed tick may have popped due entries; the forced reload brings them back.
+                    self._next_reload = None
+                    await self._sleep(min(ERROR_BACKOFF_SECONDS * 2 ** (failures - 1), MAX_ERROR_BACKOFF_SECONDS))
+                    continue
+                failures = 0
+                await self._sleep(self.seconds_until_next())
+        finally:
+            self.running = False
+
+    def _push(self, due_at: datetime, issue_id: str) -> None:
+        entry = (due_at, issue_id)
+        if entry not in self._queued:
+            self._queued.add(entry)
+            heapq.heappush(self._heap, entry)
+
+    def _reload(self, now: datetime) -> None:
+        horizon = now + self._lookahead
+        with self._session_factory() as db:
+            rows = db.execute(
+                select(QualityIssue.due_at, QualityIssue.id).where(
+                    QualityIssue.status.in_(OPEN_STATUSES),
+                    QualityIssue.overdue_at.is_(None),
+                    QualityIssue.due_at <= horizon,
+                )
+            ).all()
+        with self._lock:
+            for due_at, issue_id in rows:
+                self._push(due_at, issue_id)
+            self._horizon = horizon
+            self._next_reload = now + self._reload_every
+
+    def _flag(self, issue_ids: list[str], now: datetime) -> int:
+        with self._session_factory() as db:
+            rows = db.execute(
+                select(
+                    QualityIssue.id,
+                    QualityIssue.project_id,
+                    QualityIssue.section_id,
+                    QualityIssue.level,
+                    QualityIssue.status,
+                    QualityIssue.due_at,
+                    QualityIssue.version,
+                )
+                .where(
+                    QualityIssue.id.in_(issue_ids),
+                    QualityIssue.status.in_(OPEN_STATUSES),
+                    QualityIssue.overdue_at.is_(None),
+                    QualityIssue.due_at <= now,
+                )
+                .order_by(QualityIssue.id)
+                .with_for_update()
+            ).all()
+            if not rows:
+                db.rollback()
+                return 0
+
+            deltas = KpiDeltas()
+            events = []
+            for row in rows:
+                deltas.set_overdue(kpi_key(row.project_id, row.section_id, row.level), row.status, True)
+                events.append(
+                    {
+                        "id": uuid_str(),
+                        "issue_id": row.id,
+                        "from_status": row.status,
+                        "to_status": row.status,
+                        "action_by": ESCALATION_ACTOR,
+                        "action_note": f"overdue: due at {row.due_at.isoformat()}",
+                        "action_at": now,
+                    }
+                )
+            db.execute(
+                update(QualityIssue),
+                [{"id": row.id, "overdue_at": now, "updated_at": now, "version": row.version + 1} for row in rows],
+            )
+            db.execute(insert(QualityIssueEvent), events)
+            deltas.apply(db)
+            db.commit()
+
+            issues = {
+                issue.id: QualityIssueOut.model_validate(issue, from_attributes=True)
+                for issue in db.scalars(select(QualityIssue).where(QualityIssue.id.in_([row.id for row in rows])))
+            }
+        for event in events:
+            issue = issues[event["issue_id"]]
+            publish(issue.project_id, event_message(QualityIssueEventOut.model_validate(event), issue))
+        return len(rows)
+
+
+escalation_scheduler = EscalationScheduler()
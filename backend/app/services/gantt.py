@@ -0,0 +1,117 @@
+"""Streamed Gantt window: tasks overlapping a date range plus their edges.
+
+A task overlaps ``[window_start, window_end]`` when it starts on or before
+the window end and finishes on or after the window start. With the actual
+basis a started task without ``actual_end`` is still running and overlaps
+every window after its start. Both lookups are range scans on
+``(project_id, <basis>_start, <basis>_end)``.
+
+The response body is produced after the request's dependencies have been
+torn down, so the generator opens and closes its own session.
+"""
+
+import json
+from collections.abc import Iterator
+from datetime import date
+
+from sqlalchemy import or_, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.session import SessionLocal
+from app.models.entities import Task, TaskDependency
+
+STREAM_BATCH = 1_000
+
+
+def window_filter(project_id: str, window_start: date, window_end: date, basis: str) -> ColumnElement[bool]:
+    start_col = getattr(Task, f"{basis}_start")
+    end_col = getattr(Task, f"{basis}_end")
+    finishes_after = end_col >= window_start
+    if basis == "actual":
+        finishes_after = or_(finishes_after, end_col.is_(None))
+    return (Task.project_id == project_id) & (start_col <= window_end) & finishes_after
+
+
+def stream_gantt(project_id: str, window_start: date, window_end: date, basis: str) -> Iterator[str]:
+    """Yield one JSON document ``{"tasks": [...], "dependencies": [...]}`` in chunks.
+
+    Dependencies are those with at least one endpoint inside the window, so
+    arrows to off-screen tasks can still be drawn.
+    """
+    in_window = window_filter(project_id, window_start, window_end, basis)
+    start_col = getattr(Task, f"{basis}_start")
+    with SessionLocal() as db:
+        tasks = db.execute(
+            select(
+                Task.id,
+                Task.parent_task_id,
+                Task.wbs_code,
+                Task.name,
+                Task.status,
+                Task.planned_start,
+                Task.planned_end,
+                Task.actual_start,
+                Task.actual_end,
+                Task.progress_percent,
+            )
+            .where(in_window)
+            .order_by(start_col, Task.id)
+            .execution_options(yield_per=STREAM_BATCH)
+        )
+        yield '{"tasks":['
+        separator = ""
+        for rows in tasks.partitions():
+            yield separator + ",".join(json.dumps(_task_item(row), ensure_ascii=False) for row in rows)
+            separator = ","
+
+        window_ids = select(Task.id).where(in_window)
+        edges = db.execute(
+            select(
+                TaskDependency.predecessor_task_id,
+                TaskDependency.successor_task_id,
+                TaskDependency.dependency_type,
+                TaskDependency.lag_days,
+            )
+            .where(
+                TaskDependency.project_id == project_id,
+                or_(
+                    TaskDependency.successor_task_id.in_(window_ids),
+                    TaskDependency.predecessor_task_id.in_(window_ids),
+                ),
+            )
+            .execution_options(yield_per=STREAM_BATCH)
+        )
+        yield '],"dependencies":['
+        separator = ""
+        for rows in edges.partitions():
+            yield separator + ",".join(json.dumps(_edge_item(row)) for row in rows)
+            separator = ","
+        yield "]}"
+
+
+def _iso(value: date | None) -> str | None:
+    return value.isoformat() if value else None
+
+
+def _task_item(row) -> dict:
+    return {
+        "id": row.id,
+        "parent_task_id": row.parent_task_id,
+        "wbs_code": row.wbs_code,
+        "name": row.name,
+        "status": row.status.value,
+        "planned_start": _iso(row.planned_start),
+        "planned_end": _iso(row.planned_end),
+        "actual_start": _iso(row.actual_start),
+        "actual_end": _iso(row.actual_end),
+        "progress_percent": float(row.progress_percent),
+    }
+
+
+def _edge_item(row) -> dict:
+    return {
+        "predecessor_task_id": row.predecessor_task_id,
+        "successor_task_id": row.successor_task_id,
+        "dependency_type": row.dependency_type.value,
+        "lag_days": row.lag_days,
+    }
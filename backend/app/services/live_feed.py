@@ -0,0 +1,159 @@
+"""Project-scoped live feed of quality issue changes.
+
+Writers call ``publish`` after commit; each open feed connection holds one
+subscription on its project's channel. ``MemoryBroker`` fans out inside one
+process and is what tests use. ``RedisBroker`` relays through Redis pub/sub
+so every API worker sees every write; it needs the optional ``redis``
+package.
+
+Brokers carry live messages only. A reconnecting client passes the cursor
+of the last event it saw and the feed replays missed events from
+``quality_issue_events`` before switching to live delivery.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+
+from app.api.pagination import encode_cursor
+from app.core.config import settings
+from app.schemas.quality import QualityIssueEventOut, QualityIssueOut
+
+MAX_PENDING = 1_000
+
+logger = logging.getLogger(__name__)
+
+
+class FeedOverflow(Exception):
+    """The subscriber fell too far behind; it should reconnect with its cursor."""
+
+
+class FeedBroker(ABC):
+    @abstractmethod
+    def publish(self, project_id: str, message: dict) -> None:
+        """Deliver a JSON-ready ``message`` to subscribers of ``project_id``; safe from any thread."""
+
+    @abstractmethod
+    def subscribe(self, project_id: str) -> AbstractAsyncContextManager["Subscription"]:
+        """Open a subscription on ``project_id``'s channel for the duration of the block."""
+
+
+class Subscription(ABC):
+    @abstractmethod
+    async def get(self, timeout: float) -> dict | None:
+        """Next message, or ``None`` if nothing arrived within ``timeout`` seconds."""
+
+
+class _MemorySubscription(Subscription):
+    def __init__(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[dict] = asyncio.Queue()
+        self.overflowed = False
+
+    def deliver(self, message: dict) -> None:
+        if self.queue.qsize() >= MAX_PENDING:
+            self.overflowed = True
+        else:
+            self.queue.put_nowait(message)
+
+    async def get(self, timeout: float) -> dict | None:
+        if self.overflowed:
+            raise FeedOverflow
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class _RedisSubscription(Subscription):
+    def __init__(self, pubsub) -> None:
+        self.pubsub = pubsub
+
+    async def get(self, timeout: float) -> dict | None:
+        item = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        return json.loads(item["data"]) if item else None
+
+
+class MemoryBroker(FeedBroker):
+    def __init__(self) -> None:
+        self._subscriptions: dict[str, set[_MemorySubscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, project_id: str, message: dict) -> None:
+        with self._lock:
+            targets = list(self._subscriptions.get(project_id, ()))
+        for subscription in targets:
+            subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+
+    @asynccontextmanager
+    async def subscribe(self, project_id: str):
+        subscription = _MemorySubscription()
+        with self._lock:
+            self._subscriptions.setdefault(project_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                remaining = self._subscriptions.get(project_id)
+                if remaining is not None:
+                    remaining.discard(subscription)
+                    if not remaining:
+                        del self._subscriptions[project_id]
+
+
+class RedisBroker(FeedBroker):
+    def __init__(self, url: str, prefix: str = "quality-feed:") -> None:
+        import redis
+        import redis.asyncio
+
+        self._url = url
+        self._prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._async = redis.asyncio
+
+    def publish(self, project_id: str, message: dict) -> None:
+        self._client.publish(self._prefix + project_id, json.dumps(message))
+
+    @asynccontextmanager
+    async def subscribe(self, project_id: str):
+        client = self._async.Redis.from_url(self._url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self._prefix + project_id)
+        try:
+            yield _RedisSubscription(pubsub)
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+
+def make_broker() -> FeedBroker:
+    if settings.live_feed_broker == "redis":
+        return RedisBroker(settings.redis_url)
+    return MemoryBroker()
+
+
+feed_broker = make_broker()
+
+
+def publish(project_id: str, message: dict) -> None:
+    """Best-effort fan-out; the write is already committed and clients can resume from the log."""
+    try:
+        feed_broker.publish(project_id, message)
+    except Exception:
+        logger.exception("live feed publish failed for project %s", project_id)
+
+
+def event_message(event: QualityIssueEventOut, issue: QualityIssueOut) -> dict:
+    return {
+        "type": "event",
+        "cursor": encode_cursor(event.action_at, event.id),
+        "event": event.model_dump(mode="json"),
+        "issue": issue.model_dump(mode="json"),
+    }
+
+
+def issue_message(issue: QualityIssueOut) -> dict:
+    return {"type": "issue", "issue": issue.model_dump(mode="json")}
@@ -0,0 +1,19 @@
+"""Shared process pool for CPU-bound schedule computations."""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import settings
+
+_executor: ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Lazily started pool sized by ``PROCESS_POOL_WORKERS`` (0 means one per CPU)."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.process_pool_workers or os.cpu_count())
+        return _executor
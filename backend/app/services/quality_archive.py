@@ -0,0 +1,205 @@
+"""Cold storage for closed quality issues.
+
+``archive_closed_issues`` moves closed issues past the retention window,
+with their events, rectifications and acceptances, out of the hot tables
+into compressed column files (``np.savez_compressed``, one array per
+column, one file per batch of a project's issues). Each archived issue
+keeps a narrow row in ``archived_quality_issues`` naming its file, so reads
+go straight to one file and KPI rebuilds can still count it.
+
+A batch file is written before the transaction that deletes the hot rows;
+if that transaction fails the file is simply never referenced.
+"""
+
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import DateTime, Table, delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.entities import (
+    ArchivedQualityIssue,
+    QualityAcceptance,
+    QualityIssue,
+    QualityIssueEvent,
+    QualityRectification,
+)
+from app.models.enums import QualityIssueStatus
+from app.services.search_index import search_index
+
+ARCHIVE_BATCH = 1_000
+ARCHIVE_CACHE_FILES = 8
+TABLES: dict[str, Table] = {
+    "issues": QualityIssue.__table__,
+    "events": QualityIssueEvent.__table__,
+    "rectifications": QualityRectification.__table__,
+    "acceptances": QualityAcceptance.__table__,
+}
+CHILD_MODELS = {
+    "events": QualityIssueEvent,
+    "rectifications": QualityRectification,
+    "acceptances": QualityAcceptance,
+}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ArchivedIssue:
+    issue: dict
+    events: list[dict]
+    rectifications: list[dict]
+    acceptances: list[dict]
+
+
+def archive_root() -> Path:
+    return Path(settings.quality_archive_path)
+
+
+def _encode(table_name: str, rows: list[dict]) -> dict[str, np.ndarray]:
+    arrays = {}
+    for column in TABLES[table_name].columns:
+        values = [row[column.name] for row in rows]
+        nulls = np.array([value is None for value in values], dtype=bool)
+        key = f"{table_name}.{column.name}"
+        if isinstance(column.type, DateTime):
+            arrays[key] = np.array(values, dtype="datetime64[us]")
+        else:
+            arrays[key] = np.array(["" if value is None else str(value) for value in values], dtype=np.str_)
+            if nulls.any():
+                arrays[f"{key}.null"] = nulls
+    return arrays
+
+
+def _decode(data: dict[str, np.ndarray], table_name: str, positions: np.ndarray) -> list[dict]:
+    columns = {}
+    for column in TABLES[table_name].columns:
+        key = f"{table_name}.{column.name}"
+        if key not in data:
+            # Column added after the file was written.
+            default = column.default.arg if column.default is not None and column.default.is_scalar else None
+            columns[column.name] = [default] * len(positions)
+            continue
+        values = data[key][positions].tolist()
+        if f"{key}.null" in data:
+            values = [None if null else value for value, null in zip(values, data[f"{key}.null"][positions])]
+        columns[column.name] = values
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def write_archive(path: Path, tables: dict[str, list[dict]]) -> None:
+    arrays: dict[str, np.ndarray] = {}
+    for table_name, rows in tables.items():
+        arrays.update(_encode(table_name, rows))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".partial")
+    with open(partial, "wb") as handle:
+        np.savez_compressed(handle, **arrays)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(partial, path)
+
+
+@lru_cache(maxsize=ARCHIVE_CACHE_FILES)
+def _load(path: str) -> dict[str, np.ndarray]:
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+
+def read_archived_issue(archive_file: str, issue_id: str) -> ArchivedIssue | None:
+    data = _load(str(archive_root() / archive_file))
+    position = np.flatnonzero(data["issues.id"] == issue_id)
+    if not len(position):
+        return None
+    children = {
+        name: _decode(data, name, np.flatnonzero(data[f"{name}.issue_id"] == issue_id)) for name in CHILD_MODELS
+    }
+    return ArchivedIssue(issue=_decode(data, "issues", position)[0], **children)
+
+
+def read_archive_table(archive_file: str, table_name: str) -> list[dict]:
+    """Every row of one table in an archive file."""
+    data = _load(str(archive_root() / archive_file))
+    return _decode(data, table_name, np.arange(len(data[f"{table_name}.id"])))
+
+
+def find_archived_issue(db: Session, issue_id: str) -> ArchivedIssue | None:
+    """Archived issue with its children, or ``None`` if ``issue_id`` was never archived."""
+    entry = db.get(ArchivedQualityIssue, issue_id)
+    if entry is None:
+        return None
+    return read_archived_issue(entry.archive_file, issue_id)
+
+
+def _rows(db: Session, model, issue_ids: list[str]) -> list[dict]:
+    table = model.__table__
+    return [dict(row._mapping) for row in db.execute(select(table).where(table.c.issue_id.in_(issue_ids)))]
+
+
+def archive_closed_issues(
+    db: Session,
+    older_than_days: int,
+    project_id: str | None = None,
+    batch_size: int = ARCHIVE_BATCH,
+    now: datetime | None = None,
+) -> int:
+    """Move closed issues whose ``closed_at`` is older than the window; returns the number archived."""
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=older_than_days)
+    table = QualityIssue.__table__
+    total = 0
+    while True:
+        stmt = (
+            select(table)
+            .where(QualityIssue.status == QualityIssueStatus.closed, QualityIssue.closed_at < cutoff)
+            .order_by(QualityIssue.project_id, QualityIssue.closed_at, QualityIssue.id)
+            .limit(batch_size)
+            .with_for_update()
+        )
+        if project_id:
+            stmt = stmt.where(QualityIssue.project_id == project_id)
+        issues = [dict(row._mapping) for row in db.execute(stmt)]
+        if not issues:
+            db.rollback()
+            return total
+        # Keep a batch file to one project so a project's archive can be dropped as a unit.
+        issues = [row for row in issues if row["project_id"] == issues[0]["project_id"]]
+        issue_ids = [row["id"] for row in issues]
+        tables = {"issues": issues, **{name: _rows(db, model, issue_ids) for name, model in CHILD_MODELS.items()}}
+
+        archive_file = f"{issues[0]['project_id']}/{now:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.npz"
+        write_archive(archive_root() / archive_file, tables)
+        db.execute(
+            insert(ArchivedQualityIssue),
+            [
+                {
+                    "id": row["id"],
+                    "project_id": row["project_id"],
+                    "section_id": row["section_id"],
+                    "issue_code": row["issue_code"],
+                    "level": row["level"],
+                    "reported_at": row["reported_at"],
+                    "closed_at": row["closed_at"],
+                    "overdue_at": row["overdue_at"],
+                    "archive_file": archive_file,
+                    "archived_at": now,
+                }
+                for row in issues
+            ],
+        )
+        for model in CHILD_MODELS.values():
+            db.execute(delete(model).where(model.issue_id.in_(issue_ids)))
+        db.execute(delete(QualityIssue).where(QualityIssue.id.in_(issue_ids)))
+        db.commit()
+        total += len(issue_ids)
+        try:
+            search_index.remove(issue_ids)
+        except Exception:
+            logger.exception("search index cleanup failed for archived issues")
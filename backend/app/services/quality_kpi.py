@@ -0,0 +1,165 @@
+"""Quality KPI counters per (project, section, level).
+
+Writers collect deltas in a ``KpiDeltas`` while they change issues and apply
+them in the same transaction with one upsert, so counters are never visible
+out of step with the issues they describe. ``rebuild_kpis`` recomputes the
+rows from the issues table for backfill or repair.
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.entities import ArchivedQualityIssue, QualityIssue, QualityKpi
+from app.models.enums import QualityIssueStatus, QualityLevel
+
+OPEN_STATUSES = (QualityIssueStatus.reported, QualityIssueStatus.rectifying, QualityIssueStatus.pending_review)
+STATUS_COLUMNS = {status: f"{status.value}_count" for status in QualityIssueStatus}
+COUNTER_COLUMNS = ("total_count", *STATUS_COLUMNS.values(), "close_seconds_total", "overdue_count")
+REBUILD_BATCH = 5_000
+UPSERT_BATCH = 500
+
+_UPSERTS = {"mysql": mysql.insert, "postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+KpiKey = tuple[str, str, QualityLevel]
+
+
+def kpi_key(project_id: str, section_id: str | None, level: QualityLevel) -> KpiKey:
+    return project_id, section_id or "", level
+
+
+def close_seconds(reported_at: datetime, closed_at: datetime | None) -> int:
+    return max(int((closed_at - reported_at).total_seconds()), 0) if closed_at else 0
+
+
+class KpiDeltas:
+    """Pending counter changes; ``overdue`` means the issue has been flagged overdue.
+
+    ``overdue_count`` counts flagged issues that are still open, so it moves
+    when a flagged issue is closed, rejected or reopened.
+    """
+
+    def __init__(self) -> None:
+        self._deltas: dict[KpiKey, Counter] = defaultdict(Counter)
+
+    def add_issue(
+        self,
+        key: KpiKey,
+        status: QualityIssueStatus,
+        closed_seconds: int = 0,
+        overdue: bool = False,
+        sign: int = 1,
+    ) -> None:
+        delta = self._deltas[key]
+        delta["total_count"] += sign
+        delta[STATUS_COLUMNS[status]] += sign
+        delta["close_seconds_total"] += sign * closed_seconds
+        if overdue and status in OPEN_STATUSES:
+            delta["overdue_count"] += sign
+
+    def change_status(
+        self,
+        key: KpiKey,
+        from_status: QualityIssueStatus,
+        to_status: QualityIssueStatus,
+        closed_seconds: int = 0,
+        overdue: bool = False,
+    ) -> None:
+        delta = self._deltas[key]
+        delta[STATUS_COLUMNS[from_status]] -= 1
+        delta[STATUS_COLUMNS[to_status]] += 1
+        delta["close_seconds_total"] += closed_seconds
+        if overdue:
+            delta["overdue_count"] += (to_status in OPEN_STATUSES) - (from_status in OPEN_STATUSES)
+
+    def move_issue(
+        self,
+        old: KpiKey,
+        new: KpiKey,
+        status: QualityIssueStatus,
+        closed_seconds: int = 0,
+        overdue: bool = False,
+    ) -> None:
+        if old != new:
+            self.add_issue(old, status, closed_seconds, overdue, sign=-1)
+            self.add_issue(new, status, closed_seconds, overdue)
+
+    def set_overdue(self, key: KpiKey, status: QualityIssueStatus, overdue: bool) -> None:
+        """The overdue flag of an issue in ``status`` was set (or cleared)."""
+        if status in OPEN_STATUSES:
+            self._deltas[key]["overdue_count"] += 1 if overdue else -1
+
+    def apply(self, db: Session) -> None:
+        """Upsert all pending deltas inside the caller's transaction."""
+        rows = [
+            {
+                "project_id": project_id,
+                "section_key": section_key,
+                "level": level,
+                **{column: delta[column] for column in COUNTER_COLUMNS},
+            }
+            for (project_id, section_key, level), delta in self._deltas.items()
+            if any(delta.values())
+        ]
+        self._deltas.clear()
+        dialect = db.get_bind().dialect.name
+        table = QualityKpi.__table__
+        for start in range(0, len(rows), UPSERT_BATCH):
+            stmt = _UPSERTS[dialect](table).values(rows[start : start + UPSERT_BATCH])
+            if dialect == "mysql":
+                stmt = stmt.on_duplicate_key_update({c: table.c[c] + stmt.inserted[c] for c in COUNTER_COLUMNS})
+            else:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[table.c.project_id, table.c.section_key, table.c.level],
+                    set_={c: table.c[c] + stmt.excluded[c] for c in COUNTER_COLUMNS},
+                )
+            db.execute(stmt)
+
+
+def rebuild_kpis(db: Session, project_id: str | None = None) -> int:
+    """Recompute KPI rows from the issues and archive tables; returns the number of issues counted.
+
+    Run it while issue writes are quiet; deltas applied by concurrent
+    writers during the rebuild can be counted twice.
+    """
+    scope = delete(QualityKpi)
+    stmt = select(
+        QualityIssue.project_id,
+        QualityIssue.section_id,
+        QualityIssue.level,
+        QualityIssue.status,
+        QualityIssue.reported_at,
+        QualityIssue.closed_at,
+        QualityIssue.overdue_at,
+    ).execution_options(yield_per=REBUILD_BATCH)
+    archived = select(
+        ArchivedQualityIssue.project_id,
+        ArchivedQualityIssue.section_id,
+        ArchivedQualityIssue.level,
+        ArchivedQualityIssue.reported_at,
+        ArchivedQualityIssue.closed_at,
+    ).execution_options(yield_per=REBUILD_BATCH)
+    if project_id:
+        scope = scope.where(QualityKpi.project_id == project_id)
+        stmt = stmt.where(QualityIssue.project_id == project_id)
+        archived = archived.where(ArchivedQualityIssue.project_id == project_id)
+    db.execute(scope)
+
+    deltas = KpiDeltas()
+    count = 0
+    for row in db.execute(stmt):
+        count += 1
+        closed = close_seconds(row.reported_at, row.closed_at) if row.status == QualityIssueStatus.closed else 0
+        key = kpi_key(row.project_id, row.section_id, row.level)
+        deltas.add_issue(key, row.status, closed, overdue=row.overdue_at is not None)
+    # Only closed issues are archived.
+    for row in db.execute(archived):
+        count += 1
+        key = kpi_key(row.project_id, row.section_id, row.level)
+        deltas.add_issue(key, QualityIssueStatus.closed, close_seconds(row.reported_at, row.closed_at))
+    deltas.apply(db)
+    db.commit()
+    return count
@@ -0,0 +1,263 @@
+"""Cache of encoded read responses for data that changes rarely.
+
+Entries are keyed by endpoint, path and query string plus the current
+generation of every tag the response depends on (``projects``,
+``project:<id>``, ``sections:<id>``, ``work_areas:<id>``). Invalidating a
+tag bumps its generation, so older entries are simply never looked up again
+and age out through the TTL or LRU; a reader that loaded data before the
+bump can only store it under the old generation.
+
+Writes are picked up from the ORM: ``after_flush`` collects the tags of
+changed projects, sections and work areas and ``after_commit`` bumps them,
+so every write path invalidates without calling the cache. Core
+``update()``/``delete()`` statements bypass the flush; the TTL bounds how
+long such writes stay hidden.
+
+``MemoryCache`` is a per-process LRU with TTL; other workers only see a
+write once their copy expires. ``SharedCache`` keeps entries and
+generations in a Redis-style store so every API worker sees every
+invalidation; it needs the optional ``redis`` package, and ``MemoryStore``
+stands in for Redis in tests.
+"""
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.entities import Project, Section, WorkArea
+
+PENDING_KEY = "response_cache_tags"
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Stored value, or ``None`` if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        """Store ``value``; it expires after the backend's TTL."""
+
+    @abstractmethod
+    def generations(self, tags: Sequence[str]) -> list[int]:
+        """Current generation of each tag; tags never invalidated are at 0."""
+
+    @abstractmethod
+    def bump(self, tags: Iterable[str]) -> None:
+        """Advance the generation of each tag, orphaning every entry built on the old one."""
+
+
+class MemoryCache(CacheBackend):
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def generations(self, tags: Sequence[str]) -> list[int]:
+        with self._lock:
+            return [self._generations.get(tag, 0) for tag in tags]
+
+    def bump(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+
+
+class MemoryStore:
+    """The handful of Redis commands ``SharedCache`` uses, kept in process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[str, tuple[float | None, bytes | int]] = {}
+
+    def _live(self, key: str):
+        entry = self._values.get(key)
+        if entry is None or (entry[0] is not None and entry[0] <= time.monotonic()):
+            return None
+        return entry[1]
+
+    def get(self, key: str):
+        with self._lock:
+            return self._live(key)
+
+    def mget(self, keys: Sequence[str]) -> list:
+        with self._lock:
+            return [self._live(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        with self._lock:
+            self._values[key] = (None if ex is None else time.monotonic() + ex, value)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._live(key) or 0) + 1
+            self._values[key] = (None, value)
+            return value
+
+
+class SharedCache(CacheBackend):
+    def __init__(self, client, ttl: int, prefix: str = "response-cache:") -> None:
+        self._client = client
+        self.ttl = ttl
+        self._prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        return self._client.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self._client.set(self._prefix + key, value, ex=self.ttl)
+
+    def generations(self, tags: Sequence[str]) -> list[int]:
+        values = self._client.mget([f"{self._prefix}gen:{tag}" for tag in tags])
+        return [int(value or 0) for value in values]
+
+    def bump(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._client.incr(f"{self._prefix}gen:{tag}")
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend | None) -> None:
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._hits: Counter[str] = Counter()
+        self._misses: Counter[str] = Counter()
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def key(self, namespace: str, resource: str, tags: Sequence[str]) -> str:
+        generations = ".".join(str(value) for value in self.backend.generations(tags))
+        return f"{namespace}:{resource}:{generations}"
+
+    def get(self, namespace: str, key: str) -> bytes | None:
+        value = self.backend.get(key)
+        with self._lock:
+            (self._misses if value is None else self._hits)[namespace] += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self.backend.set(key, value)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = sorted(set(tags))
+        if not self.enabled or not tags:
+            return
+        self.backend.bump(tags)
+        with self._lock:
+            self._invalidations += len(tags)
+
+    def stats(self) -> dict:
+        with self._lock:
+            namespaces = sorted(self._hits.keys() | self._misses.keys())
+            return {
+                "backend": type(self.backend).__name__ if self.backend else None,
+                "invalidations": self._invalidations,
+                "namespaces": {
+                    name: {"hits": self._hits[name], "misses": self._misses[name]} for name in namespaces
+                },
+            }
+
+
+def make_cache() -> ResponseCache:
+    backend = settings.response_cache_backend
+    if backend == "redis":
+        import redis
+
+        return ResponseCache(SharedCache(redis.Redis.from_url(settings.redis_url), settings.response_cache_ttl_seconds))
+    if backend == "shared-memory":
+        return ResponseCache(SharedCache(MemoryStore(), settings.response_cache_ttl_seconds))
+    if backend == "memory":
+        return ResponseCache(MemoryCache(settings.response_cache_size, settings.response_cache_ttl_seconds))
+    return ResponseCache(None)
+
+
+response_cache = make_cache()
+
+
+def _values(obj, attribute: str) -> set[str]:
+    """Current and pre-flush values of ``attribute``, so moving a row invalidates both sides."""
+    history = inspect(obj).attrs[attribute].history
+    return {value for value in (*history.added, *history.unchanged, *history.deleted) if value is not None}
+
+
+def _changed_tags(session: Session) -> set[str]:
+    tags: set[str] = set()
+    section_ids: set[str] = set()
+    for obj, deleted in [
+        *((obj, False) for obj in session.new),
+        *((obj, False) for obj in session.dirty),
+        *((obj, True) for obj in session.deleted),
+    ]:
+        if isinstance(obj, Project):
+            tags |= {"projects", f"project:{obj.id}"}
+            if deleted:
+                tags |= {f"sections:{obj.id}", f"work_areas:{obj.id}"}
+        elif isinstance(obj, Section):
+            for project_id in _values(obj, "project_id"):
+                tags.add(f"sections:{project_id}")
+                if deleted:
+                    tags.add(f"work_areas:{project_id}")
+        elif isinstance(obj, WorkArea):
+            section_ids |= _values(obj, "section_id")
+    if section_ids:
+        # Inside the flush: go through the connection so the lookup cannot autoflush.
+        project_ids = session.connection().scalars(select(Section.project_id).where(Section.id.in_(section_ids)))
+        tags |= {f"work_areas:{project_id}" for project_id in project_ids}
+    return tags
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_tags(session: Session, flush_context) -> None:
+    if not response_cache.enabled:
+        return
+    tags = _changed_tags(session)
+    if tags:
+        session.info.setdefault(PENDING_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    tags = session.info.pop(PENDING_KEY, None)
+    if not tags:
+        return
+    try:
+        response_cache.invalidate(tags)
+    except Exception:
+        logger.exception("response cache invalidation failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
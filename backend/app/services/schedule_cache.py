@@ -0,0 +1,220 @@
+"""Per-project critical-path cache keyed by ``projects.schedule_version``.
+
+Every write that changes schedule inputs bumps the project's version in the
+same transaction. Readers compare the stored version with the cached one and
+only reload from the database on mismatch. Writes made by this worker are
+applied to the cached entry in memory and rescheduled over the affected
+region only; writes from other workers simply cause a reload.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.entities import Project, Task, TaskDependency
+from app.services.scheduling import (
+    EdgeSpec,
+    ScheduleGraph,
+    ScheduleResult,
+    build_graph,
+    compute_schedule,
+    remove_task,
+    replace_predecessors,
+    reschedule,
+)
+
+
+@dataclass(frozen=True)
+class ProjectSchedule:
+    version: int
+    graph: ScheduleGraph
+    durations: np.ndarray
+    result: ScheduleResult | None
+
+
+def load_schedule_inputs(db: Session, project_id: str) -> tuple[ScheduleGraph, np.ndarray]:
+    task_rows = db.execute(
+        select(Task.id, Task.planned_days, Task.actual_days).where(Task.project_id == project_id)
+    ).all()
+    dep_rows = db.execute(
+        select(
+            TaskDependency.predecessor_task_id,
+            TaskDependency.successor_task_id,
+            TaskDependency.dependency_type,
+            TaskDependency.lag_days,
+        ).where(TaskDependency.project_id == project_id)
+    ).all()
+    graph = build_graph([row.id for row in task_rows], dep_rows)
+    durations = np.array(
+        [
+            [row.planned_days or 0 for row in task_rows],
+            [row.actual_days or 0 for row in task_rows],
+        ],
+        dtype=np.int64,
+    )
+    return graph, durations
+
+
+def bump_schedule_version(db: Session, project_id: str) -> int:
+    """Increment the project's schedule version inside the caller's transaction."""
+    db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(schedule_version=Project.schedule_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return db.scalar(select(Project.schedule_version).where(Project.id == project_id)) or 0
+
+
+def _schedule(graph: ScheduleGraph, durations: np.ndarray) -> ScheduleResult | None:
+    return None if graph.cycle else compute_schedule(graph, durations)
+
+
+def load_schedule(db: Session, project_id: str, version: int | None = None) -> ProjectSchedule:
+    """Schedule computed from scratch from the database, bypassing the cache."""
+    if version is None:
+        version = db.scalar(select(Project.schedule_version).where(Project.id == project_id)) or 0
+    graph, durations = load_schedule_inputs(db, project_id)
+    return ProjectSchedule(version=version, graph=graph, durations=durations, result=_schedule(graph, durations))
+
+
+class ScheduleCache:
+    def __init__(self, max_projects: int):
+        self.max_projects = max_projects
+        self._entries: OrderedDict[str, ProjectSchedule] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, project_id: str) -> ProjectSchedule:
+        version = db.scalar(select(Project.schedule_version).where(Project.id == project_id)) or 0
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(project_id)
+                return entry
+
+        entry = load_schedule(db, project_id, version)
+        self._store(project_id, entry)
+        return entry
+
+    def invalidate(self, project_id: str) -> None:
+        with self._lock:
+            self._entries.pop(project_id, None)
+
+    def task_written(
+        self,
+        project_id: str,
+        version: int,
+        task_id: str,
+        planned_days: int | None,
+        actual_days: int | None,
+        predecessors: Sequence[EdgeSpec] | None,
+    ) -> None:
+        """Apply a created or updated task to the cached entry at ``version - 1``.
+
+        ``predecessors`` is ``None`` when the incoming dependencies did not change.
+        """
+        entry = self._base(project_id, version)
+        if entry is None:
+            return
+        graph = entry.graph
+        previous = entry.result
+        durations = entry.durations.copy()
+        released: list[int] = []
+
+        if task_id not in graph.index:
+            graph = replace_predecessors(graph, task_id, predecessors or [])
+            durations = np.hstack((durations, np.zeros((2, 1), dtype=np.int64)))
+            if previous is not None:
+                previous = _map_columns(previous, lambda a: np.hstack((a, np.zeros((a.shape[0], 1), dtype=a.dtype))))
+        elif predecessors is not None:
+            released = graph.pred[graph.succ == graph.index[task_id]].tolist()
+            graph = replace_predecessors(graph, task_id, predecessors)
+
+        target = graph.index[task_id]
+        durations[:, target] = (planned_days or 0, actual_days or 0)
+        self._finish(project_id, version, graph, durations, previous, [target], released)
+
+    def task_deleted(self, project_id: str, version: int, task_id: str) -> None:
+        entry = self._base(project_id, version)
+        if entry is None:
+            return
+        graph = entry.graph
+        if task_id not in graph.index:
+            self._store(project_id, ProjectSchedule(version, graph, entry.durations, entry.result))
+            return
+
+        target = graph.index[task_id]
+        successors = graph.succ[graph.pred == target]
+        predecessors = graph.pred[graph.succ == target]
+        previous = entry.result
+        if previous is not None:
+            previous = _map_columns(previous, lambda a: np.delete(a, target, axis=1))
+        self._finish(
+            project_id,
+            version,
+            remove_task(graph, task_id),
+            np.delete(entry.durations, target, axis=1),
+            previous,
+            (successors - (successors > target)).tolist(),
+            (predecessors - (predecessors > target)).tolist(),
+        )
+
+    def _base(self, project_id: str, version: int) -> ProjectSchedule | None:
+        """Cached entry the write at ``version`` can be applied to, dropping stale ones."""
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None:
+                return None
+            if entry.version != version - 1:
+                del self._entries[project_id]
+                return None
+            return entry
+
+    def _finish(
+        self,
+        project_id: str,
+        version: int,
+        graph: ScheduleGraph,
+        durations: np.ndarray,
+        previous: ScheduleResult | None,
+        changed: list[int],
+        released: list[int],
+    ) -> None:
+        if graph.cycle:
+            result = None
+        elif previous is None:
+            result = compute_schedule(graph, durations)
+        else:
+            result = reschedule(graph, durations, previous, changed, released)
+        self._store(project_id, ProjectSchedule(version, graph, durations, result))
+
+    def _store(self, project_id: str, entry: ProjectSchedule) -> None:
+        with self._lock:
+            current = self._entries.get(project_id)
+            if current is not None and current.version > entry.version:
+                return
+            self._entries[project_id] = entry
+            self._entries.move_to_end(project_id)
+            while len(self._entries) > self.max_projects:
+                self._entries.popitem(last=False)
+
+
+def _map_columns(result: ScheduleResult, fn) -> ScheduleResult:
+    return ScheduleResult(
+        early_start=fn(result.early_start),
+        early_finish=fn(result.early_finish),
+        late_start=fn(result.late_start),
+        late_finish=fn(result.late_finish),
+        total_float=fn(result.total_float),
+        free_float=fn(result.free_float),
+        length=result.length,
+    )
+
+
+schedule_cache = ScheduleCache(settings.schedule_cache_size)
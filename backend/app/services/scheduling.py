@@ -0,0 +1,525 @@
+"""Critical path scheduling engine.
+
+Tasks are mapped to dense integer indices and dependencies to parallel numpy
+edge arrays. A single topological sweep assigns every task a level (longest
+edge count from a source); the forward and backward passes then relax all
+edges entering (or leaving) one level at a time with vectorized numpy ops.
+
+Every dependency type is reduced to one start-to-start constraint:
+
+    ES[succ] >= ES[pred] + from_finish * d[pred] + lag - to_finish * d[succ]
+
+where ``from_finish`` is set for FS/FF and ``to_finish`` for FF/SF.
+Durations may be a single row or a ``(scenarios, tasks)`` matrix, so the
+planned and actual schedules (or sampled durations) share one sweep.
+"""
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.models.enums import DependencyType
+
+FROM_FINISH = {
+    DependencyType.fs: 1,
+    DependencyType.ss: 0,
+    DependencyType.ff: 1,
+    DependencyType.sf: 0,
+}
+TO_FINISH = {
+    DependencyType.fs: 0,
+    DependencyType.ss: 0,
+    DependencyType.ff: 1,
+    DependencyType.sf: 1,
+}
+
+EdgeSpec = tuple[str, str, DependencyType | str, int]
+
+
+@dataclass(frozen=True)
+class ScheduleGraph:
+    task_ids: list[str]
+    index: dict[str, int]
+    pred: np.ndarray
+    succ: np.ndarray
+    lag: np.ndarray
+    from_finish: np.ndarray
+    to_finish: np.ndarray
+    level: np.ndarray
+    order: np.ndarray
+    out_ptr: np.ndarray
+    out_edges: np.ndarray
+    in_ptr: np.ndarray
+    in_edges: np.ndarray
+    fwd_perm: np.ndarray
+    fwd_bounds: np.ndarray
+    bwd_perm: np.ndarray
+    bwd_bounds: np.ndarray
+    cycle: bool
+
+    @property
+    def size(self) -> int:
+        return len(self.task_ids)
+
+
+@dataclass(frozen=True)
+class ScheduleResult:
+    early_start: np.ndarray
+    early_finish: np.ndarray
+    late_start: np.ndarray
+    late_finish: np.ndarray
+    total_float: np.ndarray
+    free_float: np.ndarray
+    length: np.ndarray
+
+
+def build_graph(task_ids: Sequence[str], edges: Iterable[EdgeSpec]) -> ScheduleGraph:
+    """Index tasks and dependencies; edges touching unknown tasks are ignored."""
+    ids = list(task_ids)
+    index = {task_id: i for i, task_id in enumerate(ids)}
+    pred: list[int] = []
+    succ: list[int] = []
+    lag: list[int] = []
+    from_finish: list[int] = []
+    to_finish: list[int] = []
+    for pred_id, succ_id, dep_type, lag_days in edges:
+        p = index.get(pred_id)
+        s = index.get(succ_id)
+        if p is None or s is None:
+            continue
+        pred.append(p)
+        succ.append(s)
+        lag.append(lag_days or 0)
+        from_finish.append(FROM_FINISH[dep_type])
+        to_finish.append(TO_FINISH[dep_type])
+
+    return _index_graph(
+        ids,
+        index,
+        np.asarray(pred, dtype=np.int64),
+        np.asarray(succ, dtype=np.int64),
+        np.asarray(lag, dtype=np.int64),
+        np.asarray(from_finish, dtype=np.int64),
+        np.asarray(to_finish, dtype=np.int64),
+    )
+
+
+def replace_predecessors(graph: ScheduleGraph, task_id: str, edges: Iterable[EdgeSpec]) -> ScheduleGraph:
+    """Copy of ``graph`` where ``task_id`` (appended if new) has exactly ``edges`` as its incoming dependencies.
+
+    When the task keeps its level no other level can change, so the cached
+    groupings are patched instead of re-running the topological sweep.
+    """
+    ids = graph.task_ids
+    index = graph.index
+    appended = task_id not in index
+    if appended:
+        ids = [*ids, task_id]
+        index = {**index, task_id: len(graph.task_ids)}
+    target = index[task_id]
+    keep = graph.succ != target
+
+    pred: list[int] = []
+    lag: list[int] = []
+    from_finish: list[int] = []
+    to_finish: list[int] = []
+    for pred_id, _, dep_type, lag_days in edges:
+        p = index.get(pred_id)
+        if p is None:
+            continue
+        pred.append(p)
+        lag.append(lag_days or 0)
+        from_finish.append(FROM_FINISH[dep_type])
+        to_finish.append(TO_FINISH[dep_type])
+    new_pred = np.asarray(pred, dtype=np.int64)
+    new_edges = (
+        new_pred,
+        np.full(len(pred), target, dtype=np.int64),
+        np.asarray(lag, dtype=np.int64),
+        np.asarray(from_finish, dtype=np.int64),
+        np.asarray(to_finish, dtype=np.int64),
+    )
+
+    # Every edge raises the level, so predecessors below the task's level cannot be downstream of it.
+    self_loop = bool((new_pred == target).any())
+    level = int(graph.level[new_pred].max()) + 1 if new_pred.size and not self_loop else 0
+    if graph.cycle or self_loop or (not appended and level != graph.level[target]):
+        return _index_graph(ids, index, *_join_edges(graph, keep, new_edges))
+
+    if appended:
+        levels = np.append(graph.level, level)
+        order = np.append(graph.order, target)
+    else:
+        levels = graph.level
+        position = np.empty(graph.size, dtype=np.int64)
+        position[graph.order] = np.arange(graph.size)
+        order = graph.order
+        if new_pred.size and position[new_pred].max() > position[target]:
+            order = np.argsort(levels, kind="stable")
+    return _patch_graph(graph, ids, index, keep, levels, order, new_edges=new_edges)
+
+
+def remove_task(graph: ScheduleGraph, task_id: str) -> ScheduleGraph:
+    """Copy of ``graph`` without ``task_id`` and its dependencies; later indices shift down by one.
+
+    Re-runs the topological sweep only when a successor loses its level.
+    """
+    target = graph.index[task_id]
+    ids = graph.task_ids[:target] + graph.task_ids[target + 1 :]
+    index = {tid: i for i, tid in enumerate(ids)}
+    keep = (graph.pred != target) & (graph.succ != target)
+
+    successors = np.unique(graph.succ[graph.pred == target])
+    stable = not graph.cycle
+    if stable and successors.size:
+        # Longest remaining path into each successor; the level holds if another predecessor still reaches it.
+        remaining = keep & np.isin(graph.succ, successors)
+        reach = np.zeros(graph.size, dtype=np.int64)
+        np.maximum.at(reach, graph.succ[remaining], graph.level[graph.pred[remaining]] + 1)
+        stable = bool((reach[successors] == graph.level[successors]).all())
+    if not stable:
+        pred = graph.pred[keep]
+        succ = graph.succ[keep]
+        return _index_graph(
+            ids,
+            index,
+            pred - (pred > target),
+            succ - (succ > target),
+            graph.lag[keep],
+            graph.from_finish[keep],
+            graph.to_finish[keep],
+        )
+
+    order = graph.order[graph.order != target]
+    return _patch_graph(
+        graph, ids, index, keep, np.delete(graph.level, target), order - (order > target), removed=target
+    )
+
+
+def _join_edges(graph: ScheduleGraph, keep: np.ndarray, new_edges: tuple[np.ndarray, ...]) -> list[np.ndarray]:
+    columns = (graph.pred, graph.succ, graph.lag, graph.from_finish, graph.to_finish)
+    return [np.concatenate((column[keep], extra)) for column, extra in zip(columns, new_edges)]
+
+
+def _patch_graph(
+    graph: ScheduleGraph,
+    ids: list[str],
+    index: dict[str, int],
+    keep: np.ndarray,
+    level: np.ndarray,
+    order: np.ndarray,
+    new_edges: tuple[np.ndarray, ...] | None = None,
+    removed: int | None = None,
+) -> ScheduleGraph:
+    """``graph`` with only the ``keep`` edges plus ``new_edges``, reusing its groupings.
+
+    Levels must be unchanged for every remaining task. Kept edges are
+    renumbered in place and new edges take the highest ids, so merging them
+    (themselves stably sorted by key, as predecessors arrive in any order)
+    into the old stable groupings gives exactly what a fresh stable sort
+    would, without the full sort or the Python sweep.
+    """
+    n = len(ids)
+    kept = int(keep.sum())
+    if new_edges is None:
+        new_edges = tuple(np.zeros(0, dtype=np.int64) for _ in range(5))
+    pred, succ, lag, from_finish, to_finish = _join_edges(graph, keep, new_edges)
+    if removed is not None:
+        pred = pred - (pred > removed)
+        succ = succ - (succ > removed)
+    remap = np.cumsum(keep) - 1
+    added = np.arange(kept, kept + len(new_edges[0]), dtype=np.int64)
+
+    def regroup(old: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        base = remap[old[keep[old]]]
+        merged = added[np.argsort(keys[added], kind="stable")]
+        return np.insert(base, np.searchsorted(keys[base], keys[merged], side="right"), merged)
+
+    out_edges = regroup(graph.out_edges, pred)
+    in_edges = regroup(graph.in_edges, succ)
+    fwd_keys = level[succ]
+    bwd_keys = -level[pred]
+    fwd_perm = regroup(graph.fwd_perm, fwd_keys)
+    bwd_perm = regroup(graph.bwd_perm, bwd_keys)
+
+    return ScheduleGraph(
+        task_ids=ids,
+        index=index,
+        pred=pred,
+        succ=succ,
+        lag=lag,
+        from_finish=from_finish,
+        to_finish=to_finish,
+        level=level,
+        order=order,
+        out_ptr=_offsets(n, pred),
+        out_edges=out_edges,
+        in_ptr=_offsets(n, succ),
+        in_edges=in_edges,
+        fwd_perm=fwd_perm,
+        fwd_bounds=_run_bounds(fwd_keys[fwd_perm]),
+        bwd_perm=bwd_perm,
+        bwd_bounds=_run_bounds(bwd_keys[bwd_perm]),
+        cycle=False,
+    )
+
+
+def _index_graph(
+    ids: list[str],
+    index: dict[str, int],
+    pred: np.ndarray,
+    succ: np.ndarray,
+    lag: np.ndarray,
+    from_finish: np.ndarray,
+    to_finish: np.ndarray,
+) -> ScheduleGraph:
+    n = len(ids)
+    out_ptr, out_edges = _csr(n, pred)
+    in_ptr, in_edges = _csr(n, succ)
+    level, order = _topological_levels(n, out_ptr, out_edges, succ)
+    cycle = len(order) != n
+
+    fwd_perm, fwd_bounds = _group_by(level[succ])
+    bwd_perm, bwd_bounds = _group_by(-level[pred])
+
+    return ScheduleGraph(
+        task_ids=ids,
+        index=index,
+        pred=pred,
+        succ=succ,
+        lag=lag,
+        from_finish=from_finish,
+        to_finish=to_finish,
+        level=level,
+        order=np.asarray(order, dtype=np.int64),
+        out_ptr=out_ptr,
+        out_edges=out_edges,
+        in_ptr=in_ptr,
+        in_edges=in_edges,
+        fwd_perm=fwd_perm,
+        fwd_bounds=fwd_bounds,
+        bwd_perm=bwd_perm,
+        bwd_bounds=bwd_bounds,
+        cycle=cycle,
+    )
+
+
+def _group_by(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Stable permutation sorting ``keys`` plus offsets of each run of equal keys."""
+    perm = np.argsort(keys, kind="stable")
+    return perm, _run_bounds(keys[perm])
+
+
+def _run_bounds(ordered: np.ndarray) -> np.ndarray:
+    if ordered.size == 0:
+        return np.zeros(1, dtype=np.int64)
+    cuts = np.flatnonzero(ordered[1:] != ordered[:-1]) + 1
+    return np.concatenate(([0], cuts, [ordered.size])).astype(np.int64)
+
+
+def _csr(n: int, endpoint: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Edge ids grouped by ``endpoint`` plus per-task offsets into that grouping."""
+    return _offsets(n, endpoint), np.argsort(endpoint, kind="stable")
+
+
+def _offsets(n: int, endpoint: np.ndarray) -> np.ndarray:
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(endpoint, minlength=n), out=ptr[1:])
+    return ptr
+
+
+def _incident(ptr: np.ndarray, edges: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Concatenate the CSR edge lists of ``nodes`` without a Python loop."""
+    starts = ptr[nodes]
+    counts = ptr[nodes + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    shift = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return edges[shift + np.arange(total)]
+
+
+def _reach(ptr: np.ndarray, edges: np.ndarray, endpoint: np.ndarray, seeds: np.ndarray, n: int) -> np.ndarray:
+    """Mask of tasks reachable from ``seeds`` (inclusive) along one edge direction."""
+    mark = np.zeros(n, dtype=bool)
+    frontier = np.unique(seeds)
+    mark[frontier] = True
+    while frontier.size:
+        nxt = endpoint[_incident(ptr, edges, frontier)]
+        frontier = np.unique(nxt[~mark[nxt]])
+        mark[frontier] = True
+    return mark
+
+
+def _topological_levels(
+    n: int, out_ptr: np.ndarray, out_edges: np.ndarray, succ: np.ndarray
+) -> tuple[np.ndarray, list[int]]:
+    """Kahn sweep over CSR adjacency returning per-task level and topological order."""
+    targets = succ[out_edges].tolist()
+    bounds = out_ptr.tolist()
+    indegree = np.bincount(succ, minlength=n).tolist()
+
+    level = [0] * n
+    order = [i for i in range(n) if indegree[i] == 0]
+    for u in order:
+        next_level = level[u] + 1
+        for v in targets[bounds[u] : bounds[u + 1]]:
+            if level[v] < next_level:
+                level[v] = next_level
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                order.append(v)
+    return np.asarray(level, dtype=np.int64), order
+
+
+def compute_schedule(graph: ScheduleGraph, durations: np.ndarray) -> ScheduleResult:
+    """Run the forward and backward passes for one or more duration rows.
+
+    ``durations`` has shape ``(tasks,)`` or ``(scenarios, tasks)``; result
+    arrays always have shape ``(scenarios, tasks)``. Must not be called on a
+    graph with a cycle.
+    """
+    if graph.cycle:
+        raise ValueError("cannot schedule a graph with a dependency cycle")
+    d = _as_rows(durations)
+    # Constraint offset of every edge, computed once: ES[succ] >= ES[pred] + offset.
+    offset = _edge_offset(graph, d)
+
+    early_start = np.zeros_like(d)
+    _forward(graph, early_start, offset, graph.fwd_perm, graph.fwd_bounds)
+    length = _length(graph, early_start + d)
+
+    late_start = length[:, None] - d
+    _backward(graph, late_start, offset, graph.bwd_perm, graph.bwd_bounds)
+    return _result(graph, d, offset, early_start, late_start, length)
+
+
+def reschedule(
+    graph: ScheduleGraph,
+    durations: np.ndarray,
+    previous: ScheduleResult,
+    changed: Sequence[int],
+    released: Sequence[int] = (),
+) -> ScheduleResult:
+    """Recompute a schedule after local edits, touching only the affected region.
+
+    ``previous`` must be index-aligned with ``graph``. ``changed`` are tasks
+    whose duration or incoming edges changed; ``released`` are tasks that lost
+    an outgoing edge. Early dates are recomputed for the downstream closure of
+    ``changed``; late dates for the upstream closure of that region, while
+    every other late date only shifts by the change in project length.
+    """
+    if graph.cycle:
+        raise ValueError("cannot schedule a graph with a dependency cycle")
+    d = _as_rows(durations)
+    n = graph.size
+    offset = _edge_offset(graph, d)
+    changed_idx = np.asarray(changed, dtype=np.int64)
+
+    downstream = _reach(graph.out_ptr, graph.out_edges, graph.succ, changed_idx, n)
+    early_start = previous.early_start.copy()
+    early_start[:, downstream] = 0
+    edges = _incident(graph.in_ptr, graph.in_edges, np.flatnonzero(downstream))
+    perm, bounds = _group_by(graph.level[graph.succ[edges]])
+    _forward(graph, early_start, offset, edges[perm], bounds)
+    length = _length(graph, early_start + d)
+
+    seeds = np.concatenate((np.flatnonzero(downstream), np.asarray(released, dtype=np.int64)))
+    upstream = _reach(graph.in_ptr, graph.in_edges, graph.pred, seeds, n)
+    late_start = previous.late_start + (length - previous.length)[:, None]
+    late_start[:, upstream] = length[:, None] - d[:, upstream]
+    edges = _incident(graph.out_ptr, graph.out_edges, np.flatnonzero(upstream))
+    perm, bounds = _group_by(-graph.level[graph.pred[edges]])
+    _backward(graph, late_start, offset, edges[perm], bounds)
+    return _result(graph, d, offset, early_start, late_start, length)
+
+
+def _as_rows(durations: np.ndarray) -> np.ndarray:
+    return np.maximum(np.atleast_2d(np.asarray(durations, dtype=np.int64)), 0)
+
+
+def _length(graph: ScheduleGraph, early_finish: np.ndarray) -> np.ndarray:
+    if graph.size == 0:
+        return np.zeros(early_finish.shape[0], dtype=np.int64)
+    return early_finish.max(axis=1)
+
+
+def _forward(
+    graph: ScheduleGraph, early_start: np.ndarray, offset: np.ndarray, edges: np.ndarray, bounds: np.ndarray
+) -> None:
+    """Relax ``edges`` level by level; ``bounds`` delimit runs of equal successor level."""
+    pred = graph.pred[edges]
+    succ = graph.succ[edges]
+    edge_offset = offset[:, edges]
+    for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        np.maximum.at(early_start, (slice(None), succ[lo:hi]), early_start[:, pred[lo:hi]] + edge_offset[:, lo:hi])
+
+
+def _backward(
+    graph: ScheduleGraph, late_start: np.ndarray, offset: np.ndarray, edges: np.ndarray, bounds: np.ndarray
+) -> None:
+    """Mirror of ``_forward``; ``bounds`` delimit runs of equal predecessor level, deepest first."""
+    pred = graph.pred[edges]
+    succ = graph.succ[edges]
+    edge_offset = offset[:, edges]
+    for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        np.minimum.at(late_start, (slice(None), pred[lo:hi]), late_start[:, succ[lo:hi]] - edge_offset[:, lo:hi])
+
+
+def _result(
+    graph: ScheduleGraph,
+    d: np.ndarray,
+    offset: np.ndarray,
+    early_start: np.ndarray,
+    late_start: np.ndarray,
+    length: np.ndarray,
+) -> ScheduleResult:
+    early_finish = early_start + d
+    free_float = length[:, None] - early_finish
+    if graph.pred.size:
+        slack = early_start[:, graph.succ] - early_start[:, graph.pred] - offset
+        edge_min = np.full_like(d, np.iinfo(np.int64).max)
+        np.minimum.at(edge_min, (slice(None), graph.pred), slack)
+        has_succ = np.diff(graph.out_ptr) > 0
+        free_float[:, has_succ] = edge_min[:, has_succ]
+
+    return ScheduleResult(
+        early_start=early_start,
+        early_finish=early_finish,
+        late_start=late_start,
+        late_finish=late_start + d,
+        total_float=late_start - early_start,
+        free_float=free_float,
+        length=length,
+    )
+
+
+def _edge_offset(graph: ScheduleGraph, d: np.ndarray) -> np.ndarray:
+    return graph.from_finish * d[:, graph.pred] + graph.lag - graph.to_finish * d[:, graph.succ]
+
+
+def find_critical_path(graph: ScheduleGraph, result: ScheduleResult, durations: np.ndarray, row: int = 0) -> list[str]:
+    """Return one driving chain of zero-float tasks ending at the project finish."""
+    if graph.size == 0:
+        return []
+    d = _as_rows(durations)
+    es = result.early_start[row]
+    total_float = result.total_float[row]
+    critical = total_float == 0
+
+    driver = np.full(graph.size, -1, dtype=np.int64)
+    if graph.pred.size:
+        offset = _edge_offset(graph, d[row : row + 1])[0]
+        driving = (es[graph.succ] == es[graph.pred] + offset) & critical[graph.pred] & critical[graph.succ]
+        driver[graph.succ[driving]] = graph.pred[driving]
+
+    finish = result.early_finish[row]
+    end = int(np.argmax(np.where(critical, finish, -1)))
+    path: list[int] = []
+    node = end
+    while node != -1 and len(path) <= graph.size:
+        path.append(node)
+        node = int(driver[node])
+    path.reverse()
+    return [graph.task_ids[i] for i in path]
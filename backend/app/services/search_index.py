@@ -0,0 +1,269 @@
+"""Full-text search over quality issue titles and descriptions.
+
+Text is normalised (NFKC, lower case) and split into runs. CJK runs are
+indexed as character unigrams and bigrams, other runs as whole words, so
+"钢筋保护层" matches through its bigrams without a dictionary. Title terms
+count ``TITLE_WEIGHT`` times. Matching requires every query term; ranking
+is BM25.
+
+The index is a SQLite file on local disk (WAL mode, shared by the workers on
+a host). Routes upsert issues after commit; ``sync`` catches up on writes
+made elsewhere by scanning ``updated_at`` past a stored watermark, so a
+worker never rebuilds on startup. It also drops issues listed in
+``archived_quality_issues`` since a second watermark, so archiving on one
+host converges on every host's index.
+"""
+
+import logging
+import math
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.entities import ArchivedQualityIssue, QualityIssue
+from app.schemas.quality import QualityIssueOut
+
+TITLE_WEIGHT = 3
+BM25_K1 = 1.2
+BM25_B = 0.75
+SYNC_INTERVAL = timedelta(seconds=5)
+# Writers whose transactions commit out of updated_at order are caught by re-reading this far back.
+SYNC_OVERLAP = timedelta(minutes=1)
+SYNC_BATCH = 1_000
+
+logger = logging.getLogger(__name__)
+
+_CJK = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_RUNS = re.compile(rf"([{_CJK}]+)|([^\W_{_CJK}]+)")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_no INTEGER PRIMARY KEY AUTOINCREMENT,
+    issue_id TEXT NOT NULL UNIQUE,
+    project_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    level TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_docs_project ON docs (project_id, status, level);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_no INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (doc_no);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def tokenize(text: str | None, query: bool = False) -> list[str]:
+    """Index terms of ``text``; queries use only bigrams for multi-character CJK runs."""
+    if not text:
+        return []
+    terms: list[str] = []
+    for cjk, word in _RUNS.findall(unicodedata.normalize("NFKC", text).lower()):
+        if word:
+            terms.append(word)
+            continue
+        bigrams = [cjk[i : i + 2] for i in range(len(cjk) - 1)]
+        if not query:
+            terms.extend(cjk)
+        terms.extend(bigrams if bigrams else [cjk])
+    return terms
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    issue_id: str
+    score: float
+
+
+class SearchIndex:
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._last_sync: datetime | None = None
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def upsert(self, issues: list[QualityIssue | QualityIssueOut]) -> None:
+        """Index or re-index issues (ORM rows or ``QualityIssueOut``)."""
+        if not issues:
+            return
+        with self._transaction() as conn:
+            for issue in issues:
+                self._write(conn, issue)
+
+    def _write(self, conn: sqlite3.Connection, issue: QualityIssue | QualityIssueOut) -> None:
+        counts = Counter(tokenize(issue.description))
+        for term, tf in Counter(tokenize(issue.title)).items():
+            counts[term] += TITLE_WEIGHT * tf
+        row = conn.execute("SELECT doc_no FROM docs WHERE issue_id = ?", (issue.id,)).fetchone()
+        values = (issue.project_id, str(issue.status), str(issue.level), sum(counts.values()))
+        if row is None:
+            doc_no = conn.execute(
+                "INSERT INTO docs (issue_id, project_id, status, level, length) VALUES (?, ?, ?, ?, ?)",
+                (issue.id, *values),
+            ).lastrowid
+        else:
+            doc_no = row[0]
+            conn.execute(
+                "UPDATE docs SET project_id = ?, status = ?, level = ?, length = ? WHERE doc_no = ?",
+                (*values, doc_no),
+            )
+            conn.execute("DELETE FROM postings WHERE doc_no = ?", (doc_no,))
+        conn.executemany(
+            "INSERT INTO postings (term, doc_no, tf) VALUES (?, ?, ?)",
+            [(term, doc_no, tf) for term, tf in counts.items()],
+        )
+
+    def remove(self, issue_ids: list[str]) -> None:
+        with self._transaction() as conn:
+            for issue_id in issue_ids:
+                row = conn.execute("SELECT doc_no FROM docs WHERE issue_id = ?", (issue_id,)).fetchone()
+                if row is not None:
+                    conn.execute("DELETE FROM postings WHERE doc_no = ?", row)
+                    conn.execute("DELETE FROM docs WHERE doc_no = ?", row)
+
+    def sync(self, db: Session, force: bool = False) -> int:
+        """Re-index issues updated since the stored watermark and drop archived ones; returns the number indexed."""
+        now = datetime.utcnow()
+        if not force and self._last_sync is not None and now - self._last_sync < SYNC_INTERVAL:
+            return 0
+        self._last_sync = now
+        stmt = select(QualityIssue).order_by(QualityIssue.updated_at, QualityIssue.id)
+        watermark = self._meta("watermark")
+        if watermark is not None:
+            stmt = stmt.where(QualityIssue.updated_at >= watermark - SYNC_OVERLAP)
+        count = 0
+        for issues in db.scalars(stmt.execution_options(yield_per=SYNC_BATCH)).partitions():
+            self.upsert(issues)
+            count += len(issues)
+            self._set_meta("watermark", issues[-1].updated_at)
+
+        # Archiving deletes the hot rows, which the updated_at scan cannot see; every host's
+        # index drops them from the archive manifest instead.
+        stmt = select(ArchivedQualityIssue.id, ArchivedQualityIssue.archived_at).order_by(
+            ArchivedQualityIssue.archived_at
+        )
+        archived = self._meta("archive_watermark")
+        if archived is not None:
+            stmt = stmt.where(ArchivedQualityIssue.archived_at >= archived - SYNC_OVERLAP)
+        for rows in db.execute(stmt.execution_options(yield_per=SYNC_BATCH)).partitions():
+            self.remove([row.id for row in rows])
+            self._set_meta("archive_watermark", rows[-1].archived_at)
+        return count
+
+    def _meta(self, key: str) -> datetime | None:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return datetime.fromisoformat(row[0]) if row is not None else None
+
+    def _set_meta(self, key: str, value: datetime) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value.isoformat()),
+            )
+
+    def search(
+        self,
+        text: str,
+        project_id: str | None = None,
+        status: str | None = None,
+        level: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[int, list[SearchHit]]:
+        """Return ``(total matches, ranked page)``."""
+        terms = sorted(set(tokenize(text, query=True)))
+        if not terms:
+            return 0, []
+        conn = self._conn()
+        filters = []
+        params: list = []
+        for column, value in (("project_id", project_id), ("status", status), ("level", level)):
+            if value is not None:
+                filters.append(f"d.{column} = ?")
+                params.append(value)
+        where = " AND ".join(filters) or "1 = 1"
+        placeholders = ", ".join("?" * len(terms))
+
+        doc_count, avg_length = conn.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+        df = dict(
+            conn.execute(
+                f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term", terms
+            ).fetchall()
+        )
+        if len(df) < len(terms):
+            return 0, []
+        idf = {term: math.log(1 + (doc_count - n + 0.5) / (n + 0.5)) for term, n in df.items()}
+
+        rows = conn.execute(
+            f"""
+            SELECT d.issue_id, d.length, p.term, p.tf
+            FROM postings p JOIN docs d ON d.doc_no = p.doc_no
+            WHERE p.term IN ({placeholders}) AND {where}
+              AND p.doc_no IN (
+                SELECT doc_no FROM postings WHERE term IN ({placeholders})
+                GROUP BY doc_no HAVING COUNT(*) = ?
+              )
+            """,
+            [*terms, *params, *terms, len(terms)],
+        ).fetchall()
+        scores: dict[str, float] = {}
+        for issue_id, length, term, tf in rows:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (avg_length or 1))
+            scores[issue_id] = scores.get(issue_id, 0.0) + idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return len(ranked), [SearchHit(issue_id, score) for issue_id, score in ranked[offset : offset + limit]]
+
+    def reset(self) -> None:
+        with self._transaction() as conn:
+            for table in ("postings", "docs", "meta"):
+                conn.execute(f"DELETE FROM {table}")
+        self._last_sync = None
+
+
+search_index = SearchIndex(settings.search_index_path)
+
+
+def index_issues(issues: list[QualityIssue | QualityIssueOut]) -> None:
+    """Best-effort upsert after commit; a failed write is repaired by the next ``sync``."""
+    try:
+        search_index.upsert(issues)
+    except Exception:
+        logger.exception("search index update failed")
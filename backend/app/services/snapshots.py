@@ -0,0 +1,264 @@
+"""Columnar snapshots of project data for analytics.
+
+``write_snapshot`` streams one table for one project (or the whole
+portfolio) into Parquet or Arrow IPC part files under
+``<snapshot_path>/<scope>/<table>/``, one record batch per ``yield_per``
+partition, so the job holds a single batch whatever the table size. Enum
+columns are dictionary-encoded against the full member list, so every batch
+and every part shares one dictionary.
+
+Runs are incremental: ``_manifest.json`` records the parts and the highest
+watermark (``updated_at``, or ``action_at`` / ``created_at`` for append-only
+tables) written so far, and the next run appends a part with only the newer
+rows. Rows committed late within a timestamp the last run already passed
+(whole-second ``DATETIME`` on MySQL, or transactions committing out of
+order) are caught by re-reading ``SNAPSHOT_OVERLAP`` behind the watermark;
+the manifest keeps the ids written inside that window with their watermark
+(and ``version`` where the table has one) so they are not appended twice.
+Only that window is held in memory while streaming, not every id written.
+An updated row therefore appears once per part it changed in; readers keep
+the last row per ``id``. Deletes are not tracked, ``full=True`` rewrites the
+table from scratch.
+
+Arrow IPC parts are written uncompressed so they can be memory-mapped
+without copying; Parquet parts are zstd-compressed and smaller. Needs
+``pyarrow``, pinned in ``requirements-analytics.txt``.
+"""
+
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import Column, Date, DateTime, Enum, Integer, Numeric, Select, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.entities import (
+    BoqItem,
+    Contract,
+    PaymentCertificate,
+    QualityIssue,
+    QualityIssueEvent,
+    Task,
+    TaskDependency,
+)
+
+SNAPSHOT_BATCH = 50_000
+PORTFOLIO_SCOPE = "portfolio"
+FORMATS = ("parquet", "arrow")
+MANIFEST = "_manifest.json"
+# Rows that commit out of watermark order are caught by re-reading this far back.
+SNAPSHOT_OVERLAP = timedelta(minutes=1)
+
+
+@dataclass(frozen=True)
+class SnapshotSpec:
+    model: type
+    watermark: str
+    # Tables without project_id reach their project through a parent row.
+    project_via: tuple[str, type] | None = None
+
+
+SNAPSHOTS = {
+    "quality_issues": SnapshotSpec(QualityIssue, "updated_at"),
+    "quality_issue_events": SnapshotSpec(QualityIssueEvent, "action_at", project_via=("issue_id", QualityIssue)),
+    "tasks": SnapshotSpec(Task, "updated_at"),
+    "task_dependencies": SnapshotSpec(TaskDependency, "created_at"),
+    "boq_items": SnapshotSpec(BoqItem, "updated_at", project_via=("contract_id", Contract)),
+    "payment_certificates": SnapshotSpec(PaymentCertificate, "updated_at", project_via=("contract_id", Contract)),
+}
+
+
+def snapshot_root() -> Path:
+    return Path(settings.snapshot_path)
+
+
+def _field(column: Column) -> pa.Field:
+    kind = column.type
+    if isinstance(kind, Enum):
+        arrow_type = pa.dictionary(pa.int8(), pa.string())
+    elif isinstance(kind, DateTime):
+        arrow_type = pa.timestamp("us")
+    elif isinstance(kind, Date):
+        arrow_type = pa.date32()
+    elif isinstance(kind, Integer):
+        arrow_type = pa.int64()
+    elif isinstance(kind, Numeric):
+        arrow_type = pa.decimal128(kind.precision, kind.scale)
+    else:
+        arrow_type = pa.string()
+    return pa.field(column.name, arrow_type, nullable=column.nullable)
+
+
+def _column_encoder(column: Column, field: pa.Field):
+    if not isinstance(column.type, Enum):
+        return lambda values: pa.array(values, type=field.type)
+    members = list(column.type.enum_class)
+    dictionary = pa.array([member.value for member in members], type=pa.string())
+    codes = {member: code for code, member in enumerate(members)}
+
+    def encode(values):
+        indices = pa.array([None if value is None else codes[value] for value in values], type=pa.int8())
+        return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+    return encode
+
+
+def snapshot_statement(spec: SnapshotSpec, project_id: str | None, after: datetime | None) -> Select:
+    model = spec.model
+    watermark = getattr(model, spec.watermark)
+    stmt = select(*model.__table__.columns).order_by(watermark, model.id)
+    if project_id:
+        if spec.project_via:
+            column, parent = spec.project_via
+            stmt = stmt.where(getattr(model, column).in_(select(parent.id).where(parent.project_id == project_id)))
+        else:
+            stmt = stmt.where(model.project_id == project_id)
+    if after is not None:
+        stmt = stmt.where(watermark >= after - SNAPSHOT_OVERLAP)
+    return stmt.execution_options(stream_results=True, yield_per=SNAPSHOT_BATCH)
+
+
+def _read_manifest(directory: Path) -> dict | None:
+    path = directory / MANIFEST
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def _write_manifest(directory: Path, manifest: dict) -> None:
+    partial = directory / f"{MANIFEST}.partial"
+    partial.write_text(json.dumps(manifest, indent=2))
+    os.replace(partial, directory / MANIFEST)
+
+
+class _PartWriter:
+    """Writes record batches to one part file; opened lazily so an empty increment leaves no file."""
+
+    def __init__(self, path: Path, schema: pa.Schema, fmt: str) -> None:
+        self.path = path
+        self.schema = schema
+        self.fmt = fmt
+        self.rows = 0
+        self._partial = path.with_suffix(".partial")
+        self._writer = None
+
+    def write(self, batch: pa.RecordBatch) -> None:
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.fmt == "parquet":
+                self._writer = pq.ParquetWriter(self._partial, self.schema, compression="zstd")
+            else:
+                self._writer = pa.ipc.new_file(str(self._partial), self.schema)
+        self._writer.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def close(self) -> bool:
+        """Finish the file; returns whether anything was written."""
+        if self._writer is None:
+            return False
+        self._writer.close()
+        os.replace(self._partial, self.path)
+        return True
+
+    def abort(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._partial.unlink(missing_ok=True)
+
+
+def _within_overlap(recent: dict[str, str], watermark: datetime | None) -> dict[str, str]:
+    if watermark is None:
+        return {}
+    horizon = (watermark - SNAPSHOT_OVERLAP).isoformat()
+    # Markers start with the ISO watermark, which sorts like the timestamp it encodes.
+    return {row_id: mark for row_id, mark in recent.items() if mark >= horizon}
+
+
+def write_snapshot(
+    db: Session,
+    table: str,
+    project_id: str | None = None,
+    fmt: str = "parquet",
+    full: bool = False,
+) -> int:
+    """Append rows changed since the last run as a new part; returns the number of rows written."""
+    spec = SNAPSHOTS[table]
+    directory = snapshot_root() / (project_id or PORTFOLIO_SCOPE) / table
+    existing = _read_manifest(directory)
+    manifest = None if full else existing
+    if manifest is not None and manifest["format"] != fmt:
+        raise ValueError(f"{directory} holds {manifest['format']} parts; rewrite it with full=True to switch format")
+    stale = existing["parts"] if full and existing else []
+    parts = manifest["parts"] if manifest else []
+    after = datetime.fromisoformat(manifest["watermark"]) if manifest and manifest["watermark"] else None
+    recent: dict[str, str] = manifest.get("recent", {}) if manifest else {}
+
+    columns = list(spec.model.__table__.columns)
+    schema = pa.schema([_field(column) for column in columns])
+    encoders = [_column_encoder(column, field) for column, field in zip(columns, schema)]
+    names = [column.name for column in columns]
+    watermark_position = names.index(spec.watermark)
+    version_position = names.index("version") if "version" in names else None
+
+    def marker(row) -> str:
+        stamp = row[watermark_position].isoformat()
+        return stamp if version_position is None else f"{stamp}#{row[version_position]}"
+
+    # Part names never collide, so a full rewrite leaves the old parts readable until the new
+    # manifest replaces the old one. The manifest, not the name, gives the part order.
+    part_name = f"part-{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.{fmt}"
+    part = _PartWriter(directory / part_name, schema, fmt)
+    watermark = after
+    try:
+        for rows in db.execute(snapshot_statement(spec, project_id, after)).partitions():
+            rows = [row for row in rows if recent.get(row.id) != marker(row)]
+            if not rows:
+                continue
+            arrays = [encode(values) for encode, values in zip(encoders, zip(*rows))]
+            part.write(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            watermark = max(watermark or rows[-1][watermark_position], rows[-1][watermark_position])
+            # Rows arrive in watermark order, so only the tail can still be re-read; keep just the overlap window.
+            horizon = watermark - SNAPSHOT_OVERLAP
+            recent.update((row.id, marker(row)) for row in rows if row[watermark_position] >= horizon)
+            recent = _within_overlap(recent, watermark)
+    except BaseException:
+        part.abort()
+        raise
+    if not part.close() and manifest is not None:
+        return 0
+
+    directory.mkdir(parents=True, exist_ok=True)
+    if part.rows:
+        parts = [*parts, {"file": part.path.name, "rows": part.rows, "written_at": datetime.utcnow().isoformat()}]
+    _write_manifest(
+        directory,
+        {
+            "table": table,
+            "scope": project_id or PORTFOLIO_SCOPE,
+            "format": fmt,
+            "watermark_column": spec.watermark,
+            "watermark": watermark.isoformat() if watermark else None,
+            "parts": parts,
+            "recent": _within_overlap(recent, watermark),
+        },
+    )
+    for old in stale:
+        (directory / old["file"]).unlink(missing_ok=True)
+    return part.rows
+
+
+def snapshot_dataset(table: str, project_id: str | None = None) -> ds.Dataset:
+    """All parts of a snapshot as one dataset; nothing is read until it is scanned."""
+    directory = snapshot_root() / (project_id or PORTFOLIO_SCOPE) / table
+    manifest = _read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"no snapshot at {directory}")
+    files = [str(directory / part["file"]) for part in manifest["parts"]]
+    return ds.dataset(files, format="parquet" if manifest["format"] == "parquet" else "ipc")
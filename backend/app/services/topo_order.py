@@ -0,0 +1,149 @@
+"""Persisted dynamic topological order of each project's task dependency graph.
+
+``tasks.topo_order`` keeps every dependency pointing from a lower to a higher
+order. Inserting an edge that already agrees with the order is O(1); an edge
+against the order runs the Pearce-Kelly reordering, which only reads and
+rewrites the tasks whose order lies between the two endpoints. An edge that
+would close a cycle is rejected with the offending cycle.
+"""
+
+from collections import defaultdict
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.models.entities import Task, TaskDependency
+from app.services.schedule_cache import load_schedule_inputs
+
+
+class DependencyCycleError(Exception):
+    def __init__(self, cycle_task_ids: list[str]):
+        super().__init__("dependency cycle: " + " -> ".join(cycle_task_ids))
+        self.cycle_task_ids = cycle_task_ids
+
+
+class UnknownPredecessorError(Exception):
+    def __init__(self, task_id: str):
+        super().__init__(f"unknown predecessor task: {task_id}")
+        self.task_id = task_id
+
+
+def next_topo_order(db: Session, project_id: str) -> int:
+    """Order for a task appended to the project; callers hold the project row lock."""
+    ensure_topo_order(db, project_id)
+    current = db.scalar(select(func.max(Task.topo_order)).where(Task.project_id == project_id))
+    return 0 if current is None else current + 1
+
+
+def ensure_topo_order(db: Session, project_id: str) -> None:
+    """One-off backfill for projects whose tasks predate ``topo_order``."""
+    missing = db.scalar(
+        select(Task.id).where(Task.project_id == project_id, Task.topo_order.is_(None)).limit(1)
+    )
+    if missing is None:
+        return
+    graph, _ = load_schedule_inputs(db, project_id)
+    order = graph.order.tolist()
+    if graph.cycle:
+        # Legacy data may already contain a cycle; park the unordered tasks at the end.
+        placed = set(order)
+        order += [i for i in range(graph.size) if i not in placed]
+    _write_orders(db, {graph.task_ids[i]: rank for rank, i in enumerate(order)})
+
+
+def insert_dependency(db: Session, project_id: str, predecessor_id: str, successor_id: str) -> None:
+    """Validate and reorder for a new ``predecessor -> successor`` edge before it is written."""
+    if predecessor_id == successor_id:
+        raise DependencyCycleError([successor_id, successor_id])
+
+    rows = db.execute(
+        select(Task.id, Task.topo_order).where(
+            Task.project_id == project_id, Task.id.in_([predecessor_id, successor_id])
+        )
+    ).all()
+    orders = dict(rows)
+    if predecessor_id not in orders:
+        raise UnknownPredecessorError(predecessor_id)
+    if orders[predecessor_id] is None or orders[successor_id] is None:
+        ensure_topo_order(db, project_id)
+        orders = dict(db.execute(select(Task.id, Task.topo_order).where(Task.id.in_(list(orders)))).all())
+
+    lower, upper = orders[successor_id], orders[predecessor_id]
+    if upper < lower:
+        return
+
+    region = dict(
+        db.execute(
+            select(Task.id, Task.topo_order).where(
+                Task.project_id == project_id, Task.topo_order.between(lower, upper)
+            )
+        ).all()
+    )
+    pred_task = aliased(Task)
+    succ_task = aliased(Task)
+    edges = db.execute(
+        select(TaskDependency.predecessor_task_id, TaskDependency.successor_task_id)
+        .join(pred_task, pred_task.id == TaskDependency.predecessor_task_id)
+        .join(succ_task, succ_task.id == TaskDependency.successor_task_id)
+        .where(
+            TaskDependency.project_id == project_id,
+            pred_task.topo_order.between(lower, upper),
+            succ_task.topo_order.between(lower, upper),
+        )
+    ).all()
+    successors: dict[str, list[str]] = defaultdict(list)
+    predecessors: dict[str, list[str]] = defaultdict(list)
+    for pred, succ in edges:
+        successors[pred].append(succ)
+        predecessors[succ].append(pred)
+
+    forward = _search_forward(successor_id, predecessor_id, successors, region, upper)
+    backward = _search(predecessor_id, predecessors, lambda task: region.get(task, lower - 1) >= lower)
+
+    moved = sorted(backward, key=region.__getitem__) + sorted(forward, key=region.__getitem__)
+    slots = sorted(region[task] for task in moved)
+    _write_orders(db, {task: slot for task, slot in zip(moved, slots) if region[task] != slot})
+
+
+def _search_forward(
+    start: str, target: str, successors: dict[str, list[str]], region: dict[str, int], upper: int
+) -> list[str]:
+    """Tasks reachable from ``start`` within the region; raises if ``target`` is among them."""
+    parent: dict[str, str | None] = {start: None}
+    stack = [start]
+    while stack:
+        task = stack.pop()
+        for nxt in successors.get(task, ()):
+            if nxt == target:
+                chain = [task]
+                while parent[chain[-1]] is not None:
+                    chain.append(parent[chain[-1]])
+                raise DependencyCycleError([target, *reversed(chain), target])
+            if nxt not in parent and region.get(nxt, upper + 1) <= upper:
+                parent[nxt] = task
+                stack.append(nxt)
+    return list(parent)
+
+
+def _search(start: str, neighbours: dict[str, list[str]], inside) -> list[str]:
+    seen = {start}
+    stack = [start]
+    while stack:
+        for nxt in neighbours.get(stack.pop(), ()):
+            if nxt not in seen and inside(nxt):
+                seen.add(nxt)
+                stack.append(nxt)
+    return list(seen)
+
+
+def _write_orders(db: Session, orders: dict[str, int]) -> None:
+    if not orders:
+        return
+    table = Task.__table__
+    db.execute(
+        table.update()
+        .where(table.c.id == bindparam("task_id"))
+        # Reordering is bookkeeping, not an edit: keep updated_at untouched.
+        .values(topo_order=bindparam("topo_order"), updated_at=table.c.updated_at),
+        [{"task_id": task_id, "topo_order": order} for task_id, order in orders.items()],
+    )
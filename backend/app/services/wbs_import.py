@@ -0,0 +1,257 @@
+"""Bulk WBS import: validate a whole task tree in memory, then write it in one transaction."""
+
+import csv
+import io
+import re
+from collections.abc import Collection
+from datetime import datetime
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.entities import Project, Task, TaskDependency, uuid_str
+from app.schemas.task import WbsImportOut, WbsImportRowError, WbsPredecessorIn, WbsTaskIn
+from app.services.schedule_cache import bump_schedule_version, schedule_cache
+from app.services.scheduling import build_graph
+from app.services.topo_order import next_topo_order
+from app.services.wbs_tree import WBS_PATH_MAX, ensure_wbs_paths
+
+INSERT_BATCH_SIZE = 1000
+
+# "1.2.3", "A-01", "1.2.3:SS+2", "1.2.3 FF-1d": a type after ":" or whitespace is never part of the code.
+SEPARATED_RE = re.compile(r"^(?P<code>[^:\s]+)(?::|\s+)(?P<type>FS|SS|FF|SF)(?:(?P<lag>[+-]\d+)d?)?$")
+# "1.2.3FS", "1.2.3SS+2": a bare suffix is only split off when the remaining code is a known task, so codes
+# that merely end in FS/SS/FF/SF ("CLASS", "BOSS") are kept whole. A lag needs a type, so "A-01" is one code.
+SUFFIX_RE = re.compile(r"^(?P<code>.+?)(?P<type>FS|SS|FF|SF)(?:(?P<lag>[+-]\d+)d?)?$")
+
+
+class WbsImportError(Exception):
+    def __init__(self, errors: list[WbsImportRowError], conflict: bool):
+        super().__init__("wbs import rejected")
+        self.errors = errors
+        self.conflict = conflict
+
+
+def parse_predecessors(text: str, known_codes: Collection[str] = ()) -> list[WbsPredecessorIn]:
+    """Parse ``code[:TYPE[+lag]]`` tokens; a token that is itself a known code is never split."""
+    result: list[WbsPredecessorIn] = []
+    for token in re.split(r"[;,]", text):
+        token = re.sub(r"\s*([+-])\s*", r"\1", " ".join(token.split()))
+        if not token:
+            continue
+        code = token.replace(" ", "")
+        match = None
+        if code not in known_codes:
+            match = SEPARATED_RE.match(token)
+            if match is None:
+                match = SUFFIX_RE.match(code)
+                if match is not None and match["code"] not in known_codes:
+                    match = None
+        result.append(
+            WbsPredecessorIn(
+                wbs_code=match["code"] if match else code,
+                dependency_type=match["type"] if match else "FS",
+                lag_days=int(match["lag"] or 0) if match else 0,
+            )
+        )
+    return result
+
+
+def parse_wbs_csv(content: str, known_codes: Collection[str] = ()) -> list[WbsTaskIn]:
+    """Parse a CSV export with one task per line; the ``predecessors`` column uses ``code[:TYPE[+lag]]`` tokens.
+
+    ``known_codes`` are the project's existing WBS codes; together with the
+    codes in the file they decide whether ``1.2.3SS`` is code ``1.2.3`` with
+    type SS or a code of its own.
+    """
+    tasks: list[WbsTaskIn] = []
+    errors: list[WbsImportRowError] = []
+    rows = [
+        {k.strip(): v.strip() for k, v in raw.items() if k and v is not None and v.strip() != ""}
+        for raw in csv.DictReader(io.StringIO(content))
+    ]
+    known_codes = {*known_codes, *(values["wbs_code"] for values in rows if "wbs_code" in values)}
+    for row_no, values in enumerate(rows, start=1):
+        try:
+            predecessors = parse_predecessors(values.pop("predecessors", ""), known_codes)
+            tasks.append(WbsTaskIn(**values, predecessors=predecessors))
+        except (ValidationError, ValueError) as exc:
+            errors.append(WbsImportRowError(row=row_no, wbs_code=values.get("wbs_code"), error=str(exc)))
+    if errors:
+        raise WbsImportError(errors, conflict=False)
+    return tasks
+
+
+def import_wbs(db: Session, project_id: str, tasks: list[WbsTaskIn]) -> WbsImportOut:
+    """Create every task and dependency of a WBS or nothing; rows are numbered from 1, row 0 is the request."""
+    if db.scalar(select(Project.id).where(Project.id == project_id)) is None:
+        error = WbsImportRowError(row=0, wbs_code=None, error=f"unknown project_id: {project_id}")
+        raise WbsImportError([error], conflict=False)
+    existing = dict(db.execute(select(Task.wbs_code, Task.id).where(Task.project_id == project_id)).all())
+    errors: list[WbsImportRowError] = []
+    conflict = False
+
+    new_ids: dict[str, str] = {}
+    for row_no, item in enumerate(tasks, start=1):
+        if item.wbs_code in existing:
+            conflict = True
+            errors.append(_row_error(row_no, item, "uk_tasks_project_wbs: wbs_code already exists in project"))
+        elif item.wbs_code in new_ids:
+            errors.append(_row_error(row_no, item, "duplicate wbs_code in import"))
+        else:
+            new_ids[item.wbs_code] = uuid_str()
+
+    def resolve(code: str) -> str | None:
+        return new_ids.get(code) or existing.get(code)
+
+    for row_no, item in enumerate(tasks, start=1):
+        if item.parent_wbs_code and resolve(item.parent_wbs_code) is None:
+            errors.append(_row_error(row_no, item, f"unknown parent_wbs_code: {item.parent_wbs_code}"))
+        listed: set[str] = set()
+        for pred in item.predecessors:
+            if pred.wbs_code in listed:
+                errors.append(_row_error(row_no, item, f"duplicate predecessor: {pred.wbs_code}"))
+                continue
+            listed.add(pred.wbs_code)
+            if resolve(pred.wbs_code) is None:
+                errors.append(_row_error(row_no, item, f"unknown predecessor: {pred.wbs_code}"))
+            elif pred.wbs_code == item.wbs_code:
+                errors.append(_row_error(row_no, item, "task cannot depend on itself"))
+    if errors:
+        raise WbsImportError(errors, conflict)
+
+    # Existing tasks gain no new predecessors, so any cycle lies among the new rows.
+    graph = build_graph(
+        list(new_ids.values()),
+        (
+            (new_ids[pred.wbs_code], new_ids[item.wbs_code], pred.dependency_type, pred.lag_days)
+            for item in tasks
+            for pred in item.predecessors
+            if pred.wbs_code in new_ids
+        ),
+    )
+    if graph.cycle:
+        ordered = {graph.task_ids[i] for i in graph.order.tolist()}
+        raise WbsImportError(
+            [
+                _row_error(row_no, item, "dependency cycle")
+                for row_no, item in enumerate(tasks, start=1)
+                if new_ids[item.wbs_code] not in ordered
+            ],
+            conflict=False,
+        )
+
+    by_code = {item.wbs_code: item for item in tasks}
+    depth: dict[str, int] = {}
+    for row_no, item in enumerate(tasks, start=1):
+        if _parent_depth(item.wbs_code, by_code, depth) is None:
+            errors.append(_row_error(row_no, item, "parent_wbs_code cycle"))
+    if errors:
+        raise WbsImportError(errors, conflict=False)
+
+    # Lock the project row before allocating topo_order; new tasks follow every existing one.
+    bump_schedule_version(db, project_id)
+    base_order = next_topo_order(db, project_id)
+    rank = {graph.task_ids[i]: base_order + pos for pos, i in enumerate(graph.order.tolist())}
+
+    ensure_wbs_paths(db, project_id)
+    existing_parents = {item.parent_wbs_code for item in tasks if item.parent_wbs_code not in new_ids}
+    paths: dict[str, str] = dict(
+        db.execute(
+            select(Task.id, Task.wbs_path).where(
+                Task.project_id == project_id, Task.wbs_code.in_(existing_parents - {None})
+            )
+        ).all()
+    )
+    for item in sorted(tasks, key=lambda t: depth[t.wbs_code]):
+        parent_id = resolve(item.parent_wbs_code) if item.parent_wbs_code else None
+        task_id = new_ids[item.wbs_code]
+        paths[task_id] = f"{paths[parent_id] if parent_id else ''}{task_id}/"
+        if len(paths[task_id]) > WBS_PATH_MAX:
+            # Release the project lock and the version bump taken above.
+            db.rollback()
+            raise WbsImportError([_row_error(tasks.index(item) + 1, item, "WBS hierarchy is too deep")], conflict=False)
+
+    now = datetime.utcnow()
+    # Parents are inserted before children so the self-referencing FK holds row by row.
+    task_rows = [
+        {
+            "id": new_ids[item.wbs_code],
+            "project_id": project_id,
+            "parent_task_id": resolve(item.parent_wbs_code) if item.parent_wbs_code else None,
+            "wbs_code": item.wbs_code,
+            "name": item.name,
+            "status": item.status,
+            "planned_start": item.planned_start,
+            "planned_end": item.planned_end,
+            "actual_start": item.actual_start,
+            "actual_end": item.actual_end,
+            "planned_days": item.planned_days,
+            "actual_days": item.actual_days,
+            "progress_percent": item.progress_percent,
+            "topo_order": rank[new_ids[item.wbs_code]],
+            "wbs_path": paths[new_ids[item.wbs_code]],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for item in sorted(tasks, key=lambda t: depth[t.wbs_code])
+    ]
+    dep_rows = [
+        {
+            "id": uuid_str(),
+            "project_id": project_id,
+            "predecessor_task_id": resolve(pred.wbs_code),
+            "successor_task_id": new_ids[item.wbs_code],
+            "dependency_type": pred.dependency_type,
+            "lag_days": pred.lag_days,
+            "created_at": now,
+        }
+        for item in tasks
+        for pred in item.predecessors
+    ]
+
+    try:
+        for start in range(0, len(task_rows), INSERT_BATCH_SIZE):
+            db.execute(Task.__table__.insert(), task_rows[start : start + INSERT_BATCH_SIZE])
+        for start in range(0, len(dep_rows), INSERT_BATCH_SIZE):
+            db.execute(TaskDependency.__table__.insert(), dep_rows[start : start + INSERT_BATCH_SIZE])
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        taken = set(db.scalars(select(Task.wbs_code).where(Task.project_id == project_id, Task.wbs_code.in_(new_ids))))
+        if not taken:
+            raise
+        raise WbsImportError(
+            [
+                _row_error(row_no, item, "uk_tasks_project_wbs: wbs_code already exists in project")
+                for row_no, item in enumerate(tasks, start=1)
+                if item.wbs_code in taken
+            ],
+            conflict=True,
+        )
+
+    schedule_cache.invalidate(project_id)
+    return WbsImportOut(created_tasks=len(task_rows), created_dependencies=len(dep_rows), errors=[])
+
+
+def _parent_depth(code: str, by_code: dict[str, WbsTaskIn], depth: dict[str, int]) -> int | None:
+    """Depth of ``code`` within the imported rows (existing parents count as roots); ``None`` on a cycle."""
+    chain: list[str] = []
+    seen: set[str] = set()
+    cur: str | None = code
+    while cur is not None and cur in by_code and cur not in depth:
+        if cur in seen:
+            return None
+        seen.add(cur)
+        chain.append(cur)
+        cur = by_code[cur].parent_wbs_code
+    base = depth.get(cur, -1) if cur is not None else -1
+    for offset, item in enumerate(reversed(chain), start=1):
+        depth[item] = base + offset
+    return depth[code]
+
+
+def _row_error(row_no: int, item: WbsTaskIn, error: str) -> WbsImportRowError:
+    return WbsImportRowError(row=row_no, wbs_code=item.wbs_code, error=error)
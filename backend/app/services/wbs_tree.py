@@ -0,0 +1,194 @@
+"""WBS hierarchy stored as a materialized path on ``tasks.wbs_path``.
+
+A task's path is its ancestors' ids followed by its own id, each terminated by
+``/``. A subtree is therefore one ``LIKE 'prefix%'`` range over the path
+index, and ordering by path yields every parent before its descendants, so
+the tree and its rollups are built in one linear pass without recursion.
+"""
+
+import re
+from collections.abc import Sequence
+from datetime import date
+
+from sqlalchemy import Row, bindparam, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.entities import Task
+from app.schemas.task import TaskTreeNodeOut
+
+WBS_PATH_MAX = 720
+
+
+class WbsHierarchyError(Exception):
+    pass
+
+
+def ensure_wbs_paths(db: Session, project_id: str) -> None:
+    """Fill in paths missing since migration 0017 (rows inserted outside the API); write paths only, as it updates."""
+    if not _has_missing_paths(db, project_id):
+        return
+    parents = dict(db.execute(select(Task.id, Task.parent_task_id).where(Task.project_id == project_id)).all())
+    table = Task.__table__
+    db.execute(
+        table.update()
+        .where(table.c.id == bindparam("task_id"))
+        .values(wbs_path=bindparam("wbs_path"), updated_at=table.c.updated_at),
+        [{"task_id": task_id, "wbs_path": path} for task_id, path in compute_paths(parents).items()],
+    )
+
+
+def compute_paths(parents: dict[str, str | None]) -> dict[str, str]:
+    """Materialized path of every task from its parent pointer; a parent outside ``parents`` starts a root."""
+    paths: dict[str, str] = {}
+    for task_id in parents:
+        chain: list[str] = []
+        cur: str | None = task_id
+        while cur is not None and cur in parents and cur not in paths and cur not in chain:
+            chain.append(cur)
+            cur = parents[cur]
+        prefix = paths.get(cur, "") if cur is not None else ""
+        for node in reversed(chain):
+            prefix = f"{prefix}{node}/"
+            paths[node] = prefix
+    return paths
+
+
+def _has_missing_paths(db: Session, project_id: str) -> bool:
+    return db.scalar(select(Task.id).where(Task.project_id == project_id, Task.wbs_path.is_(None)).limit(1)) is not None
+
+
+def child_path(db: Session, project_id: str, parent_task_id: str | None, task_id: str) -> str:
+    if parent_task_id is None:
+        return f"{task_id}/"
+    ensure_wbs_paths(db, project_id)
+    parent_path = db.scalar(select(Task.wbs_path).where(Task.id == parent_task_id, Task.project_id == project_id))
+    if parent_path is None:
+        raise WbsHierarchyError(f"parent task not found in project: {parent_task_id}")
+    if parent_path.startswith(f"{task_id}/") or f"/{task_id}/" in parent_path:
+        raise WbsHierarchyError("task cannot be moved under its own subtree")
+    path = f"{parent_path}{task_id}/"
+    if len(path) > WBS_PATH_MAX:
+        raise WbsHierarchyError("WBS hierarchy is too deep")
+    return path
+
+
+def move_subtree(db: Session, project_id: str, old_path: str, new_path: str) -> None:
+    """Rewrite the path prefix of a task and all of its descendants in one statement."""
+    if old_path == new_path:
+        return
+    table = Task.__table__
+    deepest = db.scalar(
+        select(func.max(func.length(table.c.wbs_path))).where(
+            table.c.project_id == project_id, table.c.wbs_path.startswith(old_path)
+        )
+    )
+    if deepest is not None and deepest - len(old_path) + len(new_path) > WBS_PATH_MAX:
+        raise WbsHierarchyError("WBS hierarchy is too deep")
+    db.execute(
+        table.update()
+        .where(table.c.project_id == project_id, table.c.wbs_path.startswith(old_path))
+        .values(
+            wbs_path=literal(new_path) + func.substr(table.c.wbs_path, len(old_path) + 1),
+            updated_at=table.c.updated_at,
+        )
+    )
+
+
+def load_tree(db: Session, project_id: str, root_task_id: str | None = None) -> list[TaskTreeNodeOut]:
+    stmt = select(
+        Task.id,
+        Task.parent_task_id,
+        Task.wbs_code,
+        Task.name,
+        Task.status,
+        Task.planned_start,
+        Task.planned_end,
+        Task.actual_start,
+        Task.actual_end,
+        Task.planned_days,
+        Task.progress_percent,
+        Task.wbs_path,
+    ).where(Task.project_id == project_id)
+    if _has_missing_paths(db, project_id):
+        # Reads never write: paths not backfilled yet are derived in memory for this response.
+        rows = db.execute(stmt).all()
+        paths = compute_paths({row.id: row.parent_task_id for row in rows})
+        prefix = paths.get(root_task_id, "") if root_task_id is not None else ""
+        if root_task_id is not None and not prefix:
+            return []
+        rows = [row for row in rows if paths[row.id].startswith(prefix)]
+        return build_tree(sorted(rows, key=lambda row: paths[row.id]))
+    if root_task_id is not None:
+        root_path = db.scalar(select(Task.wbs_path).where(Task.id == root_task_id, Task.project_id == project_id))
+        if root_path is None:
+            return []
+        stmt = stmt.where(Task.wbs_path.startswith(root_path))
+    return build_tree(db.execute(stmt.order_by(Task.wbs_path)).all())
+
+
+def build_tree(rows: Sequence[Row]) -> list[TaskTreeNodeOut]:
+    """Nest path-ordered rows and roll leaf progress (weighted by planned days) and dates up to every ancestor."""
+    nodes: dict[str, TaskTreeNodeOut] = {}
+    # Per node: [weighted progress, weight, plain progress sum, leaf count]
+    totals: dict[str, list[float]] = {}
+    ordered: list[TaskTreeNodeOut] = []
+    roots: list[TaskTreeNodeOut] = []
+    for row in rows:
+        node = TaskTreeNodeOut(
+            id=row.id,
+            parent_task_id=row.parent_task_id,
+            wbs_code=row.wbs_code,
+            name=row.name,
+            status=row.status.value,
+            planned_days=row.planned_days,
+            progress_percent=float(row.progress_percent),
+            rollup_progress_percent=float(row.progress_percent),
+            rollup_planned_start=row.planned_start,
+            rollup_planned_end=row.planned_end,
+            rollup_actual_start=row.actual_start,
+            rollup_actual_end=row.actual_end,
+            children=[],
+        )
+        nodes[row.id] = node
+        totals[row.id] = [0.0, 0.0, 0.0, 0]
+        ordered.append(node)
+        parent = nodes.get(row.parent_task_id) if row.parent_task_id else None
+        (parent.children if parent is not None else roots).append(node)
+
+    # Reverse path order visits every child before its parent.
+    for node in reversed(ordered):
+        total = totals[node.id]
+        if not node.children:
+            weight = max(node.planned_days or 0, 0)
+            total[:] = [node.progress_percent * weight, weight, node.progress_percent, 1]
+        else:
+            node.children.sort(key=lambda child: _wbs_sort_key(child.wbs_code))
+            if total[1] > 0:
+                node.rollup_progress_percent = round(total[0] / total[1], 2)
+            elif total[3]:
+                node.rollup_progress_percent = round(total[2] / total[3], 2)
+        parent = nodes.get(node.parent_task_id) if node.parent_task_id else None
+        if parent is None:
+            continue
+        parent_total = totals[parent.id]
+        for i in range(4):
+            parent_total[i] += total[i]
+        parent.rollup_planned_start = _min_date(parent.rollup_planned_start, node.rollup_planned_start)
+        parent.rollup_planned_end = _max_date(parent.rollup_planned_end, node.rollup_planned_end)
+        parent.rollup_actual_start = _min_date(parent.rollup_actual_start, node.rollup_actual_start)
+        parent.rollup_actual_end = _max_date(parent.rollup_actual_end, node.rollup_actual_end)
+
+    roots.sort(key=lambda node: _wbs_sort_key(node.wbs_code))
+    return roots
+
+
+def _wbs_sort_key(code: str) -> list[tuple[int, int | str]]:
+    return [(0, int(part)) if part.isdigit() else (1, part) for part in re.split(r"[.\-]", code)]
+
+
+def _min_date(a: date | None, b: date | None) -> date | None:
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _max_date(a: date | None, b: date | None) -> date | None:
+    return b if a is None else a if b is None else max(a, b)
@@ -0,0 +1,92 @@
+"""Incremental schedule cache writes must match a full recompute."""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.services.schedule_cache import ProjectSchedule, ScheduleCache
+from app.services.scheduling import build_graph, compute_schedule
+
+DEPENDENCY_TYPES = ("FS", "SS", "FF", "SF")
+FIELDS = ("early_start", "early_finish", "late_start", "late_finish", "total_float", "free_float", "length")
+
+
+def _full(tasks: dict[str, tuple[int, int]], edges: dict[str, list]):
+    ids = list(tasks)
+    graph = build_graph(ids, [edge for task_id in ids for edge in edges.get(task_id, [])])
+    durations = np.array([[tasks[task_id][0] for task_id in ids], [tasks[task_id][1] for task_id in ids]])
+    return graph, durations
+
+
+def _random_predecessors(rng: random.Random, tasks: dict, edges: dict, task_id: str) -> list:
+    # Only tasks created earlier may precede, so the graph stays acyclic; shuffled like request payloads.
+    order = list(tasks)
+    earlier = order[: order.index(task_id)] if task_id in tasks else order
+    chosen = [pred for pred in earlier if rng.random() < 0.3]
+    rng.shuffle(chosen)
+    return [(pred, task_id, rng.choice(DEPENDENCY_TYPES), rng.randint(-2, 3)) for pred in chosen]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_cached_writes_match_full_recompute(seed: int) -> None:
+    rng = random.Random(seed)
+    tasks = {f"t{i}": (rng.randint(0, 9), rng.randint(0, 9)) for i in range(rng.randint(1, 25))}
+    edges = {task_id: _random_predecessors(rng, tasks, {}, task_id) for task_id in tasks}
+    graph, durations = _full(tasks, edges)
+    cache = ScheduleCache(max_projects=1)
+    cache._store("p", ProjectSchedule(0, graph, durations, compute_schedule(graph, durations)))
+
+    for version in range(1, 16):
+        action = rng.choice(("create", "update", "predecessors", "delete"))
+        if action == "delete" and len(tasks) > 1:
+            task_id = rng.choice(list(tasks))
+            del tasks[task_id]
+            edges.pop(task_id, None)
+            for task_edges in edges.values():
+                task_edges[:] = [edge for edge in task_edges if edge[0] != task_id]
+            cache.task_deleted("p", version, task_id)
+        else:
+            task_id = f"n{version}" if action == "create" else rng.choice(list(tasks))
+            predecessors = None
+            if action != "update":
+                predecessors = _random_predecessors(rng, tasks, edges, task_id)
+                edges[task_id] = predecessors
+            tasks[task_id] = (rng.randint(0, 15), rng.randint(0, 15))
+            cache.task_written("p", version, task_id, *tasks[task_id], predecessors)
+
+        cached = cache._entries["p"]
+        graph, durations = _full(tasks, edges)
+        assert cached.graph.task_ids == graph.task_ids
+        assert np.array_equal(cached.durations, durations)
+        expected = compute_schedule(graph, durations)
+        for field in FIELDS:
+            assert np.array_equal(getattr(cached.result, field), getattr(expected, field)), (action, field)
+        _assert_same_graph(cached.graph, graph)
+
+
+def _edge_set(graph) -> list:
+    columns = (graph.pred, graph.succ, graph.lag, graph.from_finish, graph.to_finish)
+    return sorted(zip(*(column.tolist() for column in columns)))
+
+
+def _assert_same_graph(cached, fresh) -> None:
+    """Edge ids may be numbered differently, so compare what every grouping means rather than the raw arrays."""
+    assert _edge_set(cached) == _edge_set(fresh)
+    assert np.array_equal(cached.level, fresh.level)
+    tasks = np.arange(cached.size)
+    assert np.array_equal(cached.out_ptr, fresh.out_ptr) and np.array_equal(cached.in_ptr, fresh.in_ptr)
+    assert np.array_equal(cached.pred[cached.out_edges], np.repeat(tasks, np.diff(cached.out_ptr)))
+    assert np.array_equal(cached.succ[cached.in_edges], np.repeat(tasks, np.diff(cached.in_ptr)))
+    for perm, bounds, keys in (
+        (cached.fwd_perm, cached.fwd_bounds, cached.level[cached.succ]),
+        (cached.bwd_perm, cached.bwd_bounds, -cached.level[cached.pred]),
+    ):
+        assert sorted(perm.tolist()) == list(range(len(cached.pred)))
+        ordered = keys[perm]
+        assert np.all(np.diff(ordered) >= 0)
+        runs = [ordered[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        assert all(len(set(run.tolist())) == 1 for run in runs) and len({run[0] for run in runs}) == len(runs)
+    position = np.empty(cached.size, dtype=np.int64)
+    position[cached.order] = tasks
+    assert np.all(position[cached.pred] < position[cached.succ])